@@ -0,0 +1,110 @@
+""" передача кадров камеры (512x512x3) от камеры до хранилища изображений:
+описатель кадра в пуле FramePool (кадр в разделяемой памяти) против
+массива пикселей в событии. Событие проходит цепочку процессов, как
+снимок от камеры через контроль оптики, монитор безопасности и ЦСУ,
+хранилище записывает кадр сжатыми фрагментами (TileStore).
+
+Запуск из корня репозитория:
+    python -m benchmarks.camera_frames
+"""
+import os
+import pickle
+import tempfile
+from multiprocessing import Process, Queue
+from time import perf_counter
+
+import numpy as np
+
+from src.system.event_types import Event
+from src.system.frame_pool import FramePool
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import (
+    LOG_ERROR,
+    CAMERA_FRAME_SHAPE,
+    CAMERA_FOV_DEG,
+    CAMERA_QUEUE_NAME,
+    IMAGE_STORAGE_QUEUE_NAME,
+)
+from src.satellite_simulator.basemap import make_basemap, render_frame
+from src.satellite_control_system.image_storage import ImageStorage
+
+FRAMES = 500
+# камера -> контроль оптики -> монитор -> ЦСУ -> хранилище
+RELAYS = 3
+POOL_SLOTS = 16
+
+
+def camera(q: Queue, pool, frames: int):
+    basemap = make_basemap()
+    buffer = np.empty(CAMERA_FRAME_SHAPE, dtype=np.uint8)
+    for index in range(frames):
+        lat, lon = (index % 120) - 60.0, (index * 7 % 360) - 180.0
+        if pool is not None:
+            handle = pool.acquire()
+            while handle is None:
+                handle = pool.acquire()
+            render_frame(basemap, lat, lon, CAMERA_FOV_DEG, pool.frame(handle))
+            frame = handle
+        else:
+            render_frame(basemap, lat, lon, CAMERA_FOV_DEG, buffer)
+            frame = buffer
+        q.put(Event(source=CAMERA_QUEUE_NAME, destination=IMAGE_STORAGE_QUEUE_NAME,
+                    operation="save_image", parameters=(lat, lon, float(index), frame)))
+
+
+def relay(source: Queue, destination: Queue, frames: int):
+    for _ in range(frames):
+        destination.put(source.get())
+
+
+def measure(pool, frames_dir):
+    queues = [Queue() for _ in range(RELAYS + 1)]
+    processes = [Process(target=camera, args=(queues[0], pool, FRAMES))]
+    processes += [Process(target=relay, args=(queues[i], queues[i + 1], FRAMES)) for i in range(RELAYS)]
+
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    storage = ImageStorage(queues_dir=queues_dir, log_level=LOG_ERROR,
+                           catalog_path=os.path.join(frames_dir, "catalog.bin"),
+                           frame_pool=pool, frames_dir=frames_dir)
+    storage._open_catalog()
+
+    started = perf_counter()
+    for process in processes:
+        process.start()
+    event_size = 0
+    for _ in range(FRAMES):
+        event = queues[-1].get()
+        event_size = len(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL))
+        lat, lon, timestamp, frame = event.parameters
+        image_id = storage._catalog.append(lat, lon, timestamp, event.source)
+        if pool is not None:
+            storage._save_frame(image_id, frame)
+        else:
+            storage._tiles.save(image_id, frame)
+    storage._tiles.close()
+    elapsed = perf_counter() - started
+    for process in processes:
+        process.join()
+    storage._catalog.close()
+    return FRAMES / elapsed, event_size
+
+
+def main():
+    frame_bytes = int(np.prod(CAMERA_FRAME_SHAPE))
+    pool = FramePool(slots=POOL_SLOTS, frame_shape=CAMERA_FRAME_SHAPE)
+    print(f"кадр {CAMERA_FRAME_SHAPE}: {frame_bytes / 1024:.0f} КБ, {RELAYS + 1} передачи через очереди")
+    try:
+        for name, frames_pool in (("кадр в событии (pickle)", None), ("описатель кадра в FramePool", pool)):
+            with tempfile.TemporaryDirectory() as frames_dir:
+                rate, event_size = measure(frames_pool, frames_dir)
+            # через каждую очередь событие проходит сериализованным
+            through_queues = event_size * (RELAYS + 1)
+            print(f"  {name:30} {rate:7.0f} кадр./сек, событие {event_size:>7} байт, "
+                  f"через очереди {through_queues / 1024:8.1f} КБ на кадр")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+""" скорость пересчета группировки спутников в зависимости от их числа
+
+Запуск из корня репозитория:
+    python -m benchmarks.constellation
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.satellite_simulator.constellation import Constellation
+
+STEP_SEC = 30
+
+
+def make_constellation(count):
+    rng = np.random.default_rng(0)
+    return Constellation(
+        altitudes=rng.uniform(300e3, 1500e3, count),
+        position_angles=rng.uniform(0, 2 * np.pi, count),
+        inclinations=rng.uniform(0, np.pi, count),
+        raans=rng.uniform(0, 2 * np.pi, count))
+
+
+def main():
+    for count in (1, 100, 10000):
+        constellation = make_constellation(count)
+        steps = max(10, 200000 // count)
+        seconds = timeit(lambda: constellation.step(STEP_SEC), number=steps)
+        coords = timeit(constellation.get_earth_coordinates, number=steps)
+        print(
+            f"N = {count:6}: {steps / seconds:10.0f} шагов/сек "
+            f"({count * steps / seconds:12.0f} спутнико-шагов/сек), "
+            f"координаты {coords / steps * 1e6:8.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+""" сравнение пропускной способности монитора безопасности при отправке
+событий по одному и пакетами EventBatch
+
+Запуск из корня репозитория:
+    python -m benchmarks.event_batching
+"""
+from multiprocessing import Queue
+from time import perf_counter
+
+from src.system.batching import get_batch, put_batch
+from src.system.queues_dir import QueuesDirectory
+from src.system.event_types import Event
+from src.system.security_policy_type import SecurityPolicy
+from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME
+from src.satellite_control_system.my_security_monitor import MySecurityMonitor
+
+EVENTS = 40000
+BATCH_SIZE = 2  # как в реакциях хранилища зон и модуля оптики
+SENDER_NAME = "bench_sender"
+SINK_NAME = "bench_sink"
+
+
+def measure(batch_size):
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    sink_q = queues_dir.register(Queue(), SINK_NAME)
+    policies = [SecurityPolicy(source=SENDER_NAME, destination=SINK_NAME, operation="data")]
+    monitor = MySecurityMonitor(queues_dir=queues_dir, log_level=LOG_ERROR, policies=policies)
+    monitor.start()
+    monitor_q = queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+
+    started = perf_counter()
+    events = [
+        Event(source=SENDER_NAME, destination=SINK_NAME, operation="data", parameters=(i, 0.0))
+        for i in range(EVENTS)
+    ]
+    for i in range(0, EVENTS, batch_size):
+        if batch_size == 1:
+            monitor_q.put(events[i])
+        else:
+            put_batch(monitor_q, events[i:i + batch_size])
+    received = 0
+    while received < EVENTS:
+        sink_q._reader.poll(None)
+        received += len(get_batch(sink_q, EVENTS))
+    elapsed = perf_counter() - started
+
+    monitor.stop()
+    monitor.join()
+    return EVENTS / elapsed
+
+
+def main():
+    for batch_size in (1, BATCH_SIZE, 16):
+        print(f"размер пакета {batch_size:3}: {measure(batch_size):10.0f} событий/сек")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+""" сравнение сериализации событий через pickle и через EventCodec:
+размер сообщения и скорость упаковки/распаковки
+
+Запуск из корня репозитория:
+    python -m benchmarks.event_codec
+"""
+import pickle
+from timeit import timeit
+
+from src.system.event_types import Event
+from src.system.event_codec import EventCodec
+from src.satellite_control_system.policies import security_policies
+from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.system.config import (
+    CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+    OPTICS_CONTROL_QUEUE_NAME,
+    CAMERA_QUEUE_NAME,
+    ORBIT_CONTROL_QUEUE_NAME,
+    ORBIT_LIMITER_QUEUE_NAME,
+)
+
+ROUNDS = 20000
+
+EVENTS = {
+    "request_photo": Event(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=CAMERA_QUEUE_NAME,
+        operation="request_photo",
+        parameters=None),
+    "camera_update": Event(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=OPTICS_CONTROL_QUEUE_NAME,
+        operation="camera_update",
+        parameters=(55.751244, 37.618423)),
+    "set_orbit_limits": Event(
+        source=ORBIT_LIMITER_QUEUE_NAME,
+        destination=ORBIT_CONTROL_QUEUE_NAME,
+        operation="set_orbit_limits",
+        parameters={"min_altitude": 300e3, "max_altitude": 1500e3,
+                    "min_inclination": 0.0, "max_inclination": 3.14}),
+    "zones_update (10 зон)": Event(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=OPTICS_CONTROL_QUEUE_NAME,
+        operation="zones_update",
+        parameters=[RestrictedZone(i, i, i + 1, i + 1) for i in range(10)]),
+}
+
+
+def main():
+    codec = EventCodec(security_policies)
+    for name, event in EVENTS.items():
+        assert codec.decode(codec.encode(event)) == event
+        pickled = pickle.dumps(event)
+        packed = codec.encode(event)
+        pickle_rate = ROUNDS / timeit(lambda: pickle.loads(pickle.dumps(event)), number=ROUNDS)
+        codec_rate = ROUNDS / timeit(lambda: codec.decode(codec.encode(event)), number=ROUNDS)
+        print(
+            f"{name:22} pickle: {len(pickled):4} байт, {pickle_rate:9.0f} сообщ./сек | "
+            f"codec: {len(packed):4} байт, {codec_rate:9.0f} сообщ./сек")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+""" постоянный каталог снимков ImageStorage: стоимость добавления записи
+при росте каталога до миллионов снимков, сохранение между запусками
+и чтение каталога другим процессом без обращения к хранилищу
+
+Запуск из корня репозитория:
+    python -m benchmarks.image_catalog
+"""
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from src.satellite_control_system.image_catalog import ImageCatalog
+
+RECORDS = 2_000_000
+CHECKPOINTS = (10_000, 100_000, 1_000_000, RECORDS)
+SOURCES = ("camera", "satellite", "central_control_system")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image_catalog.bin")
+        catalog = ImageCatalog(path)
+        reader = ImageCatalog(path, readonly=True)
+        rng = np.random.default_rng(0)
+        lat = rng.uniform(-90, 90, RECORDS).tolist()
+        lon = rng.uniform(-180, 180, RECORDS).tolist()
+
+        print(f"добавление {RECORDS} снимков:")
+        done = 0
+        for checkpoint in CHECKPOINTS:
+            start = perf_counter()
+            for index in range(done, checkpoint):
+                catalog.append(lat[index], lon[index], float(index), SOURCES[index % 3])
+            elapsed = perf_counter() - start
+            print(f"  до {checkpoint:>9} снимков: {elapsed / (checkpoint - done) * 1e6:5.2f} мкс на снимок")
+            done = checkpoint
+
+        start = perf_counter()
+        records = reader.records()
+        in_box = np.count_nonzero((records["lat"] > 50) & (records["lat"] < 60))
+        scan_time = perf_counter() - start
+        assert len(records) == RECORDS
+        print(f"  чтение другим процессом (полный просмотр): {scan_time * 1e3:.1f} мс, "
+              f"{in_box} снимков в полосе 50..60")
+        del records
+        reader.close()
+        catalog.close()
+
+        start = perf_counter()
+        reopened = ImageCatalog(path)
+        reopen_time = perf_counter() - start
+        assert len(reopened) == RECORDS and reopened.records()["timestamp"][-1] == RECORDS - 1
+        print(f"  повторное открытие после перезапуска: {reopen_time * 1e3:.2f} мс, "
+              f"{len(reopened)} снимков, файл {os.path.getsize(path) / 2**20:.0f} МБ")
+        reopened.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+""" выгрузка каталога из 2 000 000 снимков по столбцам (.npy и .npz),
+загрузка с отображением в память и расчет покрытия поверхности снимками
+(сетка 1x1 градус, число снимков по суткам) без воспроизведения событий
+
+Запуск из корня репозитория:
+    python -m benchmarks.image_export
+"""
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from src.satellite_control_system.image_catalog import ImageCatalog
+from src.satellite_control_system.image_export import export_images, load_images
+
+IMAGES = 2_000_000
+SOURCES = ("central_control_system", "camera")
+
+
+def timed(func):
+    start = perf_counter()
+    result = func()
+    return result, perf_counter() - start
+
+
+def coverage(images):
+    covered, _, _ = np.histogram2d(
+        images["lat"], images["lon"], bins=(180, 360), range=((-90, 90), (-180, 180)))
+    per_day = np.bincount((np.asarray(images["timestamp"]) // 86400).astype(np.int64))
+    return np.count_nonzero(covered) / covered.size, per_day
+
+
+def main():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-60, 60, IMAGES).tolist()
+    lon = rng.uniform(-180, 180, IMAGES).tolist()
+    timestamps = np.sort(rng.uniform(0, 30 * 86400, IMAGES)).tolist()
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = ImageCatalog(os.path.join(directory, "image_catalog.bin"))
+        for index in range(IMAGES):
+            catalog.append(lat[index], lon[index], timestamps[index], SOURCES[index % 2])
+
+        columns_path = os.path.join(directory, "export")
+        archive_path = os.path.join(directory, "export.npz")
+        _, columns_time = timed(lambda: export_images(catalog, columns_path))
+        _, archive_time = timed(lambda: export_images(catalog, archive_path))
+        catalog.close()
+
+        images, mmap_time = timed(lambda: load_images(columns_path))
+        _, archive_load_time = timed(lambda: load_images(archive_path))
+        (covered, per_day), coverage_time = timed(lambda: coverage(images))
+        assert len(images["lat"]) == IMAGES and list(images["sources"]) == list(SOURCES)
+
+        print(f"каталог из {IMAGES} снимков:")
+        print(f"  выгрузка в .npy по столбцам:   {columns_time * 1e3:7.0f} мс")
+        print(f"  выгрузка в .npz:               {archive_time * 1e3:7.0f} мс "
+              f"({os.path.getsize(archive_path) / 2**20:.0f} МБ)")
+        print(f"  загрузка .npy (mmap):          {mmap_time * 1e3:7.2f} мс")
+        print(f"  загрузка .npz:                 {archive_load_time * 1e3:7.0f} мс")
+        print(f"  покрытие по сетке и по суткам: {coverage_time * 1e3:7.0f} мс "
+              f"(покрыто {covered:.0%} ячеек, {per_day.mean():.0f} снимков в сутки)")
+        del images
+
+
+if __name__ == "__main__":
+    main()
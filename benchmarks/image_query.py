@@ -0,0 +1,116 @@
+""" запросы к каталогу из 1 000 000 снимков: отбор по прямоугольнику,
+интервалу времени и источнику через индексы ImageIndex и выдача результата
+страницами images_page (размер сообщения и время занятости цикла хранилища)
+
+Запуск из корня репозитория:
+    python -m benchmarks.image_query
+"""
+import os
+import pickle
+import tempfile
+from queue import Queue
+from time import perf_counter
+
+import numpy as np
+
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME
+from src.satellite_control_system.image_catalog import ImageCatalog
+from src.satellite_control_system.image_index import ImageIndex, ImageQuery
+from src.satellite_control_system.image_storage import ImageStorage
+
+IMAGES = 1_000_000
+REPEATS = 20
+SOURCES = ("central_control_system", "camera")
+
+QUERIES = {
+    "весь каталог, LIMIT 1000": ImageQuery(limit=1000),
+    "прямоугольник 5x5 градусов": ImageQuery(bbox=(50.0, 30.0, 55.0, 35.0)),
+    "интервал 1 ч": ImageQuery(time_range=(36000.0, 39600.0)),
+    "прямоугольник 20x20 + 1 ч": ImageQuery(bbox=(0.0, 0.0, 20.0, 20.0), time_range=(36000.0, 39600.0)),
+    "источник camera, LIMIT 500": ImageQuery(source="camera", limit=500),
+}
+
+
+def fill_catalog(catalog, count):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-90, 90, count).tolist()
+    lon = rng.uniform(-180, 180, count).tolist()
+    # снимки сохраняются по мере съемки: время возрастает
+    timestamps = np.sort(rng.uniform(0, 30 * 86400, count)).tolist()
+    for index in range(count):
+        catalog.append(lat[index], lon[index], timestamps[index], SOURCES[index % 2])
+
+
+def brute_force(records, query, source_code):
+    mask = np.ones(len(records), dtype=bool)
+    if query.bbox is not None:
+        lat1, lon1, lat2, lon2 = query.bbox
+        mask &= (records["lat"] >= lat1) & (records["lat"] <= lat2)
+        mask &= (records["lon"] >= lon1) & (records["lon"] <= lon2)
+    if query.time_range is not None:
+        mask &= (records["timestamp"] >= query.time_range[0]) & (records["timestamp"] <= query.time_range[1])
+    if query.source is not None:
+        mask &= records["source"] == source_code
+    ids = np.flatnonzero(mask)
+    return ids[:query.limit]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image_catalog.bin")
+        catalog = ImageCatalog(path)
+        fill_catalog(catalog, IMAGES)
+        index = ImageIndex(catalog)
+
+        start = perf_counter()
+        index.select(ImageQuery(limit=1))
+        print(f"построение индексов по {IMAGES} снимкам: {(perf_counter() - start) * 1e3:.0f} мс")
+
+        records = catalog.records()
+        print("отбор снимков (индексы / полный просмотр без индексов):")
+        for name, query in QUERIES.items():
+            start = perf_counter()
+            for _ in range(REPEATS):
+                found = index.select(query)
+            indexed_time = (perf_counter() - start) / REPEATS
+            start = perf_counter()
+            for _ in range(REPEATS):
+                brute_force(records, query, catalog.find_source(query.source or ""))
+            scan_time = (perf_counter() - start) / REPEATS
+            print(f"  {name:<28} {len(found):>7} снимков: {indexed_time * 1e3:7.2f} мс / {scan_time * 1e3:6.2f} мс")
+        del records
+        catalog.close()
+
+        queues_dir = QueuesDirectory()
+        queues_dir.log_level = LOG_ERROR
+        security_q = queues_dir.register(Queue(), SECURITY_MONITOR_QUEUE_NAME)
+        storage = ImageStorage(queues_dir=queues_dir, log_level=LOG_ERROR, catalog_path=path,
+                               frames_dir=os.path.join(directory, "frames"))
+        storage._open_catalog()
+        start = perf_counter()
+        storage._start_query(ImageQuery())
+        select_time = perf_counter() - start
+        pages = 0
+        longest = 0.0
+        largest = 0
+        while storage._queries:
+            start = perf_counter()
+            storage._send_image_pages()
+            longest = max(longest, perf_counter() - start)
+            page = security_q.get()
+            largest = max(largest, len(pickle.dumps(page, protocol=pickle.HIGHEST_PROTOCOL)))
+            pages += 1
+        assert page.parameters[3] and page.parameters[1] == IMAGES
+        records = storage._catalog.records()
+        whole = list(zip(records["lat"].tolist(), records["lon"].tolist(), records["timestamp"].tolist()))
+        del records
+        storage._catalog.close()
+        print(f"выдача всего каталога: отбор {select_time * 1e3:.0f} мс (с построением индексов), "
+              f"{pages} страниц, не более {longest * 1e3:.2f} мс на страницу, сообщение до {largest / 1024:.0f} КБ")
+        print(f"  список всех снимков одним сообщением: "
+              f"{len(pickle.dumps(whole, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20:.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
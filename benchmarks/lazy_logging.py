@@ -0,0 +1,39 @@
+""" стоимость отладочного сообщения при выключенном уровне LOG_DEBUG:
+f-строка с описанием события против отложенного форматирования
+
+Запуск из корня репозитория:
+    python -m benchmarks.lazy_logging
+"""
+from timeit import timeit
+
+from src.system.event_types import Event
+from src.system.log import LogMixin
+from src.system.config import LOG_DEBUG, LOG_INFO
+
+ROUNDS = 200000
+
+
+class Component(LogMixin):
+    log_prefix = "[BENCH]"
+    log_level = LOG_INFO
+
+
+def main():
+    component = Component()
+    event = Event(
+        source="central_control_system",
+        destination="optics_control",
+        operation="camera_update",
+        parameters=(55.751244, 37.618423))
+    cases = {
+        "f-строка": lambda: component._log_message(LOG_DEBUG, f"получен запрос {event}"),
+        "%-шаблон": lambda: component._log_message(LOG_DEBUG, "получен запрос %s", event),
+        "_log_enabled": lambda: component._log_enabled(LOG_DEBUG),
+    }
+    for name, call in cases.items():
+        seconds = timeit(call, number=ROUNDS)
+        print(f"{name:14} {seconds / ROUNDS * 1e9:8.0f} нс на вызов")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+""" сравнение поиска ближайшей точки новой орбиты: перебор 360 углов
+(прежняя реализация Satellite._change_orbit) и аналитическое решение
+
+Запуск из корня репозитория:
+    python -m benchmarks.orbit_change
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import LOG_ERROR
+from src.satellite_simulator.satellite import Satellite, EARTH_RADIUS
+
+ORBITS = 200
+
+
+def grid_search(satellite, new_altitude, new_inclination, new_raan):
+    """ прежний алгоритм: перебор углов с шагом около 1 градуса """
+    new_radius = EARTH_RADIUS + new_altitude
+    angles = np.linspace(0, 2 * np.pi, 360)
+    positions = np.array([
+        satellite._compute_position(new_radius, new_raan, a, new_inclination) for a in angles])
+    distances = np.linalg.norm(positions - satellite._position, axis=1)
+    return distances.min()
+
+
+def main():
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    satellite = Satellite(
+        altitude=1000e3, position_angle=0.3, inclination=np.pi / 3, raan=0,
+        queues_dir=queues_dir, log_level=LOG_ERROR)
+    rng = np.random.default_rng(0)
+    orbits = [
+        (rng.uniform(300e3, 1500e3), rng.uniform(0, np.pi), rng.uniform(0, 2 * np.pi))
+        for _ in range(ORBITS)
+    ]
+    start_position = satellite._position.copy()
+    start_orbit = (satellite._altitude, satellite._inclination, satellite._raan)
+
+    worst_gain = 0.0
+    max_angle_error = 0.0
+    for orbit in orbits:
+        grid_distance = grid_search(satellite, *orbit)
+        analytic_distance = satellite._change_orbit(*orbit)
+        worst_gain = max(worst_gain, analytic_distance - grid_distance)
+        # проверка оптимальности: производная расстояния по углу равна нулю
+        basis = satellite._orbit_plane_basis(orbit[2], orbit[1])
+        tangent = -np.sin(satellite._position_angle) * basis[0] + np.cos(satellite._position_angle) * basis[1]
+        along_p, along_q = basis @ start_position
+        projected = np.hypot(along_p, along_q)
+        max_angle_error = max(
+            max_angle_error,
+            abs(np.dot(start_position, tangent)) / max(projected, 1e-9))
+        satellite._position = start_position.copy()
+        satellite._altitude, satellite._inclination, satellite._raan = start_orbit
+
+    grid_time = timeit(lambda: [grid_search(satellite, *o) for o in orbits], number=1) / ORBITS
+    analytic_time = timeit(lambda: [satellite._change_orbit(*o) for o in orbits], number=1) / ORBITS
+    print(f"перебор 360 углов: {grid_time * 1e6:9.1f} мкс на смену орбиты")
+    print(f"аналитически:      {analytic_time * 1e6:9.1f} мкс на смену орбиты")
+    print(f"аналитическое расстояние больше перебора максимум на {worst_gain:.3e} м")
+    print(f"погрешность угла ближайшей точки: {np.degrees(max_angle_error) * 3600:.2e} угл. сек.")
+
+
+if __name__ == "__main__":
+    main()
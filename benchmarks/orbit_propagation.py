@@ -0,0 +1,55 @@
+""" сравнение численного интегрирования (Velocity Verlet с шагом 30 сек.)
+и аналитического расчета позиции на круговой орбите
+
+Запуск из корня репозитория:
+    python -m benchmarks.orbit_propagation
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import LOG_ERROR
+from src.satellite_simulator.satellite import Satellite, G, EARTH_MASS
+
+STEP_SEC = 30
+DAYS = 7
+
+
+def make_satellite(queues_dir, mode):
+    return Satellite(
+        altitude=1000e3, position_angle=0.3, inclination=np.pi / 3, raan=0.5,
+        queues_dir=queues_dir, log_level=LOG_ERROR, propagation_mode=mode)
+
+
+def energy(satellite):
+    return (np.dot(satellite._velocity, satellite._velocity) / 2
+            - G * EARTH_MASS / np.linalg.norm(satellite._position))
+
+
+def main():
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    numeric = make_satellite(queues_dir, Satellite.PROPAGATION_NUMERIC)
+    analytic = make_satellite(queues_dir, Satellite.PROPAGATION_ANALYTIC)
+    steps = DAYS * 24 * 3600 // STEP_SEC
+    start_energy = energy(numeric)
+
+    numeric_time = timeit(lambda: numeric._update_position(STEP_SEC), number=steps) / steps
+    analytic_time = timeit(lambda: analytic.position_at(steps * STEP_SEC), number=steps) / steps
+    analytic._set_analytic_position(steps * STEP_SEC)
+
+    print(f"численный шаг:          {numeric_time * 1e6:8.1f} мкс")
+    print(f"аналитическая позиция:  {analytic_time * 1e6:8.1f} мкс (в любой момент времени)")
+    print(f"за {DAYS} суток ({steps} шагов):")
+    print(f"  расхождение позиций:             {np.linalg.norm(numeric._position - analytic._position):12.1f} м")
+    print(f"  дрейф энергии (численно):        {abs(energy(numeric) / start_energy - 1):12.3e}")
+    print(f"  дрейф энергии (аналитически):    {abs(energy(analytic) / start_energy - 1):12.3e}")
+
+    times = np.arange(0, 90 * 60, 10.0)
+    batch_time = timeit(lambda: analytic.position_at(times), number=100) / 100
+    print(f"{len(times)} позиций одним вызовом position_at: {batch_time * 1e6:8.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
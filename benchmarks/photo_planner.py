@@ -0,0 +1,72 @@
+""" время планирования снимков: прогноз трассы на сутки и поиск интервалов
+вне запрещенных зон для 10 000 зон
+
+Запуск из корня репозитория:
+    python -m benchmarks.photo_planner
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import LOG_ERROR
+from src.satellite_simulator.satellite import Satellite
+from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.satellite_control_system.photo_planner import track_in_zones, free_windows, next_window
+
+ZONES = 10000
+HORIZON_MINUTES = 24 * 60
+RESOLUTION_SEC = 30
+REPEAT = 5
+
+
+def make_zones(count):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-85, 80, count)
+    lon = rng.uniform(-180, 175, count)
+    size = rng.uniform(0.1, 2.0, (count, 2))
+    return [RestrictedZone(la, lo, la + h, lo + w) for la, lo, (h, w) in zip(lat, lon, size)]
+
+
+def loop_in_zones(lat, lon, zones):
+    """ поточечная проверка, как в OpticsControl._check_point_in_zones """
+    return np.array([
+        any(z.lat_bot_left <= la <= z.lat_top_right and z.lon_bot_left <= lo <= z.lon_top_right
+            for z in zones)
+        for la, lo in zip(lat, lon)])
+
+
+def main():
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    satellite = Satellite(
+        altitude=1000e3, position_angle=0, inclination=np.pi / 3, raan=0,
+        queues_dir=queues_dir, log_level=LOG_ERROR)
+    zones = make_zones(ZONES)
+
+    track_time = timeit(
+        lambda: satellite.predict_ground_track(HORIZON_MINUTES, RESOLUTION_SEC), number=REPEAT) / REPEAT
+    times, lat, lon = satellite.predict_ground_track(HORIZON_MINUTES, RESOLUTION_SEC)
+
+    def plan():
+        return free_windows(times, track_in_zones(lat, lon, zones))
+
+    plan_time = timeit(plan, number=REPEAT) / REPEAT
+    windows = plan()
+    inside = track_in_zones(lat, lon, zones)
+
+    sample = slice(0, 100)
+    assert (loop_in_zones(lat[sample], lon[sample], zones) == inside[sample]).all()
+    loop_time = timeit(lambda: loop_in_zones(lat[sample], lon[sample], zones), number=1)
+    loop_time *= len(times) / 100
+
+    print(f"{ZONES} зон, горизонт {HORIZON_MINUTES // 60} ч, шаг {RESOLUTION_SEC} сек.: {len(times)} точек трассы")
+    print(f"прогноз трассы:              {track_time * 1e3:9.1f} мс")
+    print(f"планирование (векторно):     {plan_time * 1e3:9.1f} мс")
+    print(f"поточечная проверка (оценка): {loop_time * 1e3:9.0f} мс")
+    print(f"точек в зонах: {inside.sum()}, разрешенных интервалов: {len(windows)}")
+    print(f"ближайший интервал после t=0: {next_window(windows, 0.0)}")
+
+
+if __name__ == "__main__":
+    main()
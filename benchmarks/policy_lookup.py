@@ -0,0 +1,49 @@
+""" сравнение проверки события линейным поиском по списку политик
+и поиском по индексу политик
+
+Запуск из корня репозитория:
+    python -m benchmarks.policy_lookup
+"""
+import random
+from timeit import timeit
+
+from src.system.security_policy_type import SecurityPolicy, build_policy_index, is_allowed
+from src.satellite_control_system.policies import security_policies
+
+POLICIES_COUNT = 5000
+CHECKS = 2000
+
+
+def make_policies(count):
+    policies = list(security_policies)
+    for i in range(count - len(policies)):
+        policies.append(
+            SecurityPolicy(
+                source=f"component_{i % 97}",
+                destination=f"component_{i % 89}",
+                operation=f"operation_{i}"))
+    random.Random(0).shuffle(policies)
+    return policies
+
+
+def main():
+    policies = make_policies(POLICIES_COUNT)
+    index = build_policy_index(policies)
+    requests = [random.Random(1).choice(policies) for _ in range(CHECKS)]
+    requests += [SecurityPolicy("intruder", p.destination, p.operation) for p in requests[:CHECKS // 4]]
+
+    def list_scan():
+        for r in requests:
+            SecurityPolicy(source=r.source, destination=r.destination, operation=r.operation) in policies
+
+    def indexed():
+        for r in requests:
+            is_allowed(index, r.source, r.destination, r.operation)
+
+    for name, check in (("список", list_scan), ("индекс", indexed)):
+        seconds = timeit(check, number=1)
+        print(f"{name}: {len(policies)} политик, {seconds / len(requests) * 1e6:10.2f} мкс на проверку")
+
+
+if __name__ == "__main__":
+    main()
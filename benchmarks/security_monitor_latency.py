@@ -0,0 +1,125 @@
+""" замер сквозной задержки цепочки сообщений через монитор безопасности
+
+Имитирует запрос MAKE PHOTO: событие проходит через монитор HOPS раз
+(auth -> ЦСУ -> камера -> ЦСУ -> оптика -> ЦСУ), после чего возвращается
+в тестовую очередь. Сравнивается монитор с блокирующим ожиданием событий
+и монитор с прежним фиксированным опросом раз в 0.1 сек.
+
+Запуск из корня репозитория:
+    python -m benchmarks.security_monitor_latency
+"""
+import statistics
+from multiprocessing import Queue
+from queue import Empty
+from time import sleep, perf_counter
+
+from src.system.custom_process import BaseCustomProcess
+from src.system.queues_dir import QueuesDirectory
+from src.system.event_types import Event
+from src.system.security_policy_type import SecurityPolicy
+from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME
+from src.satellite_control_system.my_security_monitor import MySecurityMonitor
+
+HOPS = 6
+REQUESTS = 50
+DRIVER_NAME = "bench_driver"
+PING_NAME = "bench_ping"
+PONG_NAME = "bench_pong"
+
+
+class PollingSecurityMonitor(MySecurityMonitor):
+    """ монитор с фиксированным интервалом опроса (поведение до оптимизации) """
+
+    def run(self):
+        while self._quit is False:
+            sleep(self._recalc_interval_sec)
+            self._check_events_q()
+            self._check_control_q()
+
+
+class Relay(BaseCustomProcess):
+    """ компонент, пересылающий событие напарнику через монитор """
+
+    def __init__(self, name, peer, queues_dir):
+        super().__init__(
+            log_prefix=f"[{name}]",
+            queues_dir=queues_dir,
+            events_q_name=name,
+            event_source_name=name,
+            log_level=LOG_ERROR)
+        self._peer = peer
+
+    def _check_events_q(self):
+        while True:
+            try:
+                event = self._get_event()
+            except Empty:
+                break
+            hops_left, started = event.parameters
+            destination = self._peer if hops_left > 1 else DRIVER_NAME
+            self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME).put(
+                Event(
+                    source=self._event_source_name,
+                    destination=destination,
+                    operation="hop",
+                    parameters=(hops_left - 1, started)))
+
+    def run(self):
+        while not self._quit:
+            self._wait_for_events()
+            self._check_events_q()
+            self._check_control_q()
+
+
+def measure(monitor_cls):
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    driver_q = Queue()
+    queues_dir.register(driver_q, DRIVER_NAME)
+
+    policies = [
+        SecurityPolicy(source=DRIVER_NAME, destination=PING_NAME, operation="hop"),
+        SecurityPolicy(source=PING_NAME, destination=PONG_NAME, operation="hop"),
+        SecurityPolicy(source=PONG_NAME, destination=PING_NAME, operation="hop"),
+        SecurityPolicy(source=PING_NAME, destination=DRIVER_NAME, operation="hop"),
+        SecurityPolicy(source=PONG_NAME, destination=DRIVER_NAME, operation="hop"),
+    ]
+    components = [
+        monitor_cls(queues_dir=queues_dir, log_level=LOG_ERROR, policies=policies),
+        Relay(PING_NAME, PONG_NAME, queues_dir),
+        Relay(PONG_NAME, PING_NAME, queues_dir),
+    ]
+    for component in components:
+        component.start()
+
+    monitor_q = queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+    latencies = []
+    for _ in range(REQUESTS):
+        # первый переход - от тестовой очереди к первому компоненту
+        monitor_q.put(
+            Event(
+                source=DRIVER_NAME,
+                destination=PING_NAME,
+                operation="hop",
+                parameters=(HOPS - 1, perf_counter())))
+        _, started = driver_q.get().parameters
+        latencies.append((perf_counter() - started) * 1000)
+
+    for component in components:
+        component.stop()
+    for component in components:
+        component.join()
+    return latencies
+
+
+def main():
+    for monitor_cls in (PollingSecurityMonitor, MySecurityMonitor):
+        latencies = sorted(measure(monitor_cls))
+        print(
+            f"{monitor_cls.__name__:24} {HOPS} переходов: "
+            f"медиана {statistics.median(latencies):8.2f} мс, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1]:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+""" замер пропускной способности монитора безопасности
+в зависимости от количества обработчиков
+
+Несколько отправителей рассылают события по DESTINATIONS получателям
+через монитор, получатели считают доставленные события.
+
+Запуск из корня репозитория:
+    python -m benchmarks.security_monitor_throughput [макс. число обработчиков]
+"""
+import sys
+from multiprocessing import Process, Queue, Event as StartSignal
+from queue import Empty
+from time import perf_counter
+
+from src.system.custom_process import BaseCustomProcess
+from src.system.queues_dir import QueuesDirectory
+from src.system.event_types import Event
+from src.system.security_policy_type import SecurityPolicy
+from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME
+from src.satellite_control_system.my_security_monitor import MySecurityMonitor
+
+SENDERS = 4
+DESTINATIONS = 8
+EVENTS_PER_SENDER = 20000
+
+
+class Sink(BaseCustomProcess):
+    """ получатель, сообщающий о доставке всех ожидаемых событий """
+
+    def __init__(self, name, expected, done_q, queues_dir):
+        super().__init__(
+            log_prefix=f"[{name}]",
+            queues_dir=queues_dir,
+            events_q_name=name,
+            event_source_name=name,
+            log_level=LOG_ERROR)
+        self._expected = expected
+        self._done_q = done_q
+
+    def _check_events_q(self):
+        while True:
+            try:
+                self._get_event()
+            except Empty:
+                break
+            self._expected -= 1
+            if self._expected == 0:
+                self._done_q.put(perf_counter())
+
+    def run(self):
+        while not self._quit:
+            self._wait_for_events()
+            self._check_events_q()
+            self._check_control_q()
+
+
+def send(queues_dir, sender_name, start_signal):
+    q = queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+    start_signal.wait()
+    for i in range(EVENTS_PER_SENDER):
+        q.put(
+            Event(
+                source=sender_name,
+                destination=f"sink_{i % DESTINATIONS}",
+                operation="data",
+                parameters=(i, 0.0)))
+
+
+def measure(workers):
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    done_q = Queue()
+    senders = [f"sender_{i}" for i in range(SENDERS)]
+    sinks = [f"sink_{i}" for i in range(DESTINATIONS)]
+    policies = [
+        SecurityPolicy(source=sender, destination=sink, operation="data")
+        for sender in senders for sink in sinks
+    ]
+
+    components = MySecurityMonitor.create_workers(
+        queues_dir=queues_dir, workers=workers, log_level=LOG_ERROR, policies=policies)
+    expected = SENDERS * EVENTS_PER_SENDER // DESTINATIONS
+    components += [Sink(sink, expected, done_q, queues_dir) for sink in sinks]
+    for component in components:
+        component.start()
+
+    start_signal = StartSignal()
+    producers = [Process(target=send, args=(queues_dir, sender, start_signal)) for sender in senders]
+    for producer in producers:
+        producer.start()
+    started = perf_counter()
+    start_signal.set()
+    finished = max(done_q.get() for _ in sinks)
+
+    for producer in producers:
+        producer.join()
+    for component in components:
+        component.stop()
+    for component in components:
+        component.join()
+    return SENDERS * EVENTS_PER_SENDER / (finished - started)
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        rate = measure(workers)
+        baseline = baseline or rate
+        print(f"обработчиков: {workers}, {rate:10.0f} событий/сек, x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" сравнение передачи частых сообщений (координат спутника) через
+multiprocessing.Queue и через ShmRingQueue
+
+Запуск из корня репозитория:
+    python -m benchmarks.shm_ring_queue
+"""
+from multiprocessing import Process, Queue
+from time import perf_counter
+
+from src.system.event_types import Event
+from src.system.event_codec import EventCodec
+from src.system.shm_ring_queue import ShmRingQueue
+from src.satellite_control_system.policies import security_policies
+from src.system.config import SATELITE_QUEUE_NAME, ORBIT_DRAWER_QUEUE_NAME
+
+MESSAGES = 100000
+
+
+def produce(q):
+    for i in range(MESSAGES):
+        q.put(
+            Event(
+                source=SATELITE_QUEUE_NAME,
+                destination=ORBIT_DRAWER_QUEUE_NAME,
+                operation="update_orbit_data",
+                parameters=(i * 1e-3, -i * 1e-3)))
+
+
+def measure(q):
+    producer = Process(target=produce, args=(q,))
+    started = perf_counter()
+    producer.start()
+    for i in range(MESSAGES):
+        event = q.get()
+        assert event.parameters[0] == i * 1e-3
+    elapsed = perf_counter() - started
+    producer.join()
+    return MESSAGES / elapsed
+
+
+def main():
+    codec = EventCodec(security_policies)
+    transports = {
+        "multiprocessing.Queue": Queue(),
+        "ShmRingQueue (pickle)": ShmRingQueue(capacity=1 << 16),
+        "ShmRingQueue (codec)": ShmRingQueue(capacity=1 << 16, codec=codec),
+    }
+    for name, q in transports.items():
+        print(f"{name:24} {measure(q):10.0f} сообщ./сек")
+        if isinstance(q, ShmRingQueue):
+            q.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+""" запись кадров снимков сжатыми фрагментами (TileStore): скорость записи
+и степень сжатия для zlib и lzma с разной степенью сжатия, число потоков
+сжатия, доля повторных фрагментов при повторной съемке тех же участков
+
+Кадры - синтетическая подложка камеры с шумом датчика (без шума
+однотонные участки подложки сжимаются в сотни раз и не показательны).
+
+Запуск из корня репозитория:
+    python -m benchmarks.tile_store
+"""
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from src.system.config import CAMERA_FRAME_SHAPE, CAMERA_FOV_DEG
+from src.satellite_simulator.basemap import make_basemap, render_frame
+from src.satellite_control_system.tile_store import TileStore
+
+FRAMES = 64
+# повторная съемка: каждый участок снимается REPEATS раз
+REPEATS = 4
+SETTINGS = [
+    ("zlib", 1, 1),
+    ("zlib", 1, 4),
+    ("zlib", 6, 4),
+    ("zlib", 9, 4),
+    ("lzma", 0, 4),
+    ("lzma", 6, 4),
+]
+
+
+def make_frames(count, repeats):
+    basemap = make_basemap()
+    rng = np.random.default_rng(0)
+    frames = []
+    for index in range(count // repeats):
+        frame = np.empty(CAMERA_FRAME_SHAPE, dtype=np.uint8)
+        render_frame(basemap, rng.uniform(-60, 60), rng.uniform(-180, 180), CAMERA_FOV_DEG, frame)
+        noise = rng.normal(0, 3, frame.shape)
+        frame[...] = np.clip(frame + noise, 0, 255)
+        frames.extend([frame] * repeats)
+    return frames
+
+
+def measure(frames, codec, level, workers):
+    with tempfile.TemporaryDirectory() as directory:
+        store = TileStore(directory, codec=codec, level=level, workers=workers)
+        started = perf_counter()
+        for future in [store.save(index, frame) for index, frame in enumerate(frames)]:
+            future.result()
+        elapsed = perf_counter() - started
+        store.close()
+        assert np.array_equal(store.load(len(frames) - 1), frames[-1])
+        return elapsed, store
+
+
+def main():
+    frames = make_frames(FRAMES, REPEATS)
+    raw = sum(frame.nbytes for frame in frames)
+    print(f"{FRAMES} кадров {CAMERA_FRAME_SHAPE} ({raw / 2**20:.0f} МБ), каждый участок снят {REPEATS} раза:")
+    print("  сжатие        потоки   кадр./сек   МБ/сек   сжатие   с повторами   повторов фрагментов")
+    for codec, level, workers in SETTINGS:
+        elapsed, store = measure(frames, codec, level, workers)
+        unique = raw / REPEATS
+        print(f"  {codec:4} {level:<8} {workers:6} {FRAMES / elapsed:11.0f} {raw / elapsed / 2**20:8.0f} "
+              f"{unique / store.stored_bytes:7.2f}:1 {raw / store.stored_bytes:9.2f}:1 "
+              f"{store.duplicate_tiles:>12}/{store.tiles}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+""" пакетная проверка M точек против N зон (ZoneArrays.check_points)
+и поточечная проверка в цикле Python
+
+Запуск из корня репозитория:
+    python -m benchmarks.zone_arrays
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.satellite_control_system.zone_arrays import ZoneArrays, NO_ZONE
+
+POINTS = 10000
+
+
+def make_zones(count, rng):
+    lat = rng.uniform(-85, 80, count)
+    lon = rng.uniform(-180, 175, count)
+    size = rng.uniform(0.1, 2.0, (count, 2))
+    return [RestrictedZone(la, lo, la + h, lo + w) for la, lo, (h, w) in zip(lat, lon, size)]
+
+
+def loop_first(zones, lat, lon):
+    for zone_id, zone in enumerate(zones):
+        if (zone.lat_bot_left <= lat <= zone.lat_top_right
+                and zone.lon_bot_left <= lon <= zone.lon_top_right):
+            return zone_id
+    return NO_ZONE
+
+
+def main():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-90, 90, POINTS)
+    lon = rng.uniform(-180, 180, POINTS)
+    for count in (10, 1000, 10000):
+        zones = make_zones(count, rng)
+        arrays = ZoneArrays.from_zones(zones)
+        _, first = arrays.check_points(lat, lon)
+        sample = 200
+        expected = [loop_first(zones, la, lo) for la, lo in zip(lat[:sample].tolist(), lon[:sample].tolist())]
+        assert (first[:sample] == expected).all()
+
+        batch = timeit(lambda: arrays.check_points(lat, lon), number=3) / 3
+        loop = timeit(
+            lambda: [loop_first(zones, la, lo) for la, lo in zip(lat[:sample].tolist(), lon[:sample].tolist())],
+            number=1) * POINTS / sample
+        print(
+            f"{POINTS} точек x {count:5} зон: пакетно {batch * 1e3:8.1f} мс, "
+            f"в цикле {loop * 1e3:9.1f} мс (x{loop / batch:5.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+""" загрузка каталога из 100 000 зон: чтение файла (CSV и .npy),
+проверка строк и добавление в хранилище одной операцией, применение
+изменения zones_added в индексе OpticsControl
+
+Запуск из корня репозитория:
+    python -m benchmarks.zone_catalog
+"""
+import os
+import pickle
+import tempfile
+from queue import Queue
+from time import perf_counter
+
+import numpy as np
+
+from src.system.queues_dir import QueuesDirectory
+from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME
+from src.satellite_control_system.restricted_zones import RestrictedZonesStorage
+from src.satellite_control_system.zone_catalog import load_zone_catalog, save_zone_catalog
+from src.satellite_control_system.zone_index import ZoneGridIndex
+
+ZONES = 100000
+
+
+def make_catalog(count):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-85, 80, count)
+    lon = rng.uniform(-180, 175, count)
+    size = rng.uniform(0.1, 2.0, (count, 2))
+    return np.column_stack([np.arange(count), lat, lon, lat + size[:, 0], lon + size[:, 1]])
+
+
+def timed(func):
+    start = perf_counter()
+    result = func()
+    return result, perf_counter() - start
+
+
+def main():
+    catalog = make_catalog(ZONES)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "zones.csv")
+        npy_path = os.path.join(directory, "zones.npy")
+        save_zone_catalog(csv_path, catalog)
+        save_zone_catalog(npy_path, catalog)
+        table, csv_time = timed(lambda: load_zone_catalog(csv_path))
+        _, npy_time = timed(lambda: load_zone_catalog(npy_path))
+    assert np.allclose(table, catalog)
+
+    queues_dir = QueuesDirectory()
+    queues_dir.log_level = LOG_ERROR
+    security_q = queues_dir.register(Queue(), SECURITY_MONITOR_QUEUE_NAME)
+    storage = RestrictedZonesStorage(queues_dir=queues_dir, log_level=LOG_ERROR)
+    _, insert_time = timed(lambda: storage._add_zones(table))
+    delta = security_q.get()
+    assert len(storage._zones) == ZONES and delta.operation == "zones_added"
+
+    _, index_time = timed(lambda: ZoneGridIndex(delta.parameters[2], delta.parameters[1]))
+    event_size = len(pickle.dumps(delta, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f"каталог из {ZONES} зон:")
+    print(f"  чтение CSV:                  {csv_time:7.2f} сек.")
+    print(f"  чтение .npy:                 {npy_time:7.2f} сек.")
+    print(f"  проверка и добавление:       {insert_time:7.2f} сек. (одно изменение zones_added, {event_size / 2**20:.1f} МБ)")
+    print(f"  индекс зон в OpticsControl:  {index_time:7.2f} сек.")
+    print(f"  через {ZONES} команд ADD ZONE: не менее {ZONES * 5 / 3600:.0f} ч (задержка интерпретатора 5 сек.)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+""" объем данных на одно изменение набора зон: полный список зон
+(прежний zones_update, передавался трижды) и изменение zone_added
+
+Запуск из корня репозитория:
+    python -m benchmarks.zone_deltas
+"""
+import pickle
+from timeit import timeit
+
+import numpy as np
+
+from src.system.event_types import Event
+from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.satellite_control_system.versioned_zones import VersionedZones, ZONE_ADDED
+from src.satellite_control_system.zone_index import ZoneGridIndex
+
+# сколько раз список зон передавался между компонентами на одно изменение
+FULL_LIST_HOPS = 3
+
+
+def make_zones(count, rng):
+    lat = rng.uniform(-85, 80, count)
+    lon = rng.uniform(-180, 175, count)
+    return {zone_id: RestrictedZone(la, lo, la + 1, lo + 1) for zone_id, (la, lo) in enumerate(zip(lat, lon))}
+
+
+def size(event):
+    return len(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for count in (10, 1000, 10000):
+        zones = make_zones(count, rng)
+        new_zone = RestrictedZone(1, 1, 2, 2)
+        full = Event("a", "b", "zones_update", list(zones.values()) + [new_zone])
+        delta = Event("a", "b", ZONE_ADDED, (count + 1, count, new_zone))
+
+        # обработка у получателя: перестроение индекса или изменение одной зоны
+        rebuild = timeit(lambda: ZoneGridIndex(full.parameters), number=3) / 3
+        replica = VersionedZones()
+        replica.load_snapshot(count, zones)
+        index = ZoneGridIndex(zones.values(), zones.keys())
+
+        def apply_delta():
+            replica.version = count
+            replica.apply_delta(ZONE_ADDED, delta.parameters)
+            index.add(count, new_zone)
+
+        incremental = timeit(apply_delta, number=1000) / 1000
+        print(
+            f"{count:6} зон: полный список {size(full) * FULL_LIST_HOPS:9} байт, "
+            f"изменение {size(delta):4} байт; обработка {rebuild * 1e3:8.2f} мс -> {incremental * 1e6:5.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
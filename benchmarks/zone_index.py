@@ -0,0 +1,57 @@
+""" проверка точки в запрещенных зонах: линейный просмотр списка зон
+(прежний OpticsControl._check_point_in_zones) и индекс на сетке ZoneGridIndex,
+построенный сразу по всем зонам и заполненный по одной зоне
+
+Запуск из корня репозитория:
+    python -m benchmarks.zone_index
+"""
+from timeit import timeit
+
+import numpy as np
+
+from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.satellite_control_system.zone_index import ZoneGridIndex
+
+POINTS = 2000
+
+
+def make_zones(count, rng):
+    lat = rng.uniform(-85, 80, count)
+    lon = rng.uniform(-180, 175, count)
+    size = rng.uniform(0.1, 2.0, (count, 2))
+    return [RestrictedZone(la, lo, la + h, lo + w) for la, lo, (h, w) in zip(lat, lon, size)]
+
+
+def linear_find(zones, lat, lon):
+    for zone_id, zone in enumerate(zones):
+        if (zone.lat_bot_left <= lat <= zone.lat_top_right
+                and zone.lon_bot_left <= lon <= zone.lon_top_right):
+            return zone_id
+    return None
+
+
+def main():
+    rng = np.random.default_rng(0)
+    points = list(zip(rng.uniform(-90, 90, POINTS).tolist(), rng.uniform(-180, 180, POINTS).tolist()))
+    for count in (10, 1000, 100000):
+        zones = make_zones(count, rng)
+        build = timeit(lambda: ZoneGridIndex(zones), number=1)
+        index = ZoneGridIndex(zones)
+        assert all(index.find(*p) == linear_find(zones, *p) for p in points[:200])
+
+        linear_points = points if count <= 1000 else points[:50]
+        linear = timeit(lambda: [linear_find(zones, *p) for p in linear_points], number=1) / len(linear_points)
+        indexed = timeit(lambda: [index.find(*p) for p in points], number=1) / POINTS
+        # зоны по одной (ADD ZONE): сетка перестраивается по мере роста числа зон
+        incremental = ZoneGridIndex()
+        adding = timeit(lambda: [incremental.add(i, zone) for i, zone in enumerate(zones)], number=1)
+        by_one = timeit(lambda: [incremental.find(*p) for p in points], number=1) / POINTS
+        print(
+            f"{count:7} зон: линейно {linear * 1e6:10.1f} мкс, "
+            f"индекс {indexed * 1e6:6.2f} мкс (x{linear / indexed:7.0f}), "
+            f"построение {build * 1e3:7.1f} мс, "
+            f"по одной: {by_one * 1e6:6.2f} мкс, добавление {adding * 1e3:7.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from src.satellite_simulator.satellite import Satellite
 from src.satellite_simulator.orbit_drawer import OrbitDrawer
 from src.satellite_simulator.camera import Camera
 from src.satellite_control_system.optics_control import OpticsControl
+from src.satellite_control_system.photo_planner import PhotoPlanner
 from src.satellite_control_system.restricted_zones import RestrictedZonesStorage
 from src.satellite_control_system.restricted_zones_manager import RestrictedZonesManager
 from src.satellite_control_system.central_control_system import CentralControlSystem
@@ -19,18 +20,42 @@ from src.satellite_control_system.policies import security_policies
 from src.satellite_control_system.interpreter import SatelliteCommandInterpreter
 
 from src.system.queues_dir import QueuesDirectory
+from src.system.event_codec import EventCodec
+from src.system.log import set_log_sink
+from src.system.log_collector import LogCollector
+from src.system.frame_pool import FramePool
 from src.system.system_wrapper import SystemComponentsContainer
 from src.system.config import (
     LOG_INFO,
     LOG_ERROR,
     LOG_DEBUG,
+    SECURITY_MONITOR_WORKERS,
+    EVENT_WIRE_CODEC,
+    SHARED_MEMORY_QUEUES,
+    SATELLITE_PROPAGATION_MODE,
+    LOG_COLLECTOR_ENABLED,
+    LOG_FILE,
+    FRAME_POOL_SLOTS,
+    CAMERA_FRAME_SHAPE,
 )
 
 
-def setup_system(queues_dir):
+def setup_system(queues_dir, frame_pool=None):
     """Инициализация всех компонентов системы"""
-    security_monitor = MySecurityMonitor(
-        queues_dir=queues_dir, log_level=LOG_INFO, policies=security_policies
+    log_collectors = []
+    if LOG_COLLECTOR_ENABLED:
+        log_collector = LogCollector(
+            queues_dir=queues_dir, log_level=LOG_INFO, log_file=LOG_FILE
+        )
+        # журнал всех процессов, запускаемых далее, идет через сборщик
+        set_log_sink(log_collector.sink)
+        log_collectors.append(log_collector)
+
+    security_monitors = MySecurityMonitor.create_workers(
+        queues_dir=queues_dir,
+        workers=SECURITY_MONITOR_WORKERS,
+        log_level=LOG_INFO,
+        policies=security_policies,
     )
 
     satellite = Satellite(
@@ -40,28 +65,36 @@ def setup_system(queues_dir):
         raan=0,
         queues_dir=queues_dir,
         log_level=LOG_INFO,
+        propagation_mode=SATELLITE_PROPAGATION_MODE,
     )
     drawer = OrbitDrawer(queues_dir=queues_dir, log_level=LOG_INFO)
-    camera = Camera(queues_dir=queues_dir, log_level=LOG_INFO)
+    camera = Camera(queues_dir=queues_dir, log_level=LOG_INFO, frame_pool=frame_pool)
     zones_storage = RestrictedZonesStorage(queues_dir=queues_dir, log_level=LOG_INFO)
     zones_manager = RestrictedZonesManager(queues_dir=queues_dir, log_level=LOG_INFO)
-    optics_control = OpticsControl(queues_dir=queues_dir, log_level=LOG_INFO)
+    optics_control = OpticsControl(
+        queues_dir=queues_dir, log_level=LOG_INFO, frame_pool=frame_pool
+    )
+    photo_planner = PhotoPlanner(queues_dir=queues_dir, log_level=LOG_INFO)
     central_system = CentralControlSystem(queues_dir=queues_dir, log_level=LOG_INFO)
     orbit_control = OrbitControl(queues_dir=queues_dir, log_level=LOG_INFO)
-    image_storage = ImageStorage(queues_dir=queues_dir, log_level=LOG_INFO)
+    image_storage = ImageStorage(
+        queues_dir=queues_dir, log_level=LOG_INFO, frame_pool=frame_pool
+    )
     orbit_limiter = OrbitLimiter(queues_dir=queues_dir, log_level=LOG_INFO)
     orbit_monitoring = OrbitMonitoring(queues_dir=queues_dir, log_level=LOG_INFO)
     auth_module = AuthorizationModule(queues_dir=queues_dir, log_level=LOG_INFO)
 
     system = SystemComponentsContainer(
         components=[
-            security_monitor,
+            *log_collectors,
+            *security_monitors,
             satellite,
             camera,
             drawer,
             zones_storage,
             zones_manager,
             optics_control,
+            photo_planner,
             image_storage,
             orbit_control,
             orbit_limiter,
@@ -88,8 +121,17 @@ def main():
 
     print(f"Запуск программы (пользователь: {user_type})")
 
-    queues_dir = QueuesDirectory()
-    system = setup_system(queues_dir)
+    queues_dir = QueuesDirectory(
+        codec=EventCodec(security_policies) if EVENT_WIRE_CODEC else None,
+        shm_queues=SHARED_MEMORY_QUEUES,
+    )
+    # кадры камеры передаются между процессами через разделяемую память
+    frame_pool = (
+        FramePool(slots=FRAME_POOL_SLOTS, frame_shape=CAMERA_FRAME_SHAPE)
+        if FRAME_POOL_SLOTS
+        else None
+    )
+    system = setup_system(queues_dir, frame_pool)
     system.start()
     sleep(5)
     try:
@@ -103,6 +145,9 @@ def main():
         print("Завершение работы системы...")
         system.stop()
         system.clean()
+        queues_dir.close()
+        if frame_pool is not None:
+            frame_pool.close()
         print("Система остановлена")
 
 
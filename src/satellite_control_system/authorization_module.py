@@ -37,8 +37,11 @@ class AuthorizationModule(BaseCustomProcess):
                 "request_photo",
                 "change_orbit",
                 "add_zone_request",
+                "add_zones_request",
                 "remove_zone_request",
                 "get_all_images",
+                "export_images",
+                "get_propagation_metrics",
             },
         }
         self._log_message(LOG_INFO, "Модуль авторизации создан")
@@ -46,7 +49,7 @@ class AuthorizationModule(BaseCustomProcess):
     def _check_events_q(self):
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -86,5 +89,6 @@ class AuthorizationModule(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Модуль авторизации запущен")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
@@ -16,6 +16,13 @@ from src.system.config import (
     ORBIT_MONITORING_QUEUE_NAME,
     IMAGE_STORAGE_QUEUE_NAME,
     SATELITE_QUEUE_NAME,
+    PHOTO_PLANNER_QUEUE_NAME,
+)
+from src.system.batching import put_batch
+from src.satellite_control_system.versioned_zones import (
+    VersionedZones,
+    ZONES_SNAPSHOT,
+    ZONES_RESYNC,
 )
 import time
 
@@ -35,14 +42,32 @@ class CentralControlSystem(BaseCustomProcess):
             event_source_name=CentralControlSystem.event_source_name,
             log_level=log_level,
         )
-        self._restricted_zones_cache = []
+        self._zones = VersionedZones()
+        # число полученных снимков по номерам запросов к хранилищу
+        self._image_queries = {}
         self._log_message(LOG_INFO, "Центральная система управления создана")
 
+    def _send_zones(self, destinations, operation, parameters):
+        """Отправка изменения, полного списка или запроса списка зон"""
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        put_batch(
+            q,
+            [
+                Event(
+                    source=self.event_source_name,
+                    destination=destination,
+                    operation=operation,
+                    parameters=parameters,
+                )
+                for destination in destinations
+            ],
+        )
+
     def _check_events_q(self):
         """Обработка запросов от других модулей"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -52,15 +77,16 @@ class CentralControlSystem(BaseCustomProcess):
                         self._log_message(
                             LOG_INFO, "Получен запрос на фотографирование"
                         )
-                        # Перенаправляем запрос в камеру
+                        # Перенаправляем запрос в планировщик снимков, он передаст
+                        # его в камеру, когда спутник будет вне запрещенных зон
                         q: Queue = self._queues_dir.get_queue(
                             SECURITY_MONITOR_QUEUE_NAME
                         )
                         q.put(
                             Event(
                                 source=self.event_source_name,
-                                destination=CAMERA_QUEUE_NAME,
-                                operation="request_photo",
+                                destination=PHOTO_PLANNER_QUEUE_NAME,
+                                operation="schedule_photo",
                                 parameters=None,
                             )
                         )
@@ -99,6 +125,23 @@ class CentralControlSystem(BaseCustomProcess):
                             )
                         )
 
+                    case "add_zones_request":
+                        self._log_message(
+                            LOG_INFO, "Получен запрос на добавление каталога запрещенных зон"
+                        )
+                        # Перенаправляем запрос в менеджер зон
+                        q: Queue = self._queues_dir.get_queue(
+                            SECURITY_MONITOR_QUEUE_NAME
+                        )
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+                                operation="add_zones_request",
+                                parameters=event.parameters,
+                            )
+                        )
+
                     case "change_orbit":
                         self._log_message(
                             LOG_INFO, "Получен запрос на изменение орбиты"
@@ -120,24 +163,49 @@ class CentralControlSystem(BaseCustomProcess):
                             "Запрос на изменение орбиты передан в модуль мониторинга орбиты",
                         )
 
-                    case "zones_update":
-                        self._zones_cache = event.parameters
+                    case "zone_added" | "zone_removed" | "zones_added":
+                        if not self._zones.apply_delta(event.operation, event.parameters):
+                            # Пропущены изменения - запрашиваем полный список зон
+                            self._log_message(
+                                LOG_INFO,
+                                "Пропущены изменения зон (версия %d, получена %d)",
+                                self._zones.version,
+                                event.parameters[0],
+                            )
+                            self._send_zones(
+                                (RESTRICTED_ZONES_MANAGER_QUEUE_NAME,), ZONES_RESYNC, None
+                            )
+                            continue
                         self._log_message(
                             LOG_INFO,
-                            f"Получено обновление запрещенных зон: {len(self._zones_cache)} зон",
+                            "Получено изменение запрещенных зон: %s, версия %d, %d зон",
+                            event.operation,
+                            self._zones.version,
+                            len(self._zones),
+                        )
+                        # Передаем изменение в модуль оптики и планировщик снимков
+                        self._send_zones(
+                            (OPTICS_CONTROL_QUEUE_NAME, PHOTO_PLANNER_QUEUE_NAME),
+                            event.operation,
+                            event.parameters,
                         )
 
-                        # Передаем информацию в модуль оптики
-                        q: Queue = self._queues_dir.get_queue(
-                            SECURITY_MONITOR_QUEUE_NAME
+                    case "zones_snapshot":
+                        self._zones.load_snapshot(*event.parameters)
+                        self._log_message(
+                            LOG_INFO,
+                            f"Получен полный список запрещенных зон: {len(self._zones)} зон",
                         )
-                        q.put(
-                            Event(
-                                source=self.event_source_name,
-                                destination=OPTICS_CONTROL_QUEUE_NAME,
-                                operation="zones_update",
-                                parameters=self._zones_cache,
-                            )
+                        self._send_zones(
+                            (OPTICS_CONTROL_QUEUE_NAME, PHOTO_PLANNER_QUEUE_NAME),
+                            ZONES_SNAPSHOT,
+                            self._zones.snapshot(),
+                        )
+
+                    case "zones_resync":
+                        # Получатель пропустил изменения - отправляем ему полный список
+                        self._send_zones(
+                            (event.source,), ZONES_SNAPSHOT, self._zones.snapshot()
                         )
 
                     # Сообщения от камеры - проверяем координаты и передаем в оптику
@@ -220,7 +288,11 @@ class CentralControlSystem(BaseCustomProcess):
 
                     case "photo_processed":
                         # Изображение обработано оптическим модулем
-                        lat, lon, is_restricted = event.parameters
+                        lat, lon, is_restricted = event.parameters[:3]
+                        # описатель кадра в пуле кадров (None - снимок без кадра)
+                        frame = (
+                            event.parameters[3] if len(event.parameters) > 3 else None
+                        )
 
                         # Если изображение не в запрещенной зоне, сохраняем его
                         if not is_restricted:
@@ -237,7 +309,7 @@ class CentralControlSystem(BaseCustomProcess):
                                     source=self.event_source_name,
                                     destination=IMAGE_STORAGE_QUEUE_NAME,
                                     operation="save_image",
-                                    parameters=(lat, lon, time.time()),
+                                    parameters=(lat, lon, time.time(), frame),
                                 )
                             )
                         else:
@@ -256,7 +328,9 @@ class CentralControlSystem(BaseCustomProcess):
 
                     case "get_all_images":
                         self._log_message(
-                            LOG_INFO, "Получен запрос на получение всех изображений"
+                            LOG_INFO,
+                            "Получен запрос на получение изображений: %s",
+                            event.parameters,
                         )
                         q: Queue = self._queues_dir.get_queue(
                             SECURITY_MONITOR_QUEUE_NAME
@@ -266,14 +340,90 @@ class CentralControlSystem(BaseCustomProcess):
                                 source=self.event_source_name,
                                 destination=IMAGE_STORAGE_QUEUE_NAME,
                                 operation="get_all_images",
+                                parameters=event.parameters,
+                            )
+                        )
+
+                    case "export_images":
+                        self._log_message(
+                            LOG_INFO,
+                            "Получен запрос на выгрузку изображений в %s",
+                            event.parameters,
+                        )
+                        q: Queue = self._queues_dir.get_queue(
+                            SECURITY_MONITOR_QUEUE_NAME
+                        )
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=IMAGE_STORAGE_QUEUE_NAME,
+                                operation="export_images",
+                                parameters=event.parameters,
+                            )
+                        )
+
+                    case "images_exported":
+                        path, count, error = event.parameters
+                        if error is not None:
+                            self._log_message(
+                                LOG_ERROR, "Выгрузка изображений в %s не выполнена: %s", path, error
+                            )
+                        else:
+                            self._log_message(
+                                LOG_INFO, "Выгружено %d изображений в %s", count, path
+                            )
+
+                    case "get_propagation_metrics":
+                        self._log_message(
+                            LOG_INFO, "Получен запрос метрик симуляции спутника"
+                        )
+                        q: Queue = self._queues_dir.get_queue(
+                            SECURITY_MONITOR_QUEUE_NAME
+                        )
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=SATELITE_QUEUE_NAME,
+                                operation="get_propagation_metrics",
                                 parameters=None,
                             )
                         )
 
+                    case "propagation_metrics":
+                        # Ответ спутника: словарь метрик планировщика симуляции
+                        self._log_message(
+                            LOG_INFO,
+                            "Метрики симуляции спутника: %s",
+                            ", ".join(f"{name}={value}" for name, value in event.parameters.items()),
+                        )
+
+                    case "images_page":
+                        # Очередная страница ответа хранилища на запрос снимков
+                        query_id, total, images, done, next_cursor = event.parameters
+                        received = self._image_queries.get(query_id, 0) + len(images)
+                        self._log_message(
+                            LOG_DEBUG,
+                            lambda: f"Запрос снимков #{query_id}: {received}/{total}, {images}",
+                        )
+                        if not done:
+                            self._image_queries[query_id] = received
+                            continue
+                        self._image_queries.pop(query_id, None)
+                        self._log_message(
+                            LOG_INFO,
+                            "Запрос снимков #%d выполнен: получено %d снимков%s",
+                            query_id,
+                            received,
+                            "" if next_cursor is None
+                            else f", продолжение - CURSOR {next_cursor}",
+                        )
+
                     case _:
                         self._log_message(
                             LOG_DEBUG,
-                            f"Получено событие: {event.operation} от {event.source}",
+                            "Получено событие: %s от %s",
+                            event.operation,
+                            event.source,
                         )
 
             except Empty:
@@ -284,5 +434,6 @@ class CentralControlSystem(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Центральная система управления запущена")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
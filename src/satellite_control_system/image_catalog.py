@@ -0,0 +1,203 @@
+""" модуль постоянного каталога снимков
+
+Каталог - файл, отображенный в память (mmap), в который записи снимков
+только добавляются. Записи фиксированного размера (lat, lon, timestamp,
+код источника) идут за заголовком с числом записей и таблицей имен
+источников. Запись добавляется за постоянное время (файл увеличивается
+вдвое при заполнении), а другие процессы могут читать каталог напрямую,
+открыв файл только для чтения, без обращения к хранилищу через очереди.
+
+Писатель у каталога один: сначала записывается запись, затем увеличивается
+счетчик в заголовке, поэтому читатель видит только полностью записанные записи.
+"""
+import mmap
+import os
+from pathlib import Path
+from struct import Struct
+from typing import Optional
+
+import numpy as np
+
+_MAGIC = b"IMGCAT01"
+# заголовок: признак формата, число записей, вместимость, число источников, размер записи
+_HEADER = Struct("<8sQQII")
+_COUNT_OFFSET = 8
+_SOURCE_NAME_SIZE = 32
+_SOURCES_OFFSET = 64
+_MAX_SOURCES = 126
+HEADER_SIZE = _SOURCES_OFFSET + _MAX_SOURCES * _SOURCE_NAME_SIZE  # 4096 байт
+
+IMAGE_RECORD = np.dtype([
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("timestamp", "<f8"),
+    ("source", "<u2"),
+    ("_reserved", "V6"),
+])
+_INITIAL_CAPACITY = 1024
+
+
+class ImageCatalog:
+    """ каталог снимков в файле, отображенном в память """
+
+    def __init__(self, path, readonly: bool = False):
+        """
+        Args:
+            path: путь к файлу каталога (создается, если его нет)
+            readonly (bool): открыть для чтения (из другого процесса)
+        """
+        self._path = Path(path)
+        self._readonly = readonly
+        if not readonly:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._path.exists() or self._path.stat().st_size == 0:
+                self._create()
+        self._file = open(self._path, "rb" if readonly else "r+b")
+        self._mmap: Optional[mmap.mmap] = None
+        self._records: Optional[np.ndarray] = None
+        self._map()
+        self._sources = self._read_sources()
+        self._source_codes = {name: code for code, name in enumerate(self._sources)}
+
+    def _create(self):
+        with open(self._path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, 0, _INITIAL_CAPACITY, 0, IMAGE_RECORD.itemsize))
+            file.truncate(HEADER_SIZE + _INITIAL_CAPACITY * IMAGE_RECORD.itemsize)
+
+    def _map(self):
+        """ (пере)отображение файла в память после создания или увеличения.
+        Прежнее отображение не закрывается явно: массивы, выданные records(),
+        остаются рабочими, отображение освобождается вместе с ними """
+        self._mmap = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE)
+        magic, _, capacity, _, record_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or record_size != IMAGE_RECORD.itemsize:
+            raise ValueError(f"{self._path}: неизвестный формат каталога снимков")
+        # файл может быть больше вместимости из заголовка, если писатель
+        # увеличил его, но еще не обновил заголовок
+        capacity = min(capacity, (len(self._mmap) - HEADER_SIZE) // IMAGE_RECORD.itemsize)
+        self._capacity = capacity
+        self._records = np.frombuffer(
+            self._mmap, dtype=IMAGE_RECORD, count=capacity, offset=HEADER_SIZE)
+        self._counter = np.frombuffer(self._mmap, dtype="<u8", count=1, offset=_COUNT_OFFSET)
+
+    def _read_sources(self):
+        _, _, _, sources_count, _ = _HEADER.unpack_from(self._mmap, 0)
+        return [
+            bytes(self._mmap[offset:offset + _SOURCE_NAME_SIZE]).rstrip(b"\0").decode()
+            for offset in range(_SOURCES_OFFSET, _SOURCES_OFFSET + sources_count * _SOURCE_NAME_SIZE,
+                                _SOURCE_NAME_SIZE)
+        ]
+
+    def __len__(self):
+        return int(self._counter[0])
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _source_code(self, source: str) -> int:
+        code = self._source_codes.get(source)
+        if code is not None:
+            return code
+        raw = source.encode()
+        if len(raw) > _SOURCE_NAME_SIZE or len(self._sources) >= _MAX_SOURCES:
+            raise ValueError(f"источник {source!r} не помещается в таблицу источников каталога")
+        code = len(self._sources)
+        offset = _SOURCES_OFFSET + code * _SOURCE_NAME_SIZE
+        self._mmap[offset:offset + len(raw)] = raw
+        self._sources.append(source)
+        self._source_codes[source] = code
+        self._write_header(sources_count=len(self._sources))
+        return code
+
+    def _write_header(self, capacity: Optional[int] = None, sources_count: Optional[int] = None):
+        _, count, old_capacity, old_sources, record_size = _HEADER.unpack_from(self._mmap, 0)
+        _HEADER.pack_into(
+            self._mmap, 0, _MAGIC, count,
+            old_capacity if capacity is None else capacity,
+            old_sources if sources_count is None else sources_count,
+            record_size)
+
+    def _grow(self):
+        """ увеличение файла вдвое: стоимость добавления остается постоянной в среднем """
+        capacity = self._capacity * 2
+        os.truncate(self._path, HEADER_SIZE + capacity * IMAGE_RECORD.itemsize)
+        self._write_header(capacity=capacity)
+        self._map()
+
+    def append(self, lat: float, lon: float, timestamp: float, source: str) -> int:
+        """append добавляет запись о снимке
+
+        Args:
+            lat (float): широта
+            lon (float): долгота
+            timestamp (float): время снимка
+            source (str): отправитель снимка
+
+        Returns:
+            int: номер записи (идентификатор снимка)
+        """
+        if self._readonly:
+            raise PermissionError("каталог снимков открыт только для чтения")
+        index = len(self)
+        if index >= self._capacity:
+            self._grow()
+        record = self._records[index]
+        record["lat"] = lat
+        record["lon"] = lon
+        record["timestamp"] = timestamp
+        record["source"] = self._source_code(source)
+        # запись становится видимой читателям после увеличения счетчика
+        self._counter[0] = index + 1
+        return index
+
+    def refresh(self):
+        """refresh обновляет отображение у читателя, если писатель увеличил файл"""
+        if len(self) > self._capacity or os.path.getsize(self._path) != len(self._mmap):
+            self._map()
+        if len(self._sources) != _HEADER.unpack_from(self._mmap, 0)[3]:
+            self._sources = self._read_sources()
+            self._source_codes = {name: code for code, name in enumerate(self._sources)}
+
+    def records(self) -> np.ndarray:
+        """records записи каталога (представление файла, без копирования)
+
+        Returns:
+            np.ndarray: структурированный массив с полями lat, lon, timestamp, source
+        """
+        if self._readonly:
+            self.refresh()
+        return self._records[:min(len(self), self._capacity)]
+
+    def find_source(self, source: str) -> Optional[int]:
+        """find_source код источника в поле source или None, если снимков от него нет"""
+        if source not in self._source_codes and self._readonly:
+            self.refresh()
+        return self._source_codes.get(source)
+
+    def source_name(self, code: int) -> str:
+        """source_name имя источника по коду из поля source"""
+        if code >= len(self._sources):
+            self._sources = self._read_sources()
+        return self._sources[code]
+
+    def flush(self):
+        """flush сбрасывает изменения на диск"""
+        if not self._readonly:
+            self._mmap.flush()
+
+    def close(self):
+        if self._mmap is None:
+            return
+        self.flush()
+        mapping, self._mmap = self._mmap, None
+        self._records = None
+        self._counter = None
+        try:
+            mapping.close()
+        except BufferError:
+            # есть массивы, выданные records(): отображение будет
+            # освобождено, когда они перестанут использоваться
+            pass
+        self._file.close()
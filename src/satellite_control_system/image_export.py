@@ -0,0 +1,122 @@
+""" модуль выгрузки каталога снимков для анализа
+
+Каталог выгружается по столбцам: lat, lon, timestamp (float64), source
+(uint16, код отправителя) и sources (имена отправителей по кодам).
+Форматы:
+    - каталог (путь без расширения .npz): отдельный файл .npy на столбец,
+      при загрузке файлы отображаются в память и не читаются целиком;
+    - один файл .npz: удобен для передачи, загружается в память.
+
+Выгрузка выполняется во временный каталог (файл) рядом с целевым и
+переименовывается по завершении, поэтому неполная выгрузка не видна.
+Существующая цель заменяется, только если это прежняя выгрузка.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from src.satellite_control_system.image_catalog import ImageCatalog
+
+EXPORT_COLUMNS = ("lat", "lon", "timestamp", "source")
+# файлы выгрузки: столбцы и имена отправителей
+_FILES = EXPORT_COLUMNS + ("sources",)
+
+
+def _columns(catalog: ImageCatalog) -> Dict[str, np.ndarray]:
+    records = catalog.records()
+    columns = {name: records[name] for name in EXPORT_COLUMNS}
+    codes = range(int(records["source"].max()) + 1 if len(records) else 0)
+    columns["sources"] = np.array([catalog.source_name(code) for code in codes], dtype=str)
+    return columns
+
+
+def _check_target(path: Path, protected):
+    """ проверка цели выгрузки до записи каких-либо файлов """
+    target = path.resolve()
+    for other in protected:
+        other = Path(other).resolve()
+        if target == other or other in target.parents or target in other.parents:
+            raise ValueError(f"путь выгрузки {path} пересекается с данными хранилища {other}")
+    if not path.exists() and not path.is_symlink():
+        return
+    if path.suffix == ".npz":
+        if not path.is_file():
+            raise ValueError(f"{path} существует и не является файлом")
+        return
+    # заменяется только прежняя выгрузка: каталог из файлов столбцов
+    if path.is_symlink() or not path.is_dir():
+        raise ValueError(f"{path} существует и не является каталогом выгрузки")
+    expected = {f"{name}.npy" for name in _FILES}
+    for entry in path.iterdir():
+        if entry.name not in expected or entry.is_symlink() or not entry.is_file():
+            raise ValueError(f"{path} не является каталогом выгрузки: лишний файл {entry.name}")
+
+
+def export_images(catalog: ImageCatalog, path, protected=()) -> int:
+    """export_images выгружает все записи каталога снимков по столбцам
+
+    Существующая цель заменяется, только если это файл .npz или каталог
+    прежней выгрузки (только файлы столбцов), иначе - ValueError
+
+    Args:
+        catalog (ImageCatalog): каталог снимков
+        path: каталог для файлов .npy или файл .npz
+        protected: пути, которые выгрузка не должна затрагивать (файлы и
+            каталоги хранилища)
+
+    Returns:
+        int: число выгруженных снимков
+    """
+    path = Path(path)
+    _check_target(path, protected)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = _columns(catalog)
+    count = len(columns["lat"])
+    if path.suffix == ".npz":
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(file, **columns)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return count
+
+    temporary = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+    try:
+        for name, column in columns.items():
+            np.save(temporary / f"{name}.npy", np.ascontiguousarray(column), allow_pickle=False)
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(temporary, path)
+    except BaseException:
+        shutil.rmtree(temporary, ignore_errors=True)
+        raise
+    return count
+
+
+def load_images(path, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """load_images загружает выгрузку каталога снимков
+
+    Args:
+        path: каталог с файлами .npy или файл .npz
+        mmap (bool): отображать файлы .npy в память (только для каталога)
+
+    Returns:
+        Dict[str, np.ndarray]: столбцы lat, lon, timestamp, source и имена
+            отправителей sources (индекс - код из столбца source)
+    """
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as archive:
+            return {name: archive[name] for name in archive.files}
+    mmap_mode = "r" if mmap else None
+    return {
+        name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        for name in _FILES
+    }
@@ -0,0 +1,157 @@
+""" модуль индексов и запросов к каталогу снимков
+
+Запрос ImageQuery отбирает снимки по прямоугольнику широта/долгота,
+интервалу времени и источнику. Для отбора кандидатов используются два
+индекса по записям каталога: номера снимков, упорядоченные по времени,
+и сетка 1x1 градус (номера снимков, сгруппированные по ячейкам).
+Из двух индексов выбирается тот, что дает меньше кандидатов, остальные
+условия проверяются сразу для всех кандидатов.
+
+Каталог только пополняется, поэтому индексы строятся по первым записям,
+а новые записи (хвост) проверяются полным просмотром, пока их немного;
+когда хвост вырастает, индексы перестраиваются.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.satellite_control_system.image_catalog import ImageCatalog
+
+_CELL_DEG = 1.0
+_ROWS = int(180 / _CELL_DEG)
+_COLS = int(360 / _CELL_DEG)
+# хвост без индекса: не более 1/8 проиндексированных записей (но не меньше _MIN_TAIL)
+_MIN_TAIL = 4096
+_TAIL_FRACTION = 8
+# записи без подходящего индекса просматриваются частями, чтобы при
+# ограничении limit остановиться, не просматривая весь каталог
+_SCAN_CHUNK = 65536
+
+
+@dataclass(slots=True)
+class ImageQuery:
+    """ условия отбора снимков (None - без ограничения) """
+    bbox: Optional[Tuple[float, float, float, float]] = None  # lat1, lon1, lat2, lon2
+    time_range: Optional[Tuple[float, float]] = None  # начало, конец (включительно)
+    source: Optional[str] = None  # отправитель снимка
+    limit: Optional[int] = None  # максимальное число снимков в ответе
+    cursor: Optional[int] = None  # только снимки с номером больше cursor
+
+
+def _cells(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    rows = np.clip(np.floor((lat + 90.0) / _CELL_DEG), 0, _ROWS - 1).astype(np.int64)
+    cols = np.clip(np.floor((lon + 180.0) / _CELL_DEG), 0, _COLS - 1).astype(np.int64)
+    return rows * _COLS + cols
+
+
+class ImageIndex:
+    """ индексы по времени и по сетке для каталога снимков """
+
+    def __init__(self, catalog: ImageCatalog):
+        self._catalog = catalog
+        self._indexed = 0  # число записей, покрытых индексами
+        self._time_order = np.empty(0, dtype=np.int64)
+        self._sorted_times = np.empty(0)
+        self._cell_order = np.empty(0, dtype=np.int64)
+        self._cell_starts = np.zeros(_ROWS * _COLS + 1, dtype=np.int64)
+
+    def _rebuild(self, records: np.ndarray):
+        count = len(records)
+        self._time_order = np.argsort(records["timestamp"], kind="stable")
+        self._sorted_times = records["timestamp"][self._time_order]
+        cells = _cells(records["lat"], records["lon"])
+        # устойчивая сортировка: внутри ячейки номера снимков идут по возрастанию
+        self._cell_order = np.argsort(cells, kind="stable")
+        self._cell_starts[1:] = np.cumsum(np.bincount(cells, minlength=_ROWS * _COLS))
+        self._indexed = count
+
+    def _update(self, records: np.ndarray):
+        tail = len(records) - self._indexed
+        if tail > max(_MIN_TAIL, self._indexed // _TAIL_FRACTION):
+            self._rebuild(records)
+
+    def _bbox_candidates(self, bbox) -> np.ndarray:
+        lat1, lon1, lat2, lon2 = bbox
+        row1 = min(max(math.floor((lat1 + 90.0) / _CELL_DEG), 0), _ROWS - 1)
+        row2 = min(max(math.floor((lat2 + 90.0) / _CELL_DEG), 0), _ROWS - 1)
+        col1 = min(max(math.floor((lon1 + 180.0) / _CELL_DEG), 0), _COLS - 1)
+        col2 = min(max(math.floor((lon2 + 180.0) / _CELL_DEG), 0), _COLS - 1)
+        starts = self._cell_starts
+        # ячейки одной строки сетки идут подряд: одна непрерывная часть на строку
+        parts = [
+            self._cell_order[starts[row * _COLS + col1]:starts[row * _COLS + col2 + 1]]
+            for row in range(row1, row2 + 1)
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _time_candidates(self, time_range) -> np.ndarray:
+        begin, end = time_range
+        first = np.searchsorted(self._sorted_times, begin, side="left")
+        last = np.searchsorted(self._sorted_times, end, side="right")
+        return self._time_order[first:last]
+
+    def select(self, query: ImageQuery) -> np.ndarray:
+        """select номера снимков, удовлетворяющих запросу, по возрастанию
+
+        Args:
+            query (ImageQuery): условия отбора
+
+        Returns:
+            np.ndarray: номера снимков (int64), не более query.limit
+        """
+        records = self._catalog.records()
+        self._update(records)
+        after = -1 if query.cursor is None else query.cursor
+
+        if query.source is not None and self._catalog.find_source(query.source) is None:
+            return np.empty(0, dtype=np.int64)
+
+        candidates = None
+        if query.bbox is not None:
+            candidates = self._bbox_candidates(query.bbox)
+        if query.time_range is not None:
+            by_time = self._time_candidates(query.time_range)
+            if candidates is None or len(by_time) < len(candidates):
+                candidates = by_time
+        if candidates is None:
+            # подходящего индекса нет: просмотр записей подряд после cursor
+            return self._scan(records, query, after + 1)
+
+        candidates = np.sort(candidates[candidates > after])
+        tail = np.arange(max(self._indexed, after + 1), len(records), dtype=np.int64)
+        candidates = np.concatenate((candidates, tail))
+        result = candidates[self._matches(records[candidates], query)]
+        if query.limit is not None:
+            result = result[:query.limit]
+        return result
+
+    def _scan(self, records: np.ndarray, query: ImageQuery, first: int) -> np.ndarray:
+        limit = len(records) if query.limit is None else query.limit
+        if query.source is None:
+            return np.arange(first, min(len(records), first + limit), dtype=np.int64)
+        found = []
+        count = 0
+        for start in range(first, len(records), _SCAN_CHUNK):
+            if count >= limit:
+                break
+            chunk = records[start:start + _SCAN_CHUNK]
+            ids = np.flatnonzero(self._matches(chunk, query))[:limit - count] + start
+            found.append(ids)
+            count += len(ids)
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _matches(self, selected: np.ndarray, query: ImageQuery) -> np.ndarray:
+        """ маска записей, удовлетворяющих всем условиям запроса """
+        mask = np.ones(len(selected), dtype=bool)
+        if query.bbox is not None:
+            lat1, lon1, lat2, lon2 = query.bbox
+            mask &= (selected["lat"] >= lat1) & (selected["lat"] <= lat2)
+            mask &= (selected["lon"] >= lon1) & (selected["lon"] <= lon2)
+        if query.time_range is not None:
+            begin, end = query.time_range
+            mask &= (selected["timestamp"] >= begin) & (selected["timestamp"] <= end)
+        if query.source is not None:
+            mask &= selected["source"] == self._catalog.find_source(query.source)
+        return mask
@@ -1,3 +1,5 @@
+from collections import deque
+from concurrent.futures import Future
 from multiprocessing import Queue
 from queue import Empty
 import time
@@ -12,20 +14,57 @@ from src.system.config import (
     IMAGE_STORAGE_QUEUE_NAME,
     CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
     SECURITY_MONITOR_QUEUE_NAME,
+    IMAGE_CATALOG_FILE,
+    IMAGES_PAGE_SIZE,
+    IMAGE_FRAMES_DIR,
+    IMAGE_TILE_SIZE,
+    IMAGE_TILE_CODEC,
+    IMAGE_TILE_LEVEL,
+    IMAGE_TILE_WORKERS,
 )
+from src.satellite_control_system.image_catalog import ImageCatalog
+from src.satellite_control_system.image_index import ImageIndex, ImageQuery
+from src.satellite_control_system.image_export import export_images
+from src.satellite_control_system.tile_store import TileStore
 
 
 class ImageStorage(BaseCustomProcess):
     """
     Хранилище изображений - сохраняет и предоставляет доступ к снимкам
     'Изображения' представляют собой кортеж в виде (lat, lon, timestamp)
+
+    Снимки записываются в постоянный каталог ImageCatalog (файл, отображенный
+    в память), который сохраняется между запусками и может читаться другими
+    процессами напрямую
+
+    Запрос get_all_images (параметры - ImageQuery или None) выполняется по
+    индексам ImageIndex, а результат передается в ЦСУ страницами images_page
+    по IMAGES_PAGE_SIZE снимков: за один проход цикла хранилище отправляет
+    по одной странице каждого запроса, поэтому сохранение снимков не
+    задерживается до конца выдачи
+
+    Запрос export_images (параметры - путь) выгружает каталог по столбцам
+    в файлы .npy/.npz для анализа (см. image_export); ответ images_exported -
+    путь, число снимков и текст ошибки (None при успехе)
+
+    Кадр снимка (описатель в пуле кадров FramePool) записывается в фоне
+    сжатыми фрагментами без повторов (TileStore); ячейка пула
+    освобождается, как только фрагменты кадра скопированы
     """
 
     log_prefix = "[IMG_STOR]"
     event_source_name = IMAGE_STORAGE_QUEUE_NAME
     events_q_name = event_source_name
 
-    def __init__(self, queues_dir, log_level=DEFAULT_LOG_LEVEL):
+    def __init__(
+        self,
+        queues_dir,
+        log_level=DEFAULT_LOG_LEVEL,
+        catalog_path=IMAGE_CATALOG_FILE,
+        page_size=IMAGES_PAGE_SIZE,
+        frame_pool=None,
+        frames_dir=IMAGE_FRAMES_DIR,
+    ):
         super().__init__(
             log_prefix=ImageStorage.log_prefix,
             queues_dir=queues_dir,
@@ -33,15 +72,25 @@ class ImageStorage(BaseCustomProcess):
             event_source_name=ImageStorage.event_source_name,
             log_level=log_level,
         )
-        # Хранилище изображений
-        self._images = {}
+        # Каталог снимков, открывается в процессе хранилища (run)
+        self._catalog_path = catalog_path
+        self._catalog = None
+        self._index = None
+        self._page_size = page_size
+        # выполняемые запросы: [номер запроса, номера снимков, отправлено, курсор продолжения]
+        self._queries = deque()
+        self._last_query_id = 0
+        self._frame_pool = frame_pool
+        self._frames_dir = frames_dir
+        # хранилище кадров с потоками сжатия, создается в процессе хранилища (run)
+        self._tiles = None
         self._log_message(LOG_INFO, "Хранилище изображений создано")
 
     def _check_events_q(self):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -57,16 +106,17 @@ class ImageStorage(BaseCustomProcess):
                                 else time.time()
                             )
 
-                            # Сохраняем изображение
-                            image_key = (lat, lon)
-                            self._images[image_key] = {
-                                "timestamp": timestamp,
-                                "source": event.source,
-                            }
+                            # Сохраняем изображение (снимки с одинаковыми
+                            # координатами хранятся отдельными записями)
+                            image_id = self._catalog.append(
+                                lat, lon, timestamp, event.source
+                            )
+                            if len(event.parameters) > 3 and event.parameters[3] is not None:
+                                self._save_frame(image_id, event.parameters[3])
 
                             self._log_message(
                                 LOG_INFO,
-                                f"Сохранено изображение с координатами ({lat:.3f},{lon:.3f}), timestamp={timestamp}",
+                                f"Сохранено изображение #{image_id} с координатами ({lat:.3f},{lon:.3f}), timestamp={timestamp}",
                             )
 
                             # Уведомляем ЦСУ о сохранении снимка
@@ -88,18 +138,41 @@ class ImageStorage(BaseCustomProcess):
                             )
 
                     case "get_all_images":
-                        # Запрос на получение всех сохраненных изображений
-                        images_list = []
-                        for (lat, lon), data in self._images.items():
-                            images_list.append((lat, lon, data["timestamp"]))
-
-                        self._log_message(
-                            LOG_INFO,
-                            f"Запрошен список всех изображений ({len(images_list)} шт.)",
+                        # Запрос на получение сохраненных изображений
+                        query = event.parameters or ImageQuery()
+                        self._start_query(query)
+
+                    case "export_images":
+                        # Выгрузка каталога по столбцам для анализа
+                        # (файлы хранилища выгрузка не затрагивает, ошибка
+                        # передается в ЦСУ вместо числа снимков)
+                        path = event.parameters
+                        count, error = None, None
+                        try:
+                            count = export_images(
+                                self._catalog,
+                                path,
+                                protected=(self._catalog_path, self._frames_dir),
+                            )
+                        except (OSError, ValueError) as e:
+                            error = str(e)
+                            self._log_message(
+                                LOG_ERROR, "Ошибка выгрузки снимков в %s: %s", path, e
+                            )
+                        else:
+                            self._log_message(
+                                LOG_INFO, "Выгружено %d снимков в %s", count, path
+                            )
+                        q: Queue = self._queues_dir.get_queue(
+                            SECURITY_MONITOR_QUEUE_NAME
                         )
-                        self._log_message(
-                            LOG_INFO,
-                            f"Полученные изображения: {images_list}",
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                                operation="images_exported",
+                                parameters=(path, count, error),
+                            )
                         )
 
             except Empty:
@@ -107,8 +180,121 @@ class ImageStorage(BaseCustomProcess):
             except Exception as e:
                 self._log_message(LOG_ERROR, f"Ошибка при обработке запроса: {e}")
 
+    def _save_frame(self, image_id: int, handle):
+        """Передача кадра снимка из пула кадров на сжатие и запись в фоне"""
+        if self._frame_pool is None:
+            self._log_message(LOG_ERROR, "Получен кадр снимка #%d, но пул кадров не задан", image_id)
+            return
+        frame = self._frame_pool.frame(handle)
+        if frame is None:
+            self._log_message(LOG_ERROR, "Кадр снимка #%d уже недоступен в пуле кадров", image_id)
+            return
+
+        def release() -> bool:
+            # вызывается потоком сжатия, когда фрагменты кадра скопированы;
+            # False - ячейка выдана повторно (истек срок аренды)
+            valid = self._frame_pool.is_valid(handle)
+            self._frame_pool.release(handle)
+            return valid
+
+        future = self._tiles.save(image_id, frame, release)
+        future.add_done_callback(lambda done: self._frame_saved(image_id, done))
+
+    def _frame_saved(self, image_id: int, future: Future):
+        """Результат записи кадра (вызывается в потоке сжатия)"""
+        error = future.exception()
+        if error is not None:
+            self._log_message(LOG_ERROR, "Кадр снимка #%d не сохранен: %s", image_id, error)
+            return
+        self._log_message(
+            LOG_DEBUG,
+            lambda: f"Кадр снимка #{image_id} сохранен, сжатие кадров "
+            f"{self._tiles.raw_bytes / max(self._tiles.stored_bytes, 1):.1f}:1, "
+            f"повторов фрагментов {self._tiles.duplicate_tiles}/{self._tiles.tiles}",
+        )
+
+    def _start_query(self, query: ImageQuery):
+        """Отбор снимков по запросу и постановка выдачи в очередь"""
+        limit = query.limit
+        if limit is not None:
+            # лишний снимок показывает, что выдача обрезана по limit
+            query = ImageQuery(query.bbox, query.time_range, query.source, limit + 1, query.cursor)
+        image_ids = self._index.select(query)
+        next_cursor = None
+        if limit is not None and len(image_ids) > limit:
+            image_ids = image_ids[:limit]
+            next_cursor = int(image_ids[-1]) if limit else query.cursor
+        self._last_query_id += 1
+        self._queries.append([self._last_query_id, image_ids, 0, next_cursor])
+        self._log_message(
+            LOG_INFO,
+            "Запрос снимков #%d: найдено %d из %d",
+            self._last_query_id,
+            len(image_ids),
+            len(self._catalog),
+        )
+
+    def _send_image_pages(self):
+        """Отправка следующей страницы каждого выполняемого запроса"""
+        records = self._catalog.records()
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        for _ in range(len(self._queries)):
+            query_state = self._queries.popleft()
+            query_id, image_ids, sent, next_cursor = query_state
+            page_ids = image_ids[sent:sent + self._page_size]
+            page = records[page_ids]
+            images = list(
+                zip(
+                    page_ids.tolist(),
+                    page["lat"].tolist(),
+                    page["lon"].tolist(),
+                    page["timestamp"].tolist(),
+                    [self._catalog.source_name(code) for code in page["source"].tolist()],
+                )
+            )
+            sent += len(page_ids)
+            done = sent >= len(image_ids)
+            q.put(
+                Event(
+                    source=self.event_source_name,
+                    destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                    operation="images_page",
+                    parameters=(query_id, len(image_ids), images, done, next_cursor),
+                )
+            )
+            if not done:
+                query_state[2] = sent
+                self._queries.append(query_state)
+
+    def _open_catalog(self):
+        self._catalog = ImageCatalog(self._catalog_path)
+        self._index = ImageIndex(self._catalog)
+        self._tiles = TileStore(
+            self._frames_dir,
+            tile_size=IMAGE_TILE_SIZE,
+            codec=IMAGE_TILE_CODEC,
+            level=IMAGE_TILE_LEVEL,
+            workers=IMAGE_TILE_WORKERS,
+        )
+        self._log_message(
+            LOG_INFO,
+            "Открыт каталог снимков %s: %d снимков",
+            self._catalog_path,
+            len(self._catalog),
+        )
+
     def run(self):
+        self._open_catalog()
         self._log_message(LOG_INFO, "Хранилище изображений запущено")
-        while not self._quit:
-            self._check_events_q()
-            self._check_control_q()
+        try:
+            while not self._quit:
+                # пока идет выдача снимков, события проверяются без ожидания
+                self._wait_for_events(0 if self._queries else None)
+                self._check_events_q()
+                self._check_control_q()
+                if self._queries:
+                    self._send_image_pages()
+        finally:
+            # дожидаемся записи кадров, поставленных в очередь сжатия
+            self._tiles.close()
+            self._catalog.close()
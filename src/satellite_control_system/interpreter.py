@@ -3,6 +3,8 @@ from src.system.config import (
     AUTHORIZATION_MODULE_QUEUE_NAME,
 )
 from src.system.event_types import Event
+from src.satellite_control_system.zone_catalog import load_zone_catalog
+from src.satellite_control_system.image_index import ImageQuery
 from time import sleep
 from multiprocessing import Queue
 
@@ -44,6 +46,33 @@ class SatelliteCommandInterpreter:
         elif parts[0] == "MAKE" and len(parts) >= 2 and parts[1] == "PHOTO":
             return "request_photo", None
 
+        # Обработка команды GET IMAGES [BBOX ...] [TIME ...] [SOURCE ...] [LIMIT ...] [CURSOR ...]
+        elif parts[0] == "GET" and len(parts) >= 2 and parts[1] == "IMAGES":
+            try:
+                return "get_all_images", self._parse_image_query(parts[2:])
+            except (ValueError, IndexError):
+                print(
+                    f"Ошибка: неверный формат параметров для команды GET IMAGES: {line}"
+                )
+                return None
+
+        # Обработка команды EXPORT IMAGES <путь> (каталог для .npy или файл .npz)
+        elif parts[0] == "EXPORT" and len(parts) >= 3 and parts[1] == "IMAGES":
+            return "export_images", line.split(None, 2)[2]
+
+        # Обработка команды GET METRICS (метрики симуляции спутника)
+        elif parts[0] == "GET" and len(parts) >= 2 and parts[1] == "METRICS":
+            return "get_propagation_metrics", None
+
+        # Обработка команды ADD ZONES FROM <файл> (каталог зон .csv или .npy)
+        elif parts[0] == "ADD" and len(parts) >= 4 and parts[1:3] == ["ZONES", "FROM"]:
+            filename = line.split(None, 3)[3]
+            try:
+                return "add_zones_request", load_zone_catalog(filename)
+            except (OSError, ValueError) as e:
+                print(f"Ошибка: не удалось загрузить каталог зон {filename}: {e}")
+                return None
+
         # Обработка команды ADD ZONE
         elif parts[0] == "ADD" and parts[1] == "ZONE" and len(parts) >= 7:
             try:
@@ -74,6 +103,35 @@ class SatelliteCommandInterpreter:
             print(f"Ошибка: неизвестная команда: {line}")
             return None
 
+    @staticmethod
+    def _parse_image_query(args):
+        """
+        Разбор условий отбора снимков команды GET IMAGES
+        """
+        query = ImageQuery()
+        position = 0
+        while position < len(args):
+            keyword = args[position]
+            if keyword == "BBOX":
+                lat1, lon1, lat2, lon2 = (float(value) for value in args[position + 1:position + 5])
+                query.bbox = (lat1, lon1, lat2, lon2)
+                position += 5
+            elif keyword == "TIME":
+                query.time_range = (float(args[position + 1]), float(args[position + 2]))
+                position += 3
+            elif keyword == "SOURCE":
+                query.source = args[position + 1]
+                position += 2
+            elif keyword == "LIMIT":
+                query.limit = int(args[position + 1])
+                position += 2
+            elif keyword == "CURSOR":
+                query.cursor = int(args[position + 1])
+                position += 2
+            else:
+                raise ValueError(keyword)
+        return query
+
     def execute_file(self, filename):
         """
         Выполнение команд из файла
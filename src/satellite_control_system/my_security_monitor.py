@@ -1,6 +1,6 @@
 from src.system.event_types import Event
 from src.system.security_monitor import BaseSecurityMonitor
-from src.system.security_policy_type import SecurityPolicy
+from src.system.security_policy_type import build_policy_index, is_allowed
 from src.system.config import (
     LOG_DEBUG,
     LOG_ERROR,
@@ -11,14 +11,17 @@ from src.system.config import (
 class MySecurityMonitor(BaseSecurityMonitor):
     """класс монитора безопасности"""
 
-    def __init__(self, queues_dir, log_level, policies):
-        super().__init__(queues_dir, log_level)
+    def __init__(self, queues_dir, log_level, policies, worker_id=None):
+        super().__init__(queues_dir, log_level, worker_id)
         self._security_policies = []
+        self._policy_index = {}
         self._init_security_policies(policies)
 
     def _init_security_policies(self, policies):
         """инициализация политик безопасности"""
         self._security_policies = policies
+        # индекс для проверки событий за O(1)
+        self._policy_index = build_policy_index(policies)
         self._log_message(
             LOG_INFO, f"изменение политик безопасности: {self._security_policies}"
         )
@@ -26,20 +29,19 @@ class MySecurityMonitor(BaseSecurityMonitor):
     def _check_event(self, event: Event):
         """проверка входящих событий"""
         self._log_message(
-            LOG_DEBUG, f"проверка события {event}, по умолчанию выполнение запрещено"
+            LOG_DEBUG, "проверка события %s, по умолчанию выполнение запрещено", event
         )
 
         authorized = False
-        request = SecurityPolicy(
-            source=event.source,
-            destination=event.destination,
-            operation=event.operation,
-        )
 
-        if request in self._security_policies:
+        if is_allowed(
+            self._policy_index, event.source, event.destination, event.operation
+        ):
             self._log_message(
                 LOG_DEBUG,
-                f"событие разрешено политиками, выполняем {event.operation} -> {event.destination}",
+                "событие разрешено политиками, выполняем %s -> %s",
+                event.operation,
+                event.destination,
             )
             authorized = True
 
@@ -1,8 +1,17 @@
+import math
 from multiprocessing import Queue
 from queue import Empty
 from src.system.custom_process import BaseCustomProcess
 from src.system.queues_dir import QueuesDirectory
 from src.system.event_types import Event
+from src.system.batching import put_batch
+from src.satellite_control_system.zone_index import ZoneGridIndex
+from src.satellite_control_system.versioned_zones import (
+    VersionedZones,
+    ZONE_ADDED,
+    ZONES_ADDED,
+    ZONES_RESYNC,
+)
 from src.system.config import (
     LOG_DEBUG,
     LOG_ERROR,
@@ -16,13 +25,17 @@ from src.system.config import (
 
 
 class OpticsControl(BaseCustomProcess):
-    """Модуль контроля оптики"""
+    """Модуль контроля оптики
+
+    Кадр запрещенного снимка (описатель в пуле кадров) освобождается здесь
+    же, кадр разрешенного передается в ЦСУ вместе с результатом проверки
+    """
 
     log_prefix = "[OPTIC]"
     event_source_name = OPTICS_CONTROL_QUEUE_NAME
     events_q_name = event_source_name
 
-    def __init__(self, queues_dir, log_level=DEFAULT_LOG_LEVEL):
+    def __init__(self, queues_dir, log_level=DEFAULT_LOG_LEVEL, frame_pool=None):
         super().__init__(
             log_prefix=OpticsControl.log_prefix,
             queues_dir=queues_dir,
@@ -31,43 +44,99 @@ class OpticsControl(BaseCustomProcess):
             log_level=log_level,
         )
 
-        self._zones_cache = []
+        # набор зон и пространственный индекс: изменения вносятся в индекс
+        # по одной зоне, полностью он перестраивается только по полному списку
+        self._zones = VersionedZones()
+        self._zones_index = ZoneGridIndex()
         self._pending_photos = {}
+        self._frame_pool = frame_pool
         self._log_message(LOG_INFO, "Модуль управления оптикой создан")
 
     def _check_point_in_zones(self, lat, lon):
         """Проверка, находится ли точка в запрещенных зонах"""
-        for zone in self._zones_cache:
-            if (
-                zone.lat_bot_left <= lat <= zone.lat_top_right
-                and zone.lon_bot_left <= lon <= zone.lon_top_right
-            ):
-                self._log_message(
-                    LOG_INFO,
-                    f"Точка ({lat:.3f},{lon:.3f}) в запрещенной зоне",
-                )
-                return True
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            self._log_message(
+                LOG_ERROR,
+                "Некорректные координаты точки (%s,%s): съемка запрещена",
+                lat,
+                lon,
+            )
+            return True
+        if self._zones_index.contains(lat, lon):
+            self._log_message(
+                LOG_INFO,
+                f"Точка ({lat:.3f},{lon:.3f}) в запрещенной зоне",
+            )
+            return True
 
         self._log_message(
             LOG_DEBUG,
-            f"Точка ({lat:.3f},{lon:.3f}) НЕ в запрещенной зоне",
+            "Точка (%.3f,%.3f) НЕ в запрещенной зоне",
+            lat,
+            lon,
         )
         return False
 
+    def _request_zones_resync(self):
+        """Запрос полного списка зон после пропуска изменений"""
+        self._log_message(LOG_INFO, "Пропущены изменения зон, запрос полного списка")
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        q.put(
+            Event(
+                source=self.event_source_name,
+                destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                operation=ZONES_RESYNC,
+                parameters=None,
+            )
+        )
+
     def _check_events_q(self):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
                 match event.operation:
-                    case "zones_update":
-                        self._zones_cache = event.parameters
+                    case "zone_added" | "zone_removed" | "zones_added":
+                        version = self._zones.version
+                        if not self._zones.apply_delta(event.operation, event.parameters):
+                            self._request_zones_resync()
+                            continue
+                        if self._zones.version == version:
+                            continue
+                        if event.operation == ZONE_ADDED:
+                            _, zone_id, zone = event.parameters
+                            self._zones_index.add(zone_id, zone)
+                        elif event.operation == ZONES_ADDED:
+                            _, zone_ids, zones = event.parameters
+                            if len(zone_ids) > len(self._zones_index):
+                                # каталог больше текущего набора - индекс выгоднее
+                                # построить заново, с размером ячейки под новые зоны
+                                self._zones_index = ZoneGridIndex(
+                                    self._zones.zones.values(), self._zones.zones.keys()
+                                )
+                            else:
+                                for zone_id, zone in zip(zone_ids, zones):
+                                    self._zones_index.add(zone_id, zone)
+                        else:
+                            self._zones_index.remove(event.parameters[1])
+                        self._log_message(
+                            LOG_INFO,
+                            "Получено изменение зон от ЦСУ: %s, %d зон",
+                            event.operation,
+                            len(self._zones_index),
+                        )
+
+                    case "zones_snapshot":
+                        self._zones.load_snapshot(*event.parameters)
+                        self._zones_index = ZoneGridIndex(
+                            self._zones.zones.values(), self._zones.zones.keys()
+                        )
                         self._log_message(
                             LOG_INFO,
-                            f"Получено обновление зон от ЦСУ: {len(self._zones_cache)} зон",
+                            f"Получен полный список зон от ЦСУ: {len(self._zones_index)} зон",
                         )
 
                     case "camera_update":
@@ -87,7 +156,11 @@ class OpticsControl(BaseCustomProcess):
                         )
 
                     case "post_photo":
-                        lat, lon = event.parameters
+                        lat, lon = event.parameters[:2]
+                        # описатель кадра в пуле, если камера передает кадры
+                        frame = (
+                            event.parameters[2] if len(event.parameters) > 2 else None
+                        )
                         self._log_message(
                             LOG_INFO,
                             f"Получен снимок с координатами: {lat:.3f}, {lon:.3f}",
@@ -105,6 +178,9 @@ class OpticsControl(BaseCustomProcess):
                                 LOG_ERROR,
                                 f"СНИМОК ЗАБЛОКИРОВАН - координаты в запрещенной зоне: {lat:.3f}, {lon:.3f}",
                             )
+                            # кадр запрещенного снимка дальше не передается
+                            if frame is not None and self._frame_pool is not None:
+                                self._frame_pool.release(frame)
 
                             # Уведомляем ЦСУ о блокировке снимка
                             q: Queue = self._queues_dir.get_queue(
@@ -129,33 +205,32 @@ class OpticsControl(BaseCustomProcess):
                                 f"Снимок разрешен, отправка на отрисовку: {lat:.3f}, {lon:.3f}",
                             )
 
+                            # Отрисовка и уведомление ЦСУ об успешной
+                            # обработке снимка уходят одним пакетом
                             q: Queue = self._queues_dir.get_queue(
                                 SECURITY_MONITOR_QUEUE_NAME
                             )
-                            q.put(
-                                Event(
-                                    source=self.event_source_name,
-                                    destination=ORBIT_DRAWER_QUEUE_NAME,
-                                    operation="update_photo_map",
-                                    parameters=(lat, lon),
-                                )
-                            )
-
-                            # Уведомляем ЦСУ об успешной обработке снимка
-                            q: Queue = self._queues_dir.get_queue(
-                                SECURITY_MONITOR_QUEUE_NAME
-                            )
-                            q.put(
-                                Event(
-                                    source=self.event_source_name,
-                                    destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
-                                    operation="photo_processed",
-                                    parameters=(
-                                        lat,
-                                        lon,
-                                        False,  # снимок разрешен
+                            put_batch(
+                                q,
+                                [
+                                    Event(
+                                        source=self.event_source_name,
+                                        destination=ORBIT_DRAWER_QUEUE_NAME,
+                                        operation="update_photo_map",
+                                        parameters=(lat, lon),
                                     ),
-                                )
+                                    Event(
+                                        source=self.event_source_name,
+                                        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                                        operation="photo_processed",
+                                        parameters=(
+                                            lat,
+                                            lon,
+                                            False,  # снимок разрешен
+                                            frame,
+                                        ),
+                                    ),
+                                ],
                             )
 
                         # Очищаем данные о проверке
@@ -170,5 +245,6 @@ class OpticsControl(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Модуль управления оптикой активен")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
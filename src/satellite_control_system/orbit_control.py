@@ -87,7 +87,7 @@ class OrbitControl(BaseCustomProcess):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -170,5 +170,6 @@ class OrbitControl(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Система контроля орбиты запущена")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
@@ -67,5 +67,6 @@ class OrbitLimiter(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Модуль ограничений орбиты запущен")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
@@ -54,7 +54,7 @@ class OrbitMonitoring(BaseCustomProcess):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -107,5 +107,6 @@ class OrbitMonitoring(BaseCustomProcess):
         self._log_message(LOG_INFO, "Модуль мониторинга орбиты запущен")
 
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
@@ -0,0 +1,280 @@
+from collections import deque
+from multiprocessing import Queue
+from queue import Empty
+from time import monotonic
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.system.custom_process import BaseCustomProcess
+from src.system.event_types import Event
+from src.system.config import (
+    LOG_DEBUG,
+    LOG_ERROR,
+    LOG_INFO,
+    DEFAULT_LOG_LEVEL,
+    PHOTO_PLANNER_QUEUE_NAME,
+    CAMERA_QUEUE_NAME,
+    SATELITE_QUEUE_NAME,
+    SECURITY_MONITOR_QUEUE_NAME,
+    CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+)
+from src.satellite_control_system.zone_arrays import ZoneArrays
+from src.satellite_control_system.versioned_zones import (
+    VersionedZones,
+    ZONE_ADDED,
+    ZONES_ADDED,
+    ZONE_REMOVED,
+    ZONES_RESYNC,
+)
+
+
+def track_in_zones(lat: np.ndarray, lon: np.ndarray, zones) -> np.ndarray:
+    """Маска точек трассы, попадающих хотя бы в одну запрещенную зону
+
+    Args:
+        lat (np.ndarray): широты точек трассы
+        lon (np.ndarray): долготы точек трассы
+        zones: список RestrictedZone или ZoneArrays
+
+    Returns:
+        np.ndarray: массив bool той же длины, что lat
+    """
+    if not isinstance(zones, ZoneArrays):
+        zones = ZoneArrays.from_zones(zones)
+    mask, _ = zones.check_points(lat, lon)
+    return mask
+
+
+def free_windows(times: np.ndarray, inside: np.ndarray) -> List[Tuple[float, float]]:
+    """Интервалы времени, когда трасса вне всех запрещенных зон
+
+    Интервалы определяются по точкам трассы, то есть с точностью до шага
+    трассы (resolution_sec прогноза): интервал начинается и заканчивается
+    в точках вне зон, а настоящие границы зон лежат до шага дальше.
+    Интервалы короче одного шага (например, из одной точки) отбрасываются:
+    по ним нельзя судить, что спутник действительно вне зон.
+
+    Args:
+        times (np.ndarray): моменты времени точек трассы (по возрастанию, с постоянным шагом)
+        inside (np.ndarray): маска точек в запрещенных зонах (track_in_zones)
+
+    Returns:
+        List[Tuple[float, float]]: интервалы (начало, конец) по точкам трассы
+    """
+    times = np.asarray(times)
+    free = np.concatenate(([0], (~np.asarray(inside)).astype(np.int8), [0]))
+    edges = np.diff(free)
+    starts = times[np.flatnonzero(edges == 1)]
+    ends = times[np.flatnonzero(edges == -1) - 1]
+    if len(times) > 1:
+        keep = ends - starts >= times[1] - times[0]
+        starts, ends = starts[keep], ends[keep]
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def next_window(windows: List[Tuple[float, float]], moment: float) -> Optional[Tuple[float, float]]:
+    """Интервал, в котором находится момент moment, или ближайший следующий
+
+    Returns:
+        Optional[Tuple[float, float]]: интервал или None, если разрешенных интервалов больше нет
+    """
+    ends = [end for _, end in windows]
+    index = int(np.searchsorted(ends, moment))
+    if index == len(windows):
+        return None
+    return windows[index]
+
+
+class PhotoPlanner(BaseCustomProcess):
+    """Планировщик снимков: откладывает запросы на фотографирование
+    до ближайшего интервала, когда спутник вне запрещенных зон"""
+
+    log_prefix = "[PLANNER]"
+    event_source_name = PHOTO_PLANNER_QUEUE_NAME
+    events_q_name = event_source_name
+
+    def __init__(
+        self,
+        queues_dir,
+        log_level=DEFAULT_LOG_LEVEL,
+        horizon_minutes=24 * 60,
+        resolution_sec=30,
+        track_refresh_sec=10.0,
+    ):
+        super().__init__(
+            log_prefix=PhotoPlanner.log_prefix,
+            queues_dir=queues_dir,
+            events_q_name=PhotoPlanner.events_q_name,
+            event_source_name=PhotoPlanner.event_source_name,
+            log_level=log_level,
+        )
+        self._horizon_minutes = horizon_minutes
+        self._resolution_sec = resolution_sec
+        # трасса запрашивается заново, так как орбита может измениться
+        self._track_refresh_sec = track_refresh_sec
+        self._track_requested_at = None
+
+        self._zones = VersionedZones()
+        self._track = None  # (моменты времени, широты, долготы)
+        # число зон, содержащих каждую точку трассы: изменение одной зоны
+        # пересчитывает только ее вклад, None - пересчитать по всем зонам
+        self._zone_counts = None
+        self._windows = None
+        # привязка времени симуляции к реальному: (время симуляции, monotonic, ускорение)
+        self._clock = None
+        self._pending_photos = deque()
+        self._log_message(LOG_INFO, "Планировщик снимков создан")
+
+    def _sim_time(self) -> float:
+        """Текущее время симуляции по последней полученной трассе"""
+        sim_time, received_at, time_warp = self._clock
+        return sim_time + (monotonic() - received_at) * time_warp
+
+    def _replan(self):
+        """Пересчет разрешенных интервалов по трассе и зонам"""
+        if self._track is None:
+            return
+        times, lat, lon = self._track
+        if self._zone_counts is None:
+            self._zone_counts = ZoneArrays.from_zones(self._zones.values()).count_points(lat, lon)
+        self._windows = free_windows(times, self._zone_counts > 0)
+        self._log_message(
+            LOG_DEBUG,
+            lambda: f"план: {len(self._windows)} разрешенных интервалов, {len(self._zones)} зон",
+        )
+
+    def _apply_zone_delta(self, operation, parameters):
+        """Учет добавления или удаления зон в плане"""
+        if operation == ZONE_ADDED:
+            zones = [parameters[2]]
+        elif operation == ZONES_ADDED:
+            zones = parameters[2]
+        else:
+            zones = [self._zones.zones[parameters[1]]] if parameters[1] in self._zones.zones else []
+        version = self._zones.version
+        if not self._zones.apply_delta(operation, parameters):
+            self._log_message(LOG_INFO, "Пропущены изменения зон, запрос полного списка")
+            q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+            q.put(
+                Event(
+                    source=self.event_source_name,
+                    destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                    operation=ZONES_RESYNC,
+                    parameters=None,
+                )
+            )
+            return
+        if self._zones.version == version or not zones or self._zone_counts is None:
+            return
+        _, lat, lon = self._track
+        change = ZoneArrays.from_zones(zones).count_points(lat, lon)
+        if operation != ZONE_REMOVED:
+            self._zone_counts += change
+        else:
+            self._zone_counts -= change
+        self._replan()
+
+    def _request_track(self):
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        q.put(
+            Event(
+                source=self.event_source_name,
+                destination=SATELITE_QUEUE_NAME,
+                operation="predict_ground_track",
+                parameters=(self._horizon_minutes, self._resolution_sec),
+            )
+        )
+        self._track_requested_at = monotonic()
+
+    def _release_photos(self) -> Optional[float]:
+        """Передача отложенных запросов в камеру, если спутник в разрешенном интервале
+
+        Returns:
+            Optional[float]: сколько секунд реального времени ждать следующего интервала
+        """
+        if not self._pending_photos:
+            return None
+        if self._windows is None:
+            # плана еще нет - поведение как без планировщика
+            window = None
+            release = True
+        else:
+            now = self._sim_time()
+            window = next_window(self._windows, now)
+            if window is None:
+                self._log_message(
+                    LOG_ERROR,
+                    "Нет разрешенных интервалов до конца прогноза, снимки отложены",
+                )
+                return None
+            release = window[0] <= now <= window[1]
+
+        if not release:
+            return (window[0] - self._sim_time()) / self._clock[2]
+
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        while self._pending_photos:
+            self._pending_photos.popleft()
+            q.put(
+                Event(
+                    source=self.event_source_name,
+                    destination=CAMERA_QUEUE_NAME,
+                    operation="request_photo",
+                    parameters=None,
+                )
+            )
+            self._log_message(LOG_INFO, "Запрос на снимок передан в камеру")
+        return None
+
+    def _check_events_q(self):
+        """Обработка запросов"""
+        while True:
+            try:
+                event = self._get_event()
+                if not isinstance(event, Event):
+                    continue
+
+                match event.operation:
+                    case "schedule_photo":
+                        self._pending_photos.append(event.parameters)
+                        self._log_message(
+                            LOG_INFO,
+                            "Запрос на снимок принят, в очереди: %d",
+                            len(self._pending_photos),
+                        )
+
+                    case "zone_added" | "zone_removed" | "zones_added":
+                        self._apply_zone_delta(event.operation, event.parameters)
+
+                    case "zones_snapshot":
+                        self._zones.load_snapshot(*event.parameters)
+                        self._zone_counts = None
+                        self._replan()
+
+                    case "ground_track":
+                        times, lat, lon = event.parameters
+                        time_warp = (event.extra_parameters or {}).get("time_warp", 1.0)
+                        self._track = (times, lat, lon)
+                        self._clock = (times[0], monotonic(), time_warp)
+                        self._zone_counts = None
+                        self._replan()
+
+            except Empty:
+                break
+            except Exception as e:
+                self._log_message(LOG_ERROR, f"Ошибка при обработке события: {e}")
+
+    def run(self):
+        self._log_message(LOG_INFO, "Планировщик снимков запущен")
+        while not self._quit:
+            if (self._track_requested_at is None
+                    or monotonic() - self._track_requested_at >= self._track_refresh_sec):
+                self._request_track()
+            self._check_events_q()
+            self._check_control_q()
+
+            timeout = self._release_photos()
+            refresh = self._track_refresh_sec - (monotonic() - self._track_requested_at)
+            timeout = refresh if timeout is None else min(timeout, refresh)
+            self._wait_for_events(max(0.0, timeout))
@@ -12,6 +12,7 @@ from src.system.config import (
     OPTICS_CONTROL_QUEUE_NAME,
     CAMERA_QUEUE_NAME,
     RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+    PHOTO_PLANNER_QUEUE_NAME,
 )
 
 # Политики безопасности, определяющие разрешенные взаимодействия между компонентами
@@ -44,6 +45,16 @@ security_policies = [
         destination=AUTHORIZATION_MODULE_QUEUE_NAME,
         operation="get_all_images",
     ),
+    SecurityPolicy(
+        source="admin",
+        destination=AUTHORIZATION_MODULE_QUEUE_NAME,
+        operation="export_images",
+    ),
+    SecurityPolicy(
+        source="admin",
+        destination=AUTHORIZATION_MODULE_QUEUE_NAME,
+        operation="get_propagation_metrics",
+    ),
     SecurityPolicy(
         source="admin",
         destination=AUTHORIZATION_MODULE_QUEUE_NAME,
@@ -54,6 +65,11 @@ security_policies = [
         destination=AUTHORIZATION_MODULE_QUEUE_NAME,
         operation="add_zone_request",
     ),
+    SecurityPolicy(
+        source="admin",
+        destination=AUTHORIZATION_MODULE_QUEUE_NAME,
+        operation="add_zones_request",
+    ),
     SecurityPolicy(
         source="admin",
         destination=AUTHORIZATION_MODULE_QUEUE_NAME,
@@ -70,6 +86,11 @@ security_policies = [
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         operation="add_zone_request",
     ),
+    SecurityPolicy(
+        source=AUTHORIZATION_MODULE_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="add_zones_request",
+    ),
     SecurityPolicy(
         source=AUTHORIZATION_MODULE_QUEUE_NAME,
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
@@ -85,23 +106,81 @@ security_policies = [
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         operation="get_all_images",
     ),
-    # ЦСМ -> Камера
+    SecurityPolicy(
+        source=AUTHORIZATION_MODULE_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="export_images",
+    ),
+    SecurityPolicy(
+        source=AUTHORIZATION_MODULE_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="get_propagation_metrics",
+    ),
+    # ЦСМ -> Планировщик снимков
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=PHOTO_PLANNER_QUEUE_NAME,
+        operation="schedule_photo",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=PHOTO_PLANNER_QUEUE_NAME,
+        operation="zone_added",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=PHOTO_PLANNER_QUEUE_NAME,
+        operation="zones_added",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=PHOTO_PLANNER_QUEUE_NAME,
+        operation="zone_removed",
+    ),
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=PHOTO_PLANNER_QUEUE_NAME,
+        operation="zones_snapshot",
+    ),
+    # Планировщик снимков -> Камера
+    SecurityPolicy(
+        source=PHOTO_PLANNER_QUEUE_NAME,
         destination=CAMERA_QUEUE_NAME,
         operation="request_photo",
     ),
+    # Планировщик снимков -> ЦСУ
+    SecurityPolicy(
+        source=PHOTO_PLANNER_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="zones_resync",
+    ),
+    # Планировщик снимков -> Спутник
+    SecurityPolicy(
+        source=PHOTO_PLANNER_QUEUE_NAME,
+        destination=SATELITE_QUEUE_NAME,
+        operation="predict_ground_track",
+    ),
     # ЦСМ -> Менеджер запрещенных зон
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
         operation="add_zone_request",
     ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        operation="add_zones_request",
+    ),
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
         operation="remove_zone_request",
     ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        operation="zones_resync",
+    ),
     # ЦСМ -> Мониторинг орбиты
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
@@ -112,7 +191,22 @@ security_policies = [
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         destination=OPTICS_CONTROL_QUEUE_NAME,
-        operation="zones_update",
+        operation="zone_added",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=OPTICS_CONTROL_QUEUE_NAME,
+        operation="zones_added",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=OPTICS_CONTROL_QUEUE_NAME,
+        operation="zone_removed",
+    ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=OPTICS_CONTROL_QUEUE_NAME,
+        operation="zones_snapshot",
     ),
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
@@ -130,6 +224,11 @@ security_policies = [
         destination=SATELITE_QUEUE_NAME,
         operation="change_orbit",
     ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=SATELITE_QUEUE_NAME,
+        operation="get_propagation_metrics",
+    ),
     # ЦСМ -> Хранилище изображений
     SecurityPolicy(
         source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
@@ -141,6 +240,11 @@ security_policies = [
         destination=IMAGE_STORAGE_QUEUE_NAME,
         operation="get_all_images",
     ),
+    SecurityPolicy(
+        source=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        destination=IMAGE_STORAGE_QUEUE_NAME,
+        operation="export_images",
+    ),
     # Ограничитель орбиты -> Контроль орбиты
     SecurityPolicy(
         source=ORBIT_LIMITER_QUEUE_NAME,
@@ -176,6 +280,11 @@ security_policies = [
         destination=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
         operation="add_restricted_zone",
     ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        destination=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
+        operation="add_restricted_zones",
+    ),
     SecurityPolicy(
         source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
         destination=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
@@ -190,7 +299,22 @@ security_policies = [
     SecurityPolicy(
         source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
-        operation="zones_update",
+        operation="zone_added",
+    ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="zones_added",
+    ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="zone_removed",
+    ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="zones_snapshot",
     ),
     SecurityPolicy(
         source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
@@ -203,6 +327,11 @@ security_policies = [
         destination=ORBIT_DRAWER_QUEUE_NAME,
         operation="draw_restricted_zone",
     ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        destination=ORBIT_DRAWER_QUEUE_NAME,
+        operation="draw_restricted_zones",
+    ),
     # Хранилище запрещенных зон -> Центральная система управления
     SecurityPolicy(
         source=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
@@ -213,7 +342,17 @@ security_policies = [
     SecurityPolicy(
         source=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
         destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
-        operation="draw_zone",
+        operation="zone_added",
+    ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
+        destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        operation="zones_added",
+    ),
+    SecurityPolicy(
+        source=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
+        destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+        operation="zone_removed",
     ),
     SecurityPolicy(
         source=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
@@ -231,7 +370,22 @@ security_policies = [
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
         operation="image_saved",
     ),
+    SecurityPolicy(
+        source=IMAGE_STORAGE_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="images_page",
+    ),
+    SecurityPolicy(
+        source=IMAGE_STORAGE_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="images_exported",
+    ),
     # Контроль оптики -> ЦСУ
+    SecurityPolicy(
+        source=OPTICS_CONTROL_QUEUE_NAME,
+        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+        operation="zones_resync",
+    ),
     SecurityPolicy(
         source=OPTICS_CONTROL_QUEUE_NAME,
         destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
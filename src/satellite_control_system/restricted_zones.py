@@ -1,3 +1,4 @@
+import numpy as np
 from multiprocessing import Queue
 from queue import Empty
 from src.system.custom_process import BaseCustomProcess
@@ -13,6 +14,8 @@ from src.system.config import (
     RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
 )
 from src.satellite_control_system.restricted_zone import RestrictedZone
+from src.satellite_control_system.versioned_zones import ZONE_ADDED, ZONES_ADDED, ZONE_REMOVED
+from src.satellite_control_system.zone_catalog import validate_zone_catalog
 
 
 class RestrictedZonesStorage(BaseCustomProcess):
@@ -31,13 +34,70 @@ class RestrictedZonesStorage(BaseCustomProcess):
             log_level=log_level,
         )
         self._zones = {}
+        # номер последнего изменения набора зон
+        self._version = 0
         self._log_message(LOG_INFO, "Хранилище запрещенных зон создано")
 
+    def _send_delta(self, operation, parameters):
+        """Отправка изменения набора зон модулю работы с зонами"""
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        q.put(
+            Event(
+                source=self.event_source_name,
+                destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+                operation=operation,
+                parameters=parameters,
+            )
+        )
+
+    def _send_operation_result(self, operation, zone_id, success):
+        """Отправка результата операции, не изменившей набор зон"""
+        q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
+        q.put(
+            Event(
+                source=self.event_source_name,
+                destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
+                operation="zone_operation_result",
+                parameters=(operation, zone_id, success),
+            )
+        )
+
+    def _add_zones(self, table):
+        """Добавление каталога зон одной операцией: все зоны каталога
+        добавляются, только если все строки корректны"""
+        try:
+            table = np.asarray(table, dtype=float)
+            valid, zone_ids = validate_zone_catalog(table, self._zones.keys())
+        except ValueError as e:
+            self._log_message(LOG_ERROR, "Каталог зон отклонен: %s", e)
+            self._send_operation_result("add_bulk", None, False)
+            return
+        if not valid.all():
+            self._log_message(
+                LOG_ERROR,
+                "Каталог зон отклонен: некорректных строк %d из %d (первая - строка %d)",
+                len(valid) - int(valid.sum()),
+                len(valid),
+                int((~valid).argmax()) + 1,
+            )
+            self._send_operation_result("add_bulk", len(valid), False)
+            return
+        if not len(valid):
+            return
+
+        # строки уже проверены, поэтому ошибок при создании зон не будет
+        zones = [RestrictedZone(*bounds) for bounds in table[:, 1:].tolist()]
+        zone_ids = zone_ids.tolist()
+        self._zones.update(zip(zone_ids, zones))
+        self._version += 1
+        self._log_message(LOG_INFO, "Добавлен каталог зон: %d зон", len(zones))
+        self._send_delta(ZONES_ADDED, (self._version, zone_ids, zones))
+
     def _check_events_q(self):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -51,6 +111,7 @@ class RestrictedZonesStorage(BaseCustomProcess):
                             self._log_message(
                                 LOG_INFO, f"Зона id={zone_id} уже существует"
                             )
+                            self._send_operation_result("add", zone_id, False)
                             continue
 
                         try:
@@ -62,29 +123,17 @@ class RestrictedZonesStorage(BaseCustomProcess):
                                 f"Добавлена зона id={zone_id}, lat1={lat1:.3f}, lon1={lon1:.3f}, lat2={lat2:.3f}, lon2={lon2:.3f}",
                             )
 
-                            # Отрисовка зоны
-                            q: Queue = self._queues_dir.get_queue(
-                                SECURITY_MONITOR_QUEUE_NAME
-                            )
-                            q.put(
-                                Event(
-                                    source=self.event_source_name,
-                                    destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
-                                    operation="draw_zone",
-                                    parameters=(zone_id, zone),
-                                )
-                            )
-                            q.put(
-                                Event(
-                                    source=self.event_source_name,
-                                    destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
-                                    operation="zone_operation_result",
-                                    parameters=("add", zone_id, True),
-                                )
-                            )
+                            # Передается только изменение, а не весь список зон
+                            self._version += 1
+                            self._send_delta(ZONE_ADDED, (self._version, zone_id, zone))
 
                         except Exception as e:
                             self._log_message(LOG_ERROR, f"Ошибка: {e}")
+                            self._send_operation_result("add", zone_id, False)
+
+                    case "add_restricted_zones":
+                        # Добавление каталога зон: массив N x 5 (id, lat1, lon1, lat2, lon2)
+                        self._add_zones(event.parameters)
 
                     case "remove_restricted_zone":
                         # Удаление зоны
@@ -94,26 +143,15 @@ class RestrictedZonesStorage(BaseCustomProcess):
                             self._log_message(
                                 LOG_ERROR, f"Зона id={zone_id} не найдена"
                             )
+                            self._send_operation_result("remove", zone_id, False)
                             continue
 
-                        zone = self._zones[zone_id]
                         del self._zones[zone_id]
-
-                        q: Queue = self._queues_dir.get_queue(
-                            SECURITY_MONITOR_QUEUE_NAME
-                        )
-                        q.put(
-                            Event(
-                                source=self.event_source_name,
-                                destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
-                                operation="zone_operation_result",
-                                parameters=("remove", zone_id, True),
-                            )
-                        )
+                        self._version += 1
+                        self._send_delta(ZONE_REMOVED, (self._version, zone_id))
 
                     case "get_all_zones":
-                        # Отправка списка зон
-                        zones_list = list(self._zones.values())
+                        # Отправка полного списка зон (начальная загрузка или resync)
                         q: Queue = self._queues_dir.get_queue(
                             SECURITY_MONITOR_QUEUE_NAME
                         )
@@ -122,7 +160,7 @@ class RestrictedZonesStorage(BaseCustomProcess):
                                 source=self.event_source_name,
                                 destination=RESTRICTED_ZONES_MANAGER_QUEUE_NAME,
                                 operation="all_zones_data",
-                                parameters=zones_list,
+                                parameters=(self._version, dict(self._zones)),
                             )
                         )
 
@@ -132,5 +170,6 @@ class RestrictedZonesStorage(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Хранилище зон ограничений запущено")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
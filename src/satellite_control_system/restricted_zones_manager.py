@@ -3,6 +3,7 @@ from queue import Empty
 from src.system.custom_process import BaseCustomProcess
 from src.system.queues_dir import QueuesDirectory
 from src.system.event_types import Event
+from src.system.batching import put_batch
 from src.system.config import (
     LOG_DEBUG,
     LOG_ERROR,
@@ -14,6 +15,12 @@ from src.system.config import (
     CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
     ORBIT_DRAWER_QUEUE_NAME,
 )
+from src.satellite_control_system.versioned_zones import (
+    VersionedZones,
+    ZONE_ADDED,
+    ZONES_ADDED,
+    ZONES_SNAPSHOT,
+)
 
 
 class RestrictedZonesManager(BaseCustomProcess):
@@ -31,7 +38,7 @@ class RestrictedZonesManager(BaseCustomProcess):
             event_source_name=RestrictedZonesManager.event_source_name,
             log_level=log_level,
         )
-        self._zones_cache = []
+        self._zones = VersionedZones()
         self._checked_points = {}
         self._log_message(LOG_INFO, "Модуль работы с запрещенными зонами создан")
         self._request_zones_list()
@@ -48,21 +55,28 @@ class RestrictedZonesManager(BaseCustomProcess):
             )
         )
 
-    def _update_central_system(self):
-        """Отправка обновления о зонах в центральную систему"""
+    def _update_central_system(self, operation, parameters, extra_events=()):
+        """Отправка изменения или полного списка зон в центральную систему"""
         try:
             q: Queue = self._queues_dir.get_queue(SECURITY_MONITOR_QUEUE_NAME)
-            q.put(
-                Event(
-                    source=self.event_source_name,
-                    destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
-                    operation="zones_update",
-                    parameters=self._zones_cache,
-                )
+            put_batch(
+                q,
+                [
+                    *extra_events,
+                    Event(
+                        source=self.event_source_name,
+                        destination=CENTRAL_CONTROL_SYSTEM_QUEUE_NAME,
+                        operation=operation,
+                        parameters=parameters,
+                    ),
+                ],
             )
             self._log_message(
                 LOG_INFO,
-                f"Отправлено обновление зон в центральную систему: {len(self._zones_cache)} зон",
+                "Отправлено обновление зон в центральную систему: %s, версия %d, %d зон",
+                operation,
+                self._zones.version,
+                len(self._zones),
             )
         except Exception as e:
             self._log_message(
@@ -73,7 +87,7 @@ class RestrictedZonesManager(BaseCustomProcess):
         """Обработка запросов"""
         while True:
             try:
-                event = self._events_q.get_nowait()
+                event = self._get_event()
                 if not isinstance(event, Event):
                     continue
 
@@ -100,25 +114,81 @@ class RestrictedZonesManager(BaseCustomProcess):
                             )
                         )
 
-                    case "draw_zone":
-                        zone_id, zone = event.parameters
+                    case "add_zones_request":
+                        # Запрос на добавление каталога зон
                         self._log_message(
                             LOG_INFO,
-                            f"Запрос на отрисовку зоны: id={zone_id}",
+                            "Запрос на добавление каталога зон: %d строк",
+                            len(event.parameters),
                         )
-
+                        self._checked_points = {}
                         q: Queue = self._queues_dir.get_queue(
                             SECURITY_MONITOR_QUEUE_NAME
                         )
                         q.put(
                             Event(
                                 source=self.event_source_name,
-                                destination=ORBIT_DRAWER_QUEUE_NAME,
-                                operation="draw_restricted_zone",
-                                parameters=zone,
+                                destination=RESTRICTED_ZONE_STORAGE_QUEUE_NAME,
+                                operation="add_restricted_zones",
+                                parameters=event.parameters,
                             )
                         )
 
+                    case "zone_added" | "zone_removed" | "zones_added":
+                        # Изменение набора зон в хранилище
+                        self._checked_points = {}
+                        if not self._zones.apply_delta(event.operation, event.parameters):
+                            self._log_message(
+                                LOG_INFO,
+                                "Пропущены изменения зон (версия %d, получена %d), запрос полного списка",
+                                self._zones.version,
+                                event.parameters[0],
+                            )
+                            self._request_zones_list()
+                            continue
+
+                        extra_events = []
+                        if event.operation == ZONES_ADDED:
+                            self._log_message(
+                                LOG_INFO,
+                                "Добавлен каталог зон: %d зон",
+                                len(event.parameters[1]),
+                            )
+                            # Отрисовка всех зон каталога одним событием
+                            extra_events.append(
+                                Event(
+                                    source=self.event_source_name,
+                                    destination=ORBIT_DRAWER_QUEUE_NAME,
+                                    operation="draw_restricted_zones",
+                                    parameters=event.parameters[2],
+                                )
+                            )
+                        else:
+                            zone_id = event.parameters[1]
+                            self._log_message(
+                                LOG_INFO,
+                                f"Результат операции {event.operation} для зоны {zone_id}: успешно",
+                            )
+                        if event.operation == ZONE_ADDED:
+                            # Отрисовка зоны
+                            extra_events.append(
+                                Event(
+                                    source=self.event_source_name,
+                                    destination=ORBIT_DRAWER_QUEUE_NAME,
+                                    operation="draw_restricted_zone",
+                                    parameters=event.parameters[2],
+                                )
+                            )
+                        self._update_central_system(
+                            event.operation, event.parameters, extra_events
+                        )
+
+                    case "zones_resync":
+                        # Центральная система пропустила изменения
+                        self._update_central_system(
+                            ZONES_SNAPSHOT, self._zones.snapshot()
+                        )
+
                     case "remove_zone_request":
                         # Запрос на удаление зоны
                         zone_id = event.parameters
@@ -139,33 +209,39 @@ class RestrictedZonesManager(BaseCustomProcess):
                         )
 
                     case "all_zones_data":
-                        # Обновление зон
-                        self._zones_cache = event.parameters
+                        # Полный список зон (начальная загрузка или resync)
+                        self._zones.load_snapshot(*event.parameters)
                         # Сбрасываем проверенные точки при обновлении зон
                         self._checked_points = {}
 
                         self._log_message(
-                            LOG_INFO, f"Получен список из {len(self._zones_cache)} зон"
+                            LOG_INFO, f"Получен список из {len(self._zones)} зон"
                         )
 
                         # Отправляем обновленные данные в центральную систему
-                        self._update_central_system()
+                        self._update_central_system(
+                            ZONES_SNAPSHOT, self._zones.snapshot()
+                        )
 
-                        for i, zone in enumerate(self._zones_cache):
-                            self._log_message(
-                                LOG_DEBUG,
-                                f"Зона {i}: {zone.lat_bot_left:.3f},{zone.lon_bot_left:.3f} - {zone.lat_top_right:.3f},{zone.lon_top_right:.3f}",
-                            )
+                        if self._log_enabled(LOG_DEBUG):
+                            for i, zone in self._zones.zones.items():
+                                self._log_message(
+                                    LOG_DEBUG,
+                                    "Зона %d: %.3f,%.3f - %.3f,%.3f",
+                                    i,
+                                    zone.lat_bot_left,
+                                    zone.lon_bot_left,
+                                    zone.lat_top_right,
+                                    zone.lon_top_right,
+                                )
 
                     case "zone_operation_result":
-                        # Обновление списка зон после изменения
+                        # Операция не изменила набор зон
                         operation, zone_id, success = event.parameters
                         self._log_message(
                             LOG_INFO,
                             f"Результат операции {operation} для зоны {zone_id}: {'успешно' if success else 'ошибка'}",
                         )
-                        # Запрашиваем актуальный список зон
-                        self._request_zones_list()
 
             except Empty:
                 break
@@ -175,5 +251,6 @@ class RestrictedZonesManager(BaseCustomProcess):
     def run(self):
         self._log_message(LOG_INFO, "Модуль работы с запрещенными зонами запущен")
         while not self._quit:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
@@ -0,0 +1,195 @@
+""" модуль хранения кадров снимков сжатыми фрагментами (тайлами)
+
+Кадр делится на квадратные фрагменты tile_size x tile_size, каждый
+фрагмент сжимается (zlib или lzma из стандартной библиотеки) и хранится
+в файле, имя которого - хеш содержимого фрагмента. Одинаковые фрагменты
+(повторные снимки того же участка, однотонные области) хранятся один раз.
+Для кадра записывается описание: размер, тип пикселей и список хешей
+фрагментов по строкам.
+
+Сжатие и запись выполняются пулом потоков (zlib, lzma и hashlib
+освобождают GIL на время работы), поэтому цикл обработки событий
+хранилища не ждет записи кадра.
+"""
+import hashlib
+import json
+import lzma
+import os
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+_CODECS = {
+    "zlib": (".z", lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": (".xz", lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+_DIGEST_SIZE = 16
+
+
+def _tile_slices(shape, tile_size: int) -> List[Tuple[slice, slice]]:
+    """ фрагменты кадра по строкам (краевые фрагменты могут быть меньше) """
+    return [
+        (slice(row, row + tile_size), slice(col, col + tile_size))
+        for row in range(0, shape[0], tile_size)
+        for col in range(0, shape[1], tile_size)
+    ]
+
+
+class TileStore:
+    """ хранилище кадров из сжатых фрагментов с устранением повторов """
+
+    def __init__(
+            self,
+            directory,
+            tile_size: int = 128,
+            codec: str = "zlib",
+            level: int = 6,
+            workers: int = 2):
+        """
+        Args:
+            directory: каталог кадров (описания кадров и подкаталог tiles)
+            tile_size (int): размер стороны фрагмента, пикселей
+            codec (str): "zlib" или "lzma"
+            level (int): степень сжатия (zlib: 0-9, lzma: 0-9)
+            workers (int): число потоков сжатия
+        """
+        if codec not in _CODECS:
+            raise ValueError(f"неизвестный способ сжатия {codec!r}, возможны: {', '.join(_CODECS)}")
+        self._directory = Path(directory)
+        self._tiles_dir = self._directory / "tiles"
+        self._tiles_dir.mkdir(parents=True, exist_ok=True)
+        self._tile_size = tile_size
+        self._codec = codec
+        self._level = level
+        self._extension, self._compress, _ = _CODECS[codec]
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tiles")
+        self._lock = threading.Lock()
+        # хеши уже записанных фрагментов (дополняется при записи, на диске
+        # проверяются только неизвестные хеши)
+        self._known = set()
+        # фрагменты, которые сейчас сжимает другой поток: хеш -> событие завершения
+        self._writing = {}
+        # статистика: исходный размер кадров, записано байт, фрагментов, повторов
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.tiles = 0
+        self.duplicate_tiles = 0
+
+    def _tile_path(self, digest: str) -> Path:
+        return self._tiles_dir / digest[:2] / (digest + self._extension)
+
+    def _split(self, frame: np.ndarray) -> List[Tuple[bytes, bytes]]:
+        """ копирование фрагментов кадра в непрерывные блоки:
+        (заголовок - тип и размер фрагмента, пиксели) """
+        tiles = []
+        for rows, cols in _tile_slices(frame.shape, self._tile_size):
+            tile = np.ascontiguousarray(frame[rows, cols])
+            tiles.append((f"{tile.dtype.str}{tile.shape}".encode(), tile.tobytes()))
+        return tiles
+
+    def _write_tile(self, header: bytes, tile: bytes) -> str:
+        # тип и размер фрагмента входят в хеш: одинаковые байты
+        # фрагментов разной формы не совпадут
+        digest = hashlib.blake2b(header + tile, digest_size=_DIGEST_SIZE).hexdigest()
+        with self._lock:
+            writing = self._writing.get(digest)
+            owner = digest not in self._known and writing is None
+            if owner:
+                writing = self._writing[digest] = threading.Event()
+        if not owner:
+            if writing is not None:
+                # тот же фрагмент записывает другой поток: описание кадра
+                # должно появиться только после записи фрагмента
+                writing.wait()
+            with self._lock:
+                if digest not in self._known:
+                    raise OSError(f"фрагмент {digest} не записан")
+                self.duplicate_tiles += 1
+            return digest
+
+        path = self._tile_path(digest)
+        try:
+            if path.exists():
+                # фрагмент записан при прошлом запуске
+                with self._lock:
+                    self.duplicate_tiles += 1
+            else:
+                packed = self._compress(tile, self._level)
+                path.parent.mkdir(exist_ok=True)
+                # запись во временный файл и переименование: неполный
+                # фрагмент не виден под именем хеша
+                temporary = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                with open(temporary, "wb") as file:
+                    file.write(packed)
+                os.replace(temporary, path)
+                with self._lock:
+                    self.stored_bytes += len(packed)
+            with self._lock:
+                self._known.add(digest)
+        finally:
+            with self._lock:
+                del self._writing[digest]
+            writing.set()
+        return digest
+
+    def _store(self, image_id: int, frame: np.ndarray, release: Optional[Callable[[], bool]]) -> int:
+        shape, dtype, nbytes = frame.shape, frame.dtype.str, frame.nbytes
+        tiles = self._split(frame)
+        # фрагменты скопированы: память кадра больше не нужна
+        if release is not None and not release():
+            raise RuntimeError(f"кадр снимка #{image_id} перезаписан до копирования")
+        digests = [self._write_tile(header, tile) for header, tile in tiles]
+        manifest = {
+            "shape": list(shape),
+            "dtype": dtype,
+            "tile_size": self._tile_size,
+            "codec": self._codec,
+            "tiles": digests,
+        }
+        path = self._directory / f"{image_id}.json"
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        os.replace(temporary, path)
+        with self._lock:
+            self.raw_bytes += nbytes
+            self.tiles += len(digests)
+        return image_id
+
+    def save(self, image_id: int, frame: np.ndarray,
+             release: Optional[Callable[[], bool]] = None) -> Future:
+        """save ставит запись кадра в очередь пула потоков
+
+        Args:
+            image_id (int): номер снимка
+            frame (np.ndarray): кадр (может быть представлением разделяемой памяти)
+            release (Optional[Callable[[], bool]]): вызывается после копирования
+                фрагментов кадра, чтобы освободить память кадра; возвращает
+                False, если кадр за это время перезаписан
+
+        Returns:
+            Future: результат - номер снимка
+        """
+        return self._executor.submit(self._store, image_id, frame, release)
+
+    def load(self, image_id: int) -> np.ndarray:
+        """load восстанавливает кадр снимка из фрагментов"""
+        with open(self._directory / f"{image_id}.json", encoding="utf-8") as file:
+            manifest = json.load(file)
+        extension, _, decompress = _CODECS[manifest["codec"]]
+        frame = np.empty(manifest["shape"], dtype=np.dtype(manifest["dtype"]))
+        slices = _tile_slices(frame.shape, manifest["tile_size"])
+        for (rows, cols), digest in zip(slices, manifest["tiles"]):
+            path = self._tiles_dir / digest[:2] / (digest + extension)
+            with open(path, "rb") as file:
+                target = frame[rows, cols]
+                target[...] = np.frombuffer(decompress(file.read()), dtype=frame.dtype).reshape(target.shape)
+        return frame
+
+    def close(self):
+        """close дожидается записи всех поставленных в очередь кадров"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,69 @@
+""" модуль версионированного набора запрещенных зон
+
+Хранилище зон нумерует каждое изменение (версия растет на 1), а компоненты
+получают только изменения: zone_added (version, zone_id, zone),
+zone_removed (version, zone_id) и zones_added (version, [zone_id], [zone])
+при загрузке каталога зон. Полный список зон (snapshot) передается только при начальной загрузке и при пропуске изменений (resync):
+получатель, увидевший разрыв версий, запрашивает его операцией zones_resync.
+"""
+from typing import Dict, List, Tuple
+
+from src.satellite_control_system.restricted_zone import RestrictedZone
+
+# операции передачи изменений набора зон
+ZONE_ADDED = "zone_added"
+ZONE_REMOVED = "zone_removed"
+ZONES_ADDED = "zones_added"
+ZONES_SNAPSHOT = "zones_snapshot"
+ZONES_RESYNC = "zones_resync"
+
+
+class VersionedZones:
+    """ копия набора зон у компонента-получателя изменений """
+
+    def __init__(self):
+        self.version = 0
+        self.zones: Dict[int, RestrictedZone] = {}
+
+    def __len__(self):
+        return len(self.zones)
+
+    def values(self) -> List[RestrictedZone]:
+        return list(self.zones.values())
+
+    def snapshot(self) -> Tuple[int, Dict[int, RestrictedZone]]:
+        """ полный набор зон для передачи: (версия, {zone_id: зона}) """
+        return self.version, dict(self.zones)
+
+    def load_snapshot(self, version: int, zones: Dict[int, RestrictedZone]):
+        """ замена набора зон полным списком """
+        self.version = version
+        self.zones = dict(zones)
+
+    def apply_delta(self, operation: str, parameters) -> bool:
+        """apply_delta применяет изменение zone_added, zones_added или zone_removed
+
+        Args:
+            operation (str): ZONE_ADDED, ZONES_ADDED или ZONE_REMOVED
+            parameters: параметры события изменения
+
+        Returns:
+            bool: False, если пропущены предыдущие изменения и нужен
+                полный список зон; устаревшие изменения игнорируются
+        """
+        version = parameters[0]
+        if version <= self.version:
+            return True
+        if version != self.version + 1:
+            return False
+        if operation == ZONE_ADDED:
+            _, zone_id, zone = parameters
+            self.zones[zone_id] = zone
+        elif operation == ZONES_ADDED:
+            _, zone_ids, zones = parameters
+            self.zones.update(zip(zone_ids, zones))
+        else:
+            _, zone_id = parameters
+            self.zones.pop(zone_id, None)
+        self.version = version
+        return True
@@ -0,0 +1,110 @@
+""" модуль пакетной проверки точек в запрещенных зонах
+
+Зоны хранятся четырьмя непрерывными массивами границ, а M точек
+проверяются сразу против N зон операциями NumPy над массивами M x N.
+Точки обрабатываются частями, чтобы ограничить объем временных массивов.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+# сколько сравнений точка-зона выполнять за одну векторную операцию
+DEFAULT_CHUNK_ELEMENTS = 1 << 20
+# номер зоны для точек вне всех зон
+NO_ZONE = -1
+
+
+class ZoneArrays:
+    """ границы зон в виде массивов для пакетной проверки точек """
+
+    def __init__(
+            self,
+            lat_bot_left: np.ndarray,
+            lon_bot_left: np.ndarray,
+            lat_top_right: np.ndarray,
+            lon_top_right: np.ndarray,
+            zone_ids: Optional[np.ndarray] = None,
+            chunk_elements: int = DEFAULT_CHUNK_ELEMENTS):
+        self.lat_bot_left = np.ascontiguousarray(lat_bot_left, dtype=float)
+        self.lon_bot_left = np.ascontiguousarray(lon_bot_left, dtype=float)
+        self.lat_top_right = np.ascontiguousarray(lat_top_right, dtype=float)
+        self.lon_top_right = np.ascontiguousarray(lon_top_right, dtype=float)
+        if zone_ids is None:
+            zone_ids = np.arange(len(self.lat_bot_left))
+        self.zone_ids = np.ascontiguousarray(zone_ids, dtype=np.int64)
+        self._chunk_elements = chunk_elements
+
+    @classmethod
+    def from_zones(cls, zones: Iterable, zone_ids: Optional[Iterable[int]] = None, **kwargs) -> "ZoneArrays":
+        """from_zones массивы границ по списку RestrictedZone
+
+        Args:
+            zones (Iterable): зоны
+            zone_ids (Optional[Iterable[int]]): идентификаторы зон,
+                по умолчанию - номера зон в списке
+
+        Returns:
+            ZoneArrays: массивы границ
+        """
+        bounds = np.array(
+            [(z.lat_bot_left, z.lon_bot_left, z.lat_top_right, z.lon_top_right) for z in zones],
+            dtype=float,
+        ).reshape(-1, 4)
+        return cls(*bounds.T, zone_ids=None if zone_ids is None else np.fromiter(zone_ids, np.int64),
+                   **kwargs)
+
+    def __len__(self):
+        return len(self.lat_bot_left)
+
+    def _chunks(self, lat, lon):
+        """ части точек и маски попадания в зоны (массивы точки x зоны) """
+        chunk = max(1, self._chunk_elements // len(self))
+        for start in range(0, len(lat), chunk):
+            la = lat[start:start + chunk, None]
+            lo = lon[start:start + chunk, None]
+            yield slice(start, start + chunk), (
+                (self.lat_bot_left <= la) & (la <= self.lat_top_right)
+                & (self.lon_bot_left <= lo) & (lo <= self.lon_top_right)
+            )
+
+    def count_points(self, lat, lon) -> np.ndarray:
+        """count_points число зон, содержащих каждую из M точек
+
+        Returns:
+            np.ndarray: массив int длины M
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        counts = np.zeros(len(lat), dtype=np.int64)
+        if not len(self) or not len(lat):
+            return counts
+        for part, inside in self._chunks(lat, lon):
+            counts[part] = inside.sum(axis=1)
+        return counts
+
+    def check_points(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        """check_points проверка M точек против всех зон
+
+        Args:
+            lat: широты точек (массив длины M или число)
+            lon: долготы точек
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: маска точек в зонах (bool, длина M)
+                и идентификатор первой (в порядке хранения) зоны, содержащей
+                точку, или NO_ZONE
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        mask = np.zeros(len(lat), dtype=bool)
+        first = np.full(len(lat), NO_ZONE, dtype=np.int64)
+        if not len(self) or not len(lat):
+            return mask, first
+
+        for part, inside in self._chunks(lat, lon):
+            # argmax дает первую зону с True, для строк без совпадений - 0
+            matched = inside.argmax(axis=1)
+            hit = inside[np.arange(len(matched)), matched]
+            mask[part] = hit
+            first[part] = np.where(hit, self.zone_ids[matched], NO_ZONE)
+        return mask, first
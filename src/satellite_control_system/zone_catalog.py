@@ -0,0 +1,92 @@
+""" модуль файлов каталога запрещенных зон
+
+Каталог - таблица из пяти столбцов: id, lat1, lon1, lat2, lon2
+(как в команде ADD ZONE). Поддерживаются текстовый формат CSV
+(разделитель - запятая или пробелы, строки с # - комментарии)
+и двоичный массив NumPy (.npy). Проверка строк выполняется сразу
+для всей таблицы.
+"""
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+CATALOG_COLUMNS = 5  # id, lat1, lon1, lat2, lon2
+
+
+def load_zone_catalog(path) -> np.ndarray:
+    """load_zone_catalog читает каталог зон из файла за один проход
+
+    Args:
+        path: путь к файлу .csv/.txt или .npy
+
+    Returns:
+        np.ndarray: массив N x 5 (float64)
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        table = np.load(path, allow_pickle=False)
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            sample = file.readline()
+        delimiter = "," if "," in sample else None
+        table = np.loadtxt(path, delimiter=delimiter, comments="#", dtype=float, ndmin=2)
+    return _as_catalog(table)
+
+
+def _as_catalog(table) -> np.ndarray:
+    table = np.asarray(table, dtype=float)
+    if table.size == 0:
+        return np.empty((0, CATALOG_COLUMNS))
+    if table.ndim != 2 or table.shape[1] != CATALOG_COLUMNS:
+        raise ValueError(
+            f"каталог зон должен содержать {CATALOG_COLUMNS} столбцов (id, lat1, lon1, lat2, lon2)")
+    return table
+
+
+def save_zone_catalog(path, table: np.ndarray):
+    """save_zone_catalog записывает каталог зон (формат по расширению файла)
+
+    Args:
+        path: путь к файлу .csv/.txt или .npy
+        table (np.ndarray): массив N x 5
+    """
+    path = Path(path)
+    table = _as_catalog(table)
+    if path.suffix == ".npy":
+        np.save(path, table, allow_pickle=False)
+    else:
+        np.savetxt(path, table, delimiter=",", fmt=["%d"] + ["%.17g"] * 4,
+                   header="id,lat1,lon1,lat2,lon2")
+
+
+def validate_zone_catalog(table: np.ndarray, existing_ids=()) -> Tuple[np.ndarray, np.ndarray]:
+    """validate_zone_catalog проверка всех строк каталога
+
+    Строка корректна, если все значения конечны, id - целое число,
+    первая точка ниже и левее второй (как в RestrictedZone), id не
+    повторяется в каталоге и не занят существующей зоной.
+
+    Args:
+        table (np.ndarray): массив N x 5
+        existing_ids: идентификаторы уже существующих зон
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: маска корректных строк и id зон (int64)
+    """
+    table = _as_catalog(table)
+    ids_column, lat1, lon1, lat2, lon2 = table.T
+    valid = np.isfinite(table).all(axis=1)
+    valid &= ids_column == np.round(ids_column)
+    valid &= (lat1 < lat2) & (lon1 < lon2)
+
+    zone_ids = np.where(valid, ids_column, -1).astype(np.int64)
+    # повтор id внутри каталога: корректна только первая строка с этим id
+    _, first_rows = np.unique(zone_ids, return_index=True)
+    unique = np.zeros(len(table), dtype=bool)
+    unique[first_rows] = True
+    valid &= unique
+    existing = np.fromiter(existing_ids, dtype=np.int64)
+    if len(existing):
+        valid &= ~np.isin(zone_ids, existing)
+    return valid, zone_ids
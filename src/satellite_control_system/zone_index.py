@@ -0,0 +1,139 @@
+""" модуль пространственного индекса запрещенных зон
+
+Зоны раскладываются по ячейкам равномерной сетки широта/долгота:
+каждая зона записывается во все ячейки, которые она пересекает.
+Проверка точки просматривает только зоны своей ячейки, поэтому время
+проверки почти не зависит от общего числа зон. Отдельные зоны можно
+добавлять и удалять без перестроения индекса; когда число зон удваивается
+по сравнению с последним выбором размера ячейки, сетка перестраивается
+(добавление по одной зоне обходится в среднем O(1) на зону).
+"""
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# площадь карты в квадратных градусах, по ней выбирается размер ячейки
+_MAP_AREA = 180.0 * 360.0
+_MIN_CELL_DEG = 0.05
+_MAX_CELL_DEG = 90.0
+
+_Entry = Tuple[float, float, float, float, int]
+
+
+class ZoneGridIndex:
+    """ индекс зон на равномерной сетке, размер ячейки выбирается
+    по набору зон при построении """
+
+    def __init__(self, zones: Iterable = (), zone_ids: Optional[Iterable[int]] = None):
+        """
+        Args:
+            zones (Iterable): RestrictedZone (или объекты с теми же полями)
+            zone_ids (Optional[Iterable[int]]): идентификаторы зон,
+                по умолчанию - номера зон в списке
+        """
+        zones = list(zones)
+        zone_ids = range(len(zones)) if zone_ids is None else list(zone_ids)
+        self._cells: Dict[Tuple[int, int], List[_Entry]] = {}
+        # ячейки каждой зоны, для удаления
+        self._zone_cells: Dict[int, List[Tuple[int, int]]] = {}
+        # границы зон в порядке добавления, для перестроения сетки
+        self._bounds: Dict[int, List[float]] = {}
+        self._cell_deg = _MAX_CELL_DEG
+        # число зон при последнем выборе размера ячейки
+        self._grid_zones = 0
+        if zones:
+            self._build(zones, zone_ids)
+
+    def __len__(self):
+        return len(self._zone_cells)
+
+    def _build(self, zones: List, zone_ids: Iterable[int]):
+        bounds = np.array(
+            [(z.lat_bot_left, z.lon_bot_left, z.lat_top_right, z.lon_top_right) for z in zones],
+            dtype=float,
+        )
+        # ячейка порядка размера типичной зоны, но не мельче, чем нужно,
+        # чтобы в среднем приходилось около одной зоны на ячейку
+        self._choose_cell(bounds)
+        for zone_id, entry in zip(zone_ids, bounds.tolist()):
+            self._insert(zone_id, entry)
+
+    def _choose_cell(self, bounds: np.ndarray):
+        extent = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+        cell = max(float(np.median(extent)), math.sqrt(_MAP_AREA / len(bounds)))
+        self._cell_deg = min(max(cell, _MIN_CELL_DEG), _MAX_CELL_DEG)
+        self._grid_zones = len(bounds)
+
+    def _regrid(self):
+        """ перестроение сетки по текущим зонам (порядок зон сохраняется) """
+        entries = list(self._bounds.items())
+        self._cells = {}
+        self._zone_cells = {}
+        self._bounds = {}
+        self._choose_cell(np.array([entry for _, entry in entries], dtype=float))
+        for zone_id, entry in entries:
+            self._insert(zone_id, entry)
+
+    def _insert(self, zone_id: int, entry: List[float]):
+        lat_min, lon_min, lat_max, lon_max = entry
+        item = (lat_min, lon_min, lat_max, lon_max, zone_id)
+        keys = [
+            (row, col)
+            for row in range(math.floor(lat_min / self._cell_deg), math.floor(lat_max / self._cell_deg) + 1)
+            for col in range(math.floor(lon_min / self._cell_deg), math.floor(lon_max / self._cell_deg) + 1)
+        ]
+        cells = self._cells
+        for key in keys:
+            cells.setdefault(key, []).append(item)
+        self._zone_cells[zone_id] = keys
+        self._bounds[zone_id] = entry
+
+    def add(self, zone_id: int, zone):
+        """add добавляет зону (зона с тем же идентификатором заменяется)"""
+        if zone_id in self._zone_cells:
+            self.remove(zone_id)
+        self._insert(zone_id, [zone.lat_bot_left, zone.lon_bot_left, zone.lat_top_right, zone.lon_top_right])
+        if len(self._zone_cells) >= 2 * self._grid_zones:
+            self._regrid()
+
+    def remove(self, zone_id: int):
+        """remove удаляет зону, если она есть в индексе"""
+        self._bounds.pop(zone_id, None)
+        for key in self._zone_cells.pop(zone_id, ()):
+            entries = self._cells[key]
+            entries[:] = [entry for entry in entries if entry[4] != zone_id]
+            if not entries:
+                del self._cells[key]
+
+    def find(self, lat: float, lon: float) -> Optional[int]:
+        """find идентификатор первой (в порядке добавления) зоны, содержащей точку
+
+        Args:
+            lat (float): широта
+            lon (float): долгота
+
+        Returns:
+            Optional[int]: идентификатор зоны или None, если точка вне зон
+                (или координаты не конечны)
+        """
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return None
+        candidates = self._cells.get(
+            (math.floor(lat / self._cell_deg), math.floor(lon / self._cell_deg)))
+        if not candidates:
+            return None
+        for lat_min, lon_min, lat_max, lon_max, zone_id in candidates:
+            if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
+                return zone_id
+        return None
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """contains находится ли точка хотя бы в одной зоне
+
+        Точка с неконечными координатами (NaN, inf) считается находящейся
+        в запрещенной зоне: ее положение проверить нельзя.
+        """
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return True
+        return self.find(lat, lon) is not None
@@ -0,0 +1,65 @@
+""" модуль подложки для синтетических снимков камеры
+
+Подложка - изображение всей поверхности в равнопромежуточной проекции
+(строки - широта от 90 до -90, столбцы - долгота от -180 до 180).
+Если файл подложки не задан, она генерируется: сумма гармоник по широте
+и долготе, окрашенная как "вода" и "суша". Кадр - участок подложки
+вокруг подспутниковой точки, пересчитанный к размеру кадра выборкой
+ближайших пикселей прямо в выходной массив (например, в ячейку пула кадров).
+"""
+from typing import Optional
+
+import numpy as np
+
+_WATER = np.array([20, 60, 140], dtype=np.float32)
+_LAND = np.array([90, 140, 60], dtype=np.float32)
+_SNOW = np.array([235, 235, 240], dtype=np.float32)
+
+
+def make_basemap(height: int = 1024, width: int = 2048, seed: int = 0) -> np.ndarray:
+    """make_basemap синтетическая подложка (height x width x 3, uint8)"""
+    rng = np.random.default_rng(seed)
+    lat = np.linspace(np.pi / 2, -np.pi / 2, height, dtype=np.float32)[:, None]
+    lon = np.linspace(-np.pi, np.pi, width, endpoint=False, dtype=np.float32)[None, :]
+    relief = np.zeros((height, width), dtype=np.float32)
+    for harmonic in range(1, 9):
+        phase_lat, phase_lon = rng.uniform(0, 2 * np.pi, 2)
+        relief += (np.sin(harmonic * lat * 2 + phase_lat) * np.cos(harmonic * lon + phase_lon)) / harmonic
+    land = np.clip((relief - 0.1) * 4, 0, 1)[..., None]
+    snow = np.clip((np.abs(lat) - 1.2) * 3, 0, 1)[..., None]
+    colors = _WATER * (1 - land) + _LAND * land
+    colors = colors * (1 - snow) + _SNOW * snow
+    return colors.astype(np.uint8)
+
+
+def load_basemap(path: Optional[str]) -> np.ndarray:
+    """load_basemap подложка из файла изображения (None - синтетическая)"""
+    if path is None:
+        return make_basemap()
+    from PIL import Image
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def render_frame(basemap: np.ndarray, lat: float, lon: float, fov_deg: float, out: np.ndarray):
+    """render_frame записывает в out участок подложки fov_deg x fov_deg градусов
+    с центром в точке (lat, lon)
+
+    Args:
+        basemap (np.ndarray): подложка H x W x 3
+        lat (float): широта центра кадра
+        lon (float): долгота центра кадра
+        fov_deg (float): поле зрения камеры, градусы
+        out (np.ndarray): кадр h x w x 3 того же типа, что подложка
+    """
+    map_height, map_width = basemap.shape[:2]
+    frame_height, frame_width = out.shape[:2]
+    half = fov_deg / 2
+    lats = np.linspace(lat + half, lat - half, frame_height)
+    lons = np.linspace(lon - half, lon + half, frame_width)
+    rows = np.clip(((90.0 - lats) / 180.0 * map_height).astype(np.intp), 0, map_height - 1)
+    # по долготе кадр продолжается через линию перемены дат
+    cols = ((lons + 180.0) / 360.0 * map_width).astype(np.intp) % map_width
+    pixels = basemap.reshape(map_height * map_width, -1)
+    np.take(pixels, rows[:, None] * map_width + cols[None, :], axis=0,
+            out=out.reshape(frame_height, frame_width, -1))
@@ -1,37 +1,67 @@
 from multiprocessing import Queue, Process
 from queue import Empty
+from typing import Optional
 
 from src.system.custom_process import BaseCustomProcess
 from src.system.queues_dir import QueuesDirectory
 from src.system.event_types import Event, ControlEvent
+from src.system.frame_pool import FramePool
 from src.system.config import CRITICALITY_STR, LOG_DEBUG, \
     LOG_ERROR, LOG_INFO, DEFAULT_LOG_LEVEL, \
-    CAMERA_QUEUE_NAME, SATELITE_QUEUE_NAME, ORBIT_DRAWER_QUEUE_NAME, OPTICS_CONTROL_QUEUE_NAME
+    CAMERA_QUEUE_NAME, SATELITE_QUEUE_NAME, ORBIT_DRAWER_QUEUE_NAME, OPTICS_CONTROL_QUEUE_NAME, \
+    CAMERA_FOV_DEG, CAMERA_BASEMAP_FILE
+from src.satellite_simulator.basemap import load_basemap, render_frame
 
 
 class Camera(BaseCustomProcess):
-    """Симулятор камеры"""
+    """Симулятор камеры
+
+    Если задан пул кадров, камера создает синтетический кадр (участок
+    подложки вокруг подспутниковой точки) в ячейке пула и передает
+    с координатами снимка только описатель кадра
+    """
     log_prefix = "[CAMERA]"
     event_source_name = CAMERA_QUEUE_NAME
     events_q_name = event_source_name
 
     def __init__(self,
                  queues_dir: QueuesDirectory,
-                 log_level: int):
+                 log_level: int,
+                 frame_pool: Optional[FramePool] = None,
+                 fov_deg: float = CAMERA_FOV_DEG,
+                 basemap_file: Optional[str] = CAMERA_BASEMAP_FILE):
         super().__init__(
             log_prefix=Camera.log_prefix,
             queues_dir=queues_dir,
             events_q_name=Camera.events_q_name,
             event_source_name=Camera.event_source_name,
             log_level=log_level)
+        self._frame_pool = frame_pool
+        self._fov_deg = fov_deg
+        self._basemap_file = basemap_file
+        # подложка загружается в процессе камеры (run)
+        self._basemap = None
         self._log_message(LOG_INFO, "симулятор камеры создан")
 
+    def _take_frame(self, lat, lon):
+        """ кадр снимка в пуле кадров, None - без кадра """
+        if self._frame_pool is None:
+            return None
+        handle = self._frame_pool.acquire()
+        if handle is None:
+            self._log_message(LOG_ERROR, "нет свободных ячеек в пуле кадров, снимок без кадра")
+            return None
+        if self._basemap is None:
+            self._basemap = load_basemap(self._basemap_file)
+        render_frame(self._basemap, lat, lon, self._fov_deg, self._frame_pool.frame(handle))
+        return handle
+
     def _check_control_q(self):
         """ Проверка наличия управляющий команд  """
         try:
             request: ControlEvent = self._control_q.get_nowait()
             self._log_message(
-                LOG_DEBUG, f"проверяем запрос {request}")
+                LOG_DEBUG, "проверяем запрос %s", request)
             if not isinstance(request, ControlEvent):
                 return
             if request.operation == 'stop':
@@ -44,7 +74,7 @@ class Camera(BaseCustomProcess):
         """ Проверка наличия команд """
         while True:
             try:
-                event: Event = self._events_q.get_nowait()
+                event: Event = self._get_event()
 
                 if not isinstance(event, Event):
                     return
@@ -62,18 +92,20 @@ class Camera(BaseCustomProcess):
                     case 'camera_update':
                         q: Queue = self._queues_dir.get_queue(OPTICS_CONTROL_QUEUE_NAME)
                         lat, lon = event.parameters
+                        frame = self._take_frame(lat, lon)
                         q.put(
                             Event(
                                 source=self._event_source_name, 
                                 destination=OPTICS_CONTROL_QUEUE_NAME, 
                                 operation='post_photo', 
-                                parameters=(lat, lon)))
-                        self._log_message(LOG_DEBUG, f"создаем снимок ({lat}, {lon})")
+                                parameters=(lat, lon) if frame is None else (lat, lon, frame)))
+                        self._log_message(LOG_DEBUG, "создаем снимок (%s, %s)", lat, lon)
             except Empty:
                 break
 
     def run(self):
         while self._quit is False:
+            self._wait_for_events()
             self._check_events_q()
             self._check_control_q()
     
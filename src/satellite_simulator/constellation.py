@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.satellite_simulator.satellite import G, EARTH_MASS, EARTH_RADIUS
+
+GM = G * EARTH_MASS
+
+
+def circular_orbit_state(radius, raan, position_angle, inclination):
+    """ Позиции и скорости (массивы N x 3) на круговых орбитах.
+        Параметры - скаляры или массивы одинаковой длины """
+    radius, raan, position_angle, inclination = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float))
+          for value in (radius, raan, position_angle, inclination)))
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+    cos_angle, sin_angle = np.cos(position_angle), np.sin(position_angle)
+    cos_incl, sin_incl = np.cos(inclination), np.sin(inclination)
+
+    positions = radius[:, None] * np.stack([
+        cos_raan * cos_angle - sin_raan * sin_angle * cos_incl,
+        sin_raan * cos_angle + cos_raan * sin_angle * cos_incl,
+        sin_angle * sin_incl], axis=1)
+    orbital_speed = np.sqrt(GM / radius)
+    velocities = orbital_speed[:, None] * np.stack([
+        -(cos_raan * sin_angle + sin_raan * cos_angle * cos_incl),
+        -sin_raan * sin_angle + cos_raan * cos_angle * cos_incl,
+        cos_angle * sin_incl], axis=1)
+    return positions, velocities
+
+
+class Constellation:
+    """ Группировка спутников: состояние N спутников хранится в непрерывных
+        массивах N x 3 и пересчитывается одним векторизованным шагом """
+
+    def __init__(self, altitudes, position_angles, inclinations, raans):
+        positions, velocities = circular_orbit_state(
+            EARTH_RADIUS + np.asarray(altitudes, dtype=float),
+            raans,
+            position_angles,
+            inclinations)
+        self._positions = np.ascontiguousarray(positions)
+        self._velocities = np.ascontiguousarray(velocities)
+        self._acceleration = self._compute_acceleration(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    @property
+    def positions(self):
+        return self._positions
+
+    @property
+    def velocities(self):
+        return self._velocities
+
+    @staticmethod
+    def _compute_acceleration(positions):
+        """ Ускорение свободного падения для всех спутников """
+        r_squared = np.einsum("ij,ij->i", positions, positions)
+        return positions * (-GM / (r_squared * np.sqrt(r_squared)))[:, None]
+
+    def step(self, dt: float):
+        """ Шаг интегрирования Velocity Verlet для всех спутников.
+            Ускорение с конца шага переиспользуется на следующем шаге """
+        self._positions += self._velocities * dt + 0.5 * self._acceleration * dt**2
+        new_acceleration = self._compute_acceleration(self._positions)
+        self._velocities += 0.5 * (self._acceleration + new_acceleration) * dt
+        self._acceleration = new_acceleration
+
+    def get_earth_coordinates(self):
+        """ Координаты (lat, lon в градусах, массивы длины N), на которые
+            смотрят камеры спутников, направленные в центр земли """
+        x, y, z = self._positions.T
+        lat = np.degrees(np.arctan2(z, np.hypot(x, y)))
+        lon = np.degrees(np.arctan2(y, x))
+        return lat, lon
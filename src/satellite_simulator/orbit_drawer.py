@@ -3,6 +3,7 @@ import urllib.request
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
 
 
 
@@ -52,6 +53,12 @@ class OrbitDrawer(BaseCustomProcess):
         self._ax.imshow(world_map, extent=[-180, 180, -90, 90])
         self._trajectory, =  self._ax.plot([], [], 'ro-', markersize=7, linewidth=5)
 
+        # Прогноз трассы спутника, запрашивается раз в _track_request_frames кадров
+        self._track_request_frames = 25
+        self._track_minutes = 100
+        self._track_resolution_sec = 30
+        self._predicted_track, = self._ax.plot([], [], 'r--', linewidth=1, alpha=0.7)
+
         self._camera_coords = []
         self._photos, = self._ax.plot([], [], marker='*', markersize=15, linestyle='None', c='yellow')
 
@@ -63,7 +70,7 @@ class OrbitDrawer(BaseCustomProcess):
     def _check_events_q(self):
         while True:
             try:
-                event: Event = self._events_q.get_nowait()
+                event: Event = self._get_event()
 
                 if not isinstance(event, Event):
                     return
@@ -75,9 +82,14 @@ class OrbitDrawer(BaseCustomProcess):
                     case 'update_photo_map':
                         lat, lon = event.parameters
                         self._append_photos(lat, lon)
+                    case 'ground_track':
+                        _, lat, lon = event.parameters
+                        self._set_predicted_track(lat, lon)
                     case 'draw_restricted_zone':
                         zone : RestrictedZone = event.parameters
                         self._append_restricted_zones(zone)
+                    case 'draw_restricted_zones':
+                        self._append_restricted_zones_collection(event.parameters)
 
             except Empty:
                 break
@@ -91,6 +103,13 @@ class OrbitDrawer(BaseCustomProcess):
         self._trajectory.set_data(lons, lats)
 
 
+    def _set_predicted_track(self, lat, lon):
+        # разрыв линии при переходе через 180-й меридиан
+        breaks = np.flatnonzero(np.abs(np.diff(lon)) > 180) + 1
+        self._predicted_track.set_data(
+            np.insert(lon, breaks, np.nan), np.insert(lat, breaks, np.nan))
+
+
     def _append_photos(self, lat, lon):
         self._camera_coords.append((lon, lat))
         lons, lats = zip(*self._camera_coords)
@@ -114,10 +133,27 @@ class OrbitDrawer(BaseCustomProcess):
         self._fig.canvas.draw_idle()  # Update canvas
 
 
+    def _append_restricted_zones_collection(self, zones):
+        # каталог зон рисуется одним объектом, а не отдельным патчем на зону
+        rects = [
+            Rectangle(
+                (zone.lon_bot_left, zone.lat_bot_left),
+                zone.lon_top_right - zone.lon_bot_left,
+                zone.lat_top_right - zone.lat_bot_left)
+            for zone in zones
+        ]
+        collection = PatchCollection(
+            rects, linewidth=1, edgecolor='darkred', facecolor='red', alpha=0.3)
+        self._ax.add_collection(collection)
+        self._restricted_zone_patches.append(collection)
+        self._fig.canvas.draw_idle()
+
+
     def run(self):
         def init():
             self._trajectory.set_data([], [])
             self._photos.set_data([], [])
+            self._predicted_track.set_data([], [])
             # self._restricted_zones.set_data([], [])
             return self._trajectory, self._photos
 
@@ -132,6 +168,15 @@ class OrbitDrawer(BaseCustomProcess):
                     parameters=None
                 )
             )
+            if frame % self._track_request_frames == 0:
+                q.put(
+                    Event(
+                        source=self._event_source_name,
+                        destination=SATELITE_QUEUE_NAME,
+                        operation="predict_ground_track",
+                        parameters=(self._track_minutes, self._track_resolution_sec)
+                    )
+                )
             return self._trajectory, self._photos
         
         self._ani = animation.FuncAnimation(self._fig, update,  init_func=init, blit=False, interval=200, cache_frame_data=False,)
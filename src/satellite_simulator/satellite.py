@@ -1,8 +1,10 @@
 import numpy as np
 
+from collections import deque
 from multiprocessing import Queue, Process
 from queue import Empty
-from time import sleep
+from time import monotonic
+from typing import Optional
 
 from src.system.custom_process import BaseCustomProcess
 from src.system.queues_dir import QueuesDirectory
@@ -24,6 +26,11 @@ class Satellite(BaseCustomProcess):
     events_q_name = event_source_name
     orbit_change_coef = 1 / 10e5
 
+    # Способы расчета движения: численное интегрирование (Velocity Verlet)
+    # или аналитическое решение для круговой орбиты
+    PROPAGATION_NUMERIC = "numeric"
+    PROPAGATION_ANALYTIC = "analytic"
+
     def __init__(
         self,
         altitude: float,
@@ -31,7 +38,9 @@ class Satellite(BaseCustomProcess):
         inclination: float,
         raan: float,
         queues_dir: QueuesDirectory,
-        log_level: int = DEFAULT_LOG_LEVEL
+        log_level: int = DEFAULT_LOG_LEVEL,
+        time_warp: Optional[float] = None,
+        propagation_mode: str = PROPAGATION_NUMERIC
     ):
         super().__init__(
             log_prefix=Satellite.log_prefix,
@@ -40,11 +49,17 @@ class Satellite(BaseCustomProcess):
             event_source_name=Satellite.event_source_name,
             log_level=log_level)
 
+        if propagation_mode not in (self.PROPAGATION_NUMERIC, self.PROPAGATION_ANALYTIC):
+            raise ValueError(f"неизвестный способ расчета движения: {propagation_mode}")
+        self._propagation_mode = propagation_mode
+
         self._altitude = altitude
         self._radius = EARTH_RADIUS + altitude
         self._inclination = inclination
         self._raan = raan
         self._position_angle = position_angle
+        # Время симуляции, к которому относится _position_angle
+        self._orbit_epoch = 0.0
         
         #  Расчет начальной позиции
         self._position = self._compute_position(
@@ -60,8 +75,29 @@ class Satellite(BaseCustomProcess):
             self._position_angle, 
             self._inclination)
         
+        # Запрошенные переходы на новые орбиты (высота, наклонение, RAAN)
+        # и момент завершения текущего перехода (monotonic), None - перехода нет
+        self._orbit_transfers = deque()
+        self._orbit_transfer_end = None
+
         self._recalc_interval_sec = 0.1 # Время пересчета координат (сек.)
         self._time_speed_sec = 30 # Время пересчета координат (сек.), время прошедшее для спутника
+
+        # Ускорение времени: сколько секунд симуляции проходит за секунду
+        # реального времени (по умолчанию один шаг за интервал пересчета)
+        self._time_warp = time_warp or self._time_speed_sec / self._recalc_interval_sec
+        # Максимум шагов за один проход цикла при отставании от реального времени,
+        # отставание сверх этого отбрасывается и учитывается в _dropped_sim_time
+        self._max_substeps = 10
+        self._sim_time = 0.0           # прошедшее время симуляции (сек.)
+        self._sim_time_debt = 0.0      # время симуляции, которое еще нужно рассчитать
+        self._dropped_sim_time = 0.0   # отброшенное время симуляции
+        self._last_tick = None
+        # Метрики планировщика: шагов в секунду и отставание от реального времени
+        self._metrics_interval_sec = 5.0
+        self._metrics_window_start = None
+        self._metrics_window_steps = 0
+        self._steps_per_sec = 0.0
         self._log_message(LOG_INFO, f"симулятор создан")
 
 
@@ -95,6 +131,90 @@ class Satellite(BaseCustomProcess):
         ])
     
 
+    def _orbit_plane_basis(self, raan: float, inclination: float):
+        """ Ортонормированный базис (p, q) плоскости орбиты (матрица 2x3):
+            позиция на орбите = radius * (cos(angle) * p + sin(angle) * q) """
+        cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+        cos_incl, sin_incl = np.cos(inclination), np.sin(inclination)
+        return np.array([
+            [cos_raan, sin_raan, 0.0],
+            [-sin_raan * cos_incl, cos_raan * cos_incl, sin_incl]])
+
+
+    def _closest_point_on_orbit(
+            self,
+            radius: float,
+            raan: float,
+            inclination: float):
+        """ Ближайшая к текущей позиции точка орбиты: (угол, позиция, расстояние) """
+        # Орбита - окружность radius * (cos(a) * p + sin(a) * q) с ортонормированным
+        # базисом (p, q) в плоскости орбиты, поэтому ближайшая точка лежит
+        # на проекции текущей позиции на эту плоскость: a = atan2(x·q, x·p)
+        basis = self._orbit_plane_basis(raan, inclination)
+        along_p, along_q = basis @ self._position
+        angle = np.mod(np.arctan2(along_q, along_p), 2 * np.pi)
+        position = self._compute_position(radius, raan, angle, inclination)
+        return angle, position, np.linalg.norm(position - self._position)
+
+
+    def _mean_motion(self) -> float:
+        """ Угловая скорость движения по круговой орбите (рад/сек.) """
+        return np.sqrt(G * EARTH_MASS / self._radius**3)
+
+
+    def _orbit_angle_at(self, sim_time):
+        """ Угол спутника на текущей орбите в момент времени симуляции sim_time """
+        return self._position_angle + self._mean_motion() * (np.asarray(sim_time) - self._orbit_epoch)
+
+
+    def position_at(self, sim_time):
+        """ Позиция спутника на текущей орбите в момент времени симуляции sim_time
+            (сек.), вычисленная без пошагового расчета. Для массива моментов
+            времени возвращается массив позиций N x 3.
+            Переходы между орбитами, запрошенные позже, не учитываются """
+        angle = self._orbit_angle_at(sim_time)
+        basis = self._orbit_plane_basis(self._raan, self._inclination)
+        return self._radius * (np.multiply.outer(np.cos(angle), basis[0])
+                               + np.multiply.outer(np.sin(angle), basis[1]))
+
+
+    def velocity_at(self, sim_time):
+        """ Скорость спутника на текущей орбите в момент времени симуляции sim_time """
+        angle = self._orbit_angle_at(sim_time)
+        basis = self._orbit_plane_basis(self._raan, self._inclination)
+        orbital_speed = np.sqrt(G * EARTH_MASS / self._radius)
+        return orbital_speed * (np.multiply.outer(-np.sin(angle), basis[0])
+                                + np.multiply.outer(np.cos(angle), basis[1]))
+
+
+    def _start_orbit_transfer(self):
+        """ Начало перехода на первую из запрошенных орбит """
+        new_altitude, new_inclination, new_raan = self._orbit_transfers[0]
+        _, _, distance = self._closest_point_on_orbit(
+            EARTH_RADIUS + new_altitude, new_raan, new_inclination)
+        time_spent = distance * self.orbit_change_coef
+        self._orbit_transfer_end = monotonic() + time_spent
+        self._log_message(LOG_DEBUG, "начат переход на новую орбиту, переход займет %s сек.", time_spent)
+
+
+    def _advance_orbit_transfer(self):
+        """ Продвижение перехода между орбитами, вызывается в основном цикле.
+            Спутник продолжает движение и отвечает на запросы во время перехода,
+            новая орбита применяется по истечении времени перехода """
+        if self._orbit_transfer_end is None:
+            if self._orbit_transfers:
+                self._start_orbit_transfer()
+            return
+        if monotonic() < self._orbit_transfer_end:
+            return
+
+        self._change_orbit(*self._orbit_transfers.popleft())
+        self._log_message(LOG_DEBUG, "произошел переход на новую орбиту")
+        self._orbit_transfer_end = None
+        if self._orbit_transfers:
+            self._start_orbit_transfer()
+
+
     def _change_orbit(
             self, 
             new_altitude: float, 
@@ -104,15 +224,8 @@ class Satellite(BaseCustomProcess):
             Новая позиция спутника -- ближайшая точка на новой орбите"""
 
         new_radius = EARTH_RADIUS + new_altitude
-        current_pos = self._position
-
-        # Поиск ближайшей позиции на новой траектории
-        angles = np.linspace(0, 2 * np.pi, 360)
-        positions = np.array([self._compute_position(new_radius, new_raan, a, new_inclination) for a in angles])
-        distances = np.linalg.norm(positions - current_pos, axis=1)
-        best_idx = np.argmin(distances)
-        best_angle = angles[best_idx]
-        closest_position = positions[best_idx]
+        best_angle, closest_position, distance = self._closest_point_on_orbit(
+            new_radius, new_raan, new_inclination)
 
         # Расчет новой скорости
         new_velocity = self._compute_velocity(new_radius, new_raan, best_angle, new_inclination)
@@ -123,11 +236,12 @@ class Satellite(BaseCustomProcess):
         self._raan = new_raan
         self._inclination = new_inclination
         self._position_angle = best_angle
+        self._orbit_epoch = self._sim_time
         self._position = closest_position
         self._velocity = new_velocity
         self._log_message(LOG_INFO, f"орбита изменена: alt={new_altitude}, RAAN={new_raan}, incl={new_inclination}")
         
-        return distances[best_idx]
+        return distance
 
 
     def _update_position(self, dt):
@@ -142,6 +256,12 @@ class Satellite(BaseCustomProcess):
         self._velocity += 0.5 * (acceleration + new_acceleration) * dt
 
 
+    def _set_analytic_position(self, sim_time: float):
+        """ Позиция и скорость спутника в момент sim_time по аналитическому решению """
+        self._position = self.position_at(sim_time)
+        self._velocity = self.velocity_at(sim_time)
+
+
     def get_earth_coordinates(self):
         """ Координаты, на которые смотрит камера спутника, направленная в центр земли """
         lat = np.degrees(np.arcsin(self._position[2] / np.linalg.norm(self._position)))
@@ -149,11 +269,25 @@ class Satellite(BaseCustomProcess):
         return lat, lon
 
 
+    def predict_ground_track(self, minutes: float, resolution_sec: float):
+        """ Трасса спутника на следующие minutes минут с шагом resolution_sec:
+            моменты времени симуляции и массивы координат (lat, lon),
+            на которые будет смотреть камера. Считается одним вызовом
+            по аналитическому решению для текущей орбиты """
+        if minutes <= 0 or resolution_sec <= 0:
+            raise ValueError("длительность и шаг прогноза должны быть положительными")
+        times = self._sim_time + np.arange(0.0, minutes * 60 + resolution_sec / 2, resolution_sec)
+        x, y, z = self.position_at(times).T
+        lat = np.degrees(np.arctan2(z, np.hypot(x, y)))
+        lon = np.degrees(np.arctan2(y, x))
+        return times, lat, lon
+
+
     def _check_events_q(self):
         """ Проверка наличия команд """
         while True:
             try:
-                event: Event = self._events_q.get_nowait()
+                event: Event = self._get_event()
 
                 if not isinstance(event, Event):
                     return
@@ -169,11 +303,41 @@ class Satellite(BaseCustomProcess):
                                 operation='update_orbit_data', 
                                 parameters=(lat, lon)))
                     case 'change_orbit':
-                        new_altitude, new_inclination, new_raan = event.parameters
-                        distance = self._change_orbit(new_altitude, new_inclination, new_raan)
-                        time_spent = distance * self.orbit_change_coef
-                        sleep(time_spent) # переходим к новой орбите
-                        self._log_message(LOG_DEBUG, f"произошел переход на новую орбиту, переход занял {time_spent} сек.")
+                        # переход выполняется в основном цикле, без остановки симуляции
+                        self._orbit_transfers.append(tuple(event.parameters))
+                        self._advance_orbit_transfer()
+                    case 'predict_ground_track':
+                        # ответ отправляется в очередь запросившего компонента
+                        try:
+                            minutes, resolution_sec = event.parameters
+                            times, lat, lon = self.predict_ground_track(minutes, resolution_sec)
+                        except (TypeError, ValueError) as e:
+                            self._log_message(LOG_ERROR, "неверный запрос прогноза трассы: %s", e)
+                            continue
+                        q: Queue = self._queues_dir.get_queue(event.source)
+                        if q is None:
+                            continue
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=event.source,
+                                operation='ground_track',
+                                parameters=(times, lat, lon),
+                                # для пересчета времени симуляции в реальное
+                                extra_parameters={"time_warp": self._time_warp}))
+                        self._log_message(
+                            LOG_DEBUG, "отправлен прогноз трассы: %s точек для %s", len(times), event.source)
+                    case 'get_propagation_metrics':
+                        # ответ отправляется в очередь запросившего компонента
+                        q: Queue = self._queues_dir.get_queue(event.source)
+                        if q is None:
+                            continue
+                        q.put(
+                            Event(
+                                source=self.event_source_name,
+                                destination=event.source,
+                                operation='propagation_metrics',
+                                parameters=self.get_propagation_metrics()))
                     case 'post_camera_coords':
                         lat, lon = self.get_earth_coordinates()
                         request = Event(
@@ -190,14 +354,75 @@ class Satellite(BaseCustomProcess):
 
 
 
+    def _advance_simulation(self):
+        """ Продвижение симуляции до текущего момента реального времени
+            шагами фиксированной длины _time_speed_sec """
+        now = monotonic()
+        if self._last_tick is None:
+            self._last_tick = self._metrics_window_start = now
+        self._sim_time_debt += (now - self._last_tick) * self._time_warp
+        self._last_tick = now
+
+        steps = 0
+        if self._propagation_mode == self.PROPAGATION_ANALYTIC:
+            # позиция в любой момент считается сразу, отставание не накапливается
+            steps = int(self._sim_time_debt // self._time_speed_sec)
+            if steps:
+                self._sim_time += steps * self._time_speed_sec
+                self._sim_time_debt -= steps * self._time_speed_sec
+                self._set_analytic_position(self._sim_time)
+        while self._sim_time_debt >= self._time_speed_sec and steps < self._max_substeps:
+            self._update_position(self._time_speed_sec)
+            self._sim_time += self._time_speed_sec
+            self._sim_time_debt -= self._time_speed_sec
+            steps += 1
+
+        if self._sim_time_debt >= self._time_speed_sec:
+            # не успеваем за реальным временем, отбрасываем целые шаги
+            dropped = self._sim_time_debt - self._sim_time_debt % self._time_speed_sec
+            self._dropped_sim_time += dropped
+            self._sim_time_debt -= dropped
+
+        self._metrics_window_steps += steps
+        elapsed = now - self._metrics_window_start
+        if elapsed >= self._metrics_interval_sec:
+            self._steps_per_sec = self._metrics_window_steps / elapsed
+            self._metrics_window_steps = 0
+            self._metrics_window_start = now
+            self._log_message(LOG_DEBUG, lambda: f"метрики симуляции: {self.get_propagation_metrics()}")
+
+
+    def _time_to_next_step(self) -> float:
+        """ Реальное время (сек.) до следующего шага симуляции """
+        return max(0.0, (self._time_speed_sec - self._sim_time_debt) / self._time_warp)
+
+
+    def get_propagation_metrics(self) -> dict:
+        """ Метрики планировщика симуляции """
+        return {
+            "sim_time_sec": self._sim_time,
+            "time_warp": self._time_warp,
+            "propagation_mode": self._propagation_mode,
+            "steps_per_sec": self._steps_per_sec,
+            "target_steps_per_sec": self._time_warp / self._time_speed_sec,
+            # отставание от реального времени, пересчитанное в реальные секунды
+            "lag_sec": self._sim_time_debt / self._time_warp,
+            "dropped_sim_time_sec": self._dropped_sim_time,
+        }
+
+
     def run(self):
         self._log_message(LOG_INFO, f"старт симуляции спутника")
 
         while self._quit is False:
-            self._update_position(self._time_speed_sec)
+            self._advance_simulation()
+            self._advance_orbit_transfer()
             self._check_events_q() # Вызываем метод базового класса для контроля управляющий команд
             self._check_control_q()
-            # self._log_message(LOG_DEBUG, f"позиция спутника {self._position}")            
-            
 
-            sleep(self._recalc_interval_sec)
\ No newline at end of file
+            # ждем следующего шага или завершения перехода между орбитами,
+            # просыпаясь раньше при поступлении запросов
+            timeout = self._time_to_next_step()
+            if self._orbit_transfer_end is not None:
+                timeout = min(timeout, max(0.0, self._orbit_transfer_end - monotonic()))
+            self._wait_for_events(timeout)
\ No newline at end of file
@@ -0,0 +1,43 @@
+""" модуль пакетной передачи событий """
+from multiprocessing import Queue
+from queue import Empty
+from typing import List
+
+from src.system.event_types import Event, EventBatch
+
+
+def put_batch(q: Queue, events: List[Event]):
+    """put_batch отправляет несколько событий одной записью в очередь
+
+    Args:
+        q (Queue): очередь получателя (или монитора безопасности)
+        events (List[Event]): события в порядке доставки
+    """
+    if len(events) == 1:
+        q.put(events[0])
+    elif events:
+        q.put(EventBatch(events=list(events)))
+
+
+def get_batch(q: Queue, max_items: int) -> List[Event]:
+    """get_batch забирает из очереди без ожидания до max_items сообщений,
+    раскрывая пакеты событий
+
+    Args:
+        q (Queue): очередь
+        max_items (int): максимальное число читаемых сообщений
+
+    Returns:
+        List[Event]: полученные события (возможно, пустой список)
+    """
+    events = []
+    for _ in range(max_items):
+        try:
+            item = q.get_nowait()
+        except Empty:
+            break
+        if isinstance(item, EventBatch):
+            events.extend(item.events)
+        else:
+            events.append(item)
+    return events
@@ -15,6 +15,17 @@ SECURITY_MONITOR_QUEUE_NAME = "security"  # монитор безопаснос
 RESTRICTED_ZONES_MANAGER_QUEUE_NAME = (
     "restricted_zones_manager"  # модуль работы с запрещенными зонами
 )
+LOG_COLLECTOR_QUEUE_NAME = "log_collector"  # сборщик журнала
+PHOTO_PLANNER_QUEUE_NAME = "photo_planner"  # планировщик снимков
+
+SECURITY_MONITOR_WORKERS = 1  # количество обработчиков монитора безопасности
+EVENT_WIRE_CODEC = False  # передавать события в компактном двоичном формате
+# очереди, передаваемые через кольцевой буфер в разделяемой памяти:
+# имя очереди -> размер буфера в байтах, например {ORBIT_DRAWER_QUEUE_NAME: 1 << 20}
+SHARED_MEMORY_QUEUES = {}
+# расчет движения спутника: "numeric" - численное интегрирование,
+# "analytic" - аналитическое решение для круговой орбиты
+SATELLITE_PROPAGATION_MODE = "numeric"
 
 DEFAULT_LOG_LEVEL = 2  # 1 - errors, 2 - verbose, 3 - debug
 LOG_FAILURE = 0
@@ -22,3 +33,22 @@ LOG_ERROR = 1
 LOG_INFO = 2
 LOG_DEBUG = 3
 CRITICALITY_STR = ["ОТКАЗ", "ОШИБКА", "ИНФО", "ОТЛАДКА"]
+
+LOG_COLLECTOR_ENABLED = False  # выводить журнал всех процессов через сборщик журнала
+LOG_FILE = None  # файл журнала сборщика (None - только консоль)
+
+IMAGE_CATALOG_FILE = "data/image_catalog.bin"  # постоянный каталог снимков хранилища изображений
+IMAGES_PAGE_SIZE = 256  # число снимков в одном сообщении images_page
+IMAGE_FRAMES_DIR = "data/frames"  # кадры снимков хранилища изображений
+# кадры хранятся сжатыми фрагментами: размер фрагмента, сжатие ("zlib" или "lzma"),
+# степень сжатия (0-9), число потоков сжатия
+IMAGE_TILE_SIZE = 128
+IMAGE_TILE_CODEC = "zlib"
+IMAGE_TILE_LEVEL = 6
+IMAGE_TILE_WORKERS = 2
+
+# кадры камеры передаются через пул в разделяемой памяти (0 - без кадров)
+FRAME_POOL_SLOTS = 16
+CAMERA_FRAME_SHAPE = (512, 512, 3)  # высота, ширина, каналы (uint8)
+CAMERA_FOV_DEG = 5.0  # поле зрения камеры, градусы
+CAMERA_BASEMAP_FILE = None  # подложка в равнопромежуточной проекции (None - синтетическая)
@@ -1,12 +1,16 @@
 from abc import abstractmethod
+from collections import deque
 from multiprocessing import Process, Queue
+from multiprocessing.connection import wait
 from queue import Empty
+from typing import Optional
 
-from src.system.event_types import Event, ControlEvent
+from src.system.event_types import Event, EventBatch, ControlEvent
 from src.system.queues_dir import QueuesDirectory
-from src.system.config import DEFAULT_LOG_LEVEL, CRITICALITY_STR, LOG_DEBUG
+from src.system.config import DEFAULT_LOG_LEVEL, LOG_DEBUG
+from src.system.log import LogMixin
 
-class BaseCustomProcess(Process):
+class BaseCustomProcess(LogMixin, Process):
     def __init__(
         self,
         log_prefix: str,
@@ -14,39 +18,71 @@ class BaseCustomProcess(Process):
         events_q_name: str,
         event_source_name: str,
         log_level: int = DEFAULT_LOG_LEVEL,
+        events_q_maxsize: int = 0,
     ):
         super().__init__()
 
         self._queues_dir = queues_dir
-        self._events_q = Queue()
         self._events_q_name = events_q_name
         self._event_source_name = event_source_name
         self.log_prefix = log_prefix
-        queues_dir.register(queue=self._events_q, name=self._events_q_name)
+        self._events_q = queues_dir.register(
+            queue=Queue(events_q_maxsize), name=self._events_q_name)
+        # события из полученного пакета, еще не переданные на обработку
+        self._pending_events = deque()
 
         self.log_level = log_level
         self._control_q = Queue()
 
         self._quit = False
-    
-    def _log_message(self, criticality: int, message: str):
-        """_log_message печатает сообщение заданного уровня критичности
+
+    def _wait_for_events(self, timeout: Optional[float] = None) -> bool:
+        """_wait_for_events блокирует процесс до появления сообщений
+        в очереди событий или в управляющей очереди (вместо опроса в цикле)
 
         Args:
-            criticality (int): уровень критичности
-            message (str): текст сообщения
+            timeout (Optional[float]): максимальное время ожидания (сек.),
+                None - ждать без ограничения
+
+        Returns:
+            bool: True, если в одной из очередей есть сообщения
         """
-        if criticality <= self.log_level:
-            print(f"[{CRITICALITY_STR[criticality]}]{self.log_prefix} {message}")
-    
+        if self._pending_events:
+            return True
+        handles = []
+        for q in (self._events_q, self._control_q):
+            # очереди в разделяемой памяти сначала проверяются без ожидания
+            prepare_wait = getattr(q, "prepare_wait", None)
+            if prepare_wait is not None and prepare_wait():
+                return True
+            handles.append(q._reader)
+        ready = wait(handles, timeout)
+        return len(ready) > 0
+
+    def _get_event(self) -> Event:
+        """_get_event выдает следующее событие из очереди без ожидания,
+        раскрывая пакеты событий EventBatch
 
+        Raises:
+            Empty: событий нет
+
+        Returns:
+            Event: событие
+        """
+        if self._pending_events:
+            return self._pending_events.popleft()
+        item = self._events_q.get_nowait()
+        if isinstance(item, EventBatch):
+            self._pending_events.extend(item.events)
+            return self._pending_events.popleft()
+        return item
 
     def _check_control_q(self):
         """ Проверка наличия управляющий команд  """
         try:
             request: ControlEvent = self._control_q.get_nowait()
             self._log_message(
-                LOG_DEBUG, f"проверяем запрос {request}")
+                LOG_DEBUG, "проверяем запрос %s", request)
             if not isinstance(request, ControlEvent):
                 return
             if request.operation == 'stop':
@@ -0,0 +1,248 @@
+""" модуль компактного двоичного формата событий
+
+Вместо сериализации dataclass Event через pickle событие упаковывается
+в байтовую строку: имена отправителя, получателя и операции заменяются
+двухбайтовыми кодами из таблицы, построенной по политикам безопасности,
+параметры записываются с однобайтовыми тегами типов. Значения неизвестных
+типов (например, RestrictedZone) упаковываются через pickle.
+"""
+import pickle
+from multiprocessing import Queue
+from struct import Struct
+from typing import Any, Iterable, List, NamedTuple
+
+from src.system.event_types import Event, EventBatch
+from src.system.security_policy_type import SecurityPolicy
+
+_MAGIC = 0xE5
+
+_HEADER = Struct("<BHHH")   # признак формата, отправитель, получатель, операция
+_NAME_INLINE = 0xFFFF      # имени нет в таблице, строка записана следом
+_U32 = Struct("<I")
+_I64 = Struct("<q")
+_F64 = Struct("<d")
+
+# теги типов параметров
+_T_NONE = b"N"
+_T_TRUE = b"T"
+_T_FALSE = b"F"
+_T_INT = b"i"
+_T_FLOAT = b"d"
+_T_STR = b"s"
+_T_BYTES = b"b"
+_T_TUPLE = b"t"
+_T_LIST = b"l"
+_T_DICT = b"m"
+_T_PICKLE = b"p"
+
+# типы, которые кодек записывает сам, без pickle
+_NATIVE_TYPES = (type(None), bool, int, float, str, bytes, tuple, list, dict)
+
+
+class EventCodec:
+    """ кодек событий с таблицей кодов имен и операций """
+
+    def __init__(self, policies: Iterable[SecurityPolicy]):
+        names = set()
+        for policy in policies:
+            names.update((policy.source, policy.destination, policy.operation))
+        # сортировка дает одинаковую таблицу во всех процессах
+        self._names: List[str] = sorted(names)
+        self._codes = {name: code for code, name in enumerate(self._names)}
+
+    def encode(self, event: Event) -> bytes:
+        """encode упаковывает событие в байтовую строку
+
+        Args:
+            event (Event): событие
+
+        Returns:
+            bytes: упакованное событие
+        """
+        codes = self._codes
+        source = codes.get(event.source, _NAME_INLINE)
+        destination = codes.get(event.destination, _NAME_INLINE)
+        operation = codes.get(event.operation, _NAME_INLINE)
+        out = [_HEADER.pack(_MAGIC, source, destination, operation)]
+        for code, name in ((source, event.source),
+                           (destination, event.destination),
+                           (operation, event.operation)):
+            if code == _NAME_INLINE:
+                self._write(out, name)
+        self._write(out, event.parameters)
+        self._write(out, event.extra_parameters)
+        self._write(out, event.signature)
+        return b"".join(out)
+
+    def decode(self, data: bytes) -> Event:
+        """decode распаковывает событие, упакованное encode
+
+        Args:
+            data (bytes): упакованное событие
+
+        Returns:
+            Event: событие
+        """
+        magic, *codes = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("неизвестный формат события")
+        pos = _HEADER.size
+        names = []
+        for code in codes:
+            if code == _NAME_INLINE:
+                name, pos = self._read(data, pos)
+            else:
+                name = self._names[code]
+            names.append(name)
+        parameters, pos = self._read(data, pos)
+        extra_parameters, pos = self._read(data, pos)
+        signature, pos = self._read(data, pos)
+        return Event(
+            source=names[0],
+            destination=names[1],
+            operation=names[2],
+            parameters=parameters,
+            extra_parameters=extra_parameters,
+            signature=signature)
+
+    def _write(self, out: list, value: Any):
+        """ запись значения с тегом типа """
+        if value is None:
+            out.append(_T_NONE)
+        elif value is True:
+            out.append(_T_TRUE)
+        elif value is False:
+            out.append(_T_FALSE)
+        elif type(value) is int and -2**63 <= value < 2**63:
+            out.append(_T_INT + _I64.pack(value))
+        elif isinstance(value, float):
+            out.append(_T_FLOAT + _F64.pack(value))
+        elif type(value) is str:
+            raw = value.encode()
+            out.append(_T_STR + _U32.pack(len(raw)) + raw)
+        elif type(value) is bytes:
+            out.append(_T_BYTES + _U32.pack(len(value)) + value)
+        # списки объектов других типов (например, зон) выгоднее
+        # упаковать через pickle целиком, чем каждый элемент отдельно
+        elif type(value) in (tuple, list) and (
+                not value or isinstance(value[0], _NATIVE_TYPES)):
+            out.append((_T_TUPLE if type(value) is tuple else _T_LIST) + _U32.pack(len(value)))
+            for item in value:
+                self._write(out, item)
+        elif type(value) is dict:
+            out.append(_T_DICT + _U32.pack(len(value)))
+            for key, item in value.items():
+                self._write(out, key)
+                self._write(out, item)
+        else:
+            raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            out.append(_T_PICKLE + _U32.pack(len(raw)) + raw)
+
+    def _read(self, data: bytes, pos: int):
+        """ чтение значения, записанного _write; возвращает (значение, позиция) """
+        tag = data[pos:pos + 1]
+        pos += 1
+        if tag == _T_NONE:
+            return None, pos
+        if tag == _T_TRUE:
+            return True, pos
+        if tag == _T_FALSE:
+            return False, pos
+        if tag == _T_INT:
+            return _I64.unpack_from(data, pos)[0], pos + _I64.size
+        if tag == _T_FLOAT:
+            return _F64.unpack_from(data, pos)[0], pos + _F64.size
+        if tag in (_T_STR, _T_BYTES, _T_PICKLE):
+            size = _U32.unpack_from(data, pos)[0]
+            pos += _U32.size
+            raw = data[pos:pos + size]
+            pos += size
+            if tag == _T_STR:
+                return raw.decode(), pos
+            if tag == _T_BYTES:
+                return bytes(raw), pos
+            return pickle.loads(raw), pos
+        if tag in (_T_TUPLE, _T_LIST):
+            size = _U32.unpack_from(data, pos)[0]
+            pos += _U32.size
+            items = []
+            for _ in range(size):
+                item, pos = self._read(data, pos)
+                items.append(item)
+            return (tuple(items) if tag == _T_TUPLE else items), pos
+        if tag == _T_DICT:
+            size = _U32.unpack_from(data, pos)[0]
+            pos += _U32.size
+            result = {}
+            for _ in range(size):
+                key, pos = self._read(data, pos)
+                result[key], pos = self._read(data, pos)
+            return result, pos
+        raise ValueError(f"неизвестный тег значения {tag!r}")
+
+
+class _EncodedEvent(NamedTuple):
+    """ упакованное событие в очереди CodecQueue (отличается от
+    переданных как есть байтовых строк) """
+    data: bytes
+
+
+class _EncodedBatch(NamedTuple):
+    """ упакованный пакет событий в очереди CodecQueue """
+    events: List[bytes]
+
+
+class CodecQueue:
+    """ обертка над multiprocessing.Queue, передающая события
+    в двоичном формате EventCodec (прочие объекты - как есть) """
+
+    def __init__(self, queue: Queue, codec: EventCodec):
+        self._queue = queue
+        self._codec = codec
+
+    @property
+    def _reader(self):
+        # для ожидания событий в BaseCustomProcess._wait_for_events
+        return self._queue._reader
+
+    def put(self, obj, block: bool = True, timeout=None):
+        if isinstance(obj, Event):
+            obj = _EncodedEvent(self._codec.encode(obj))
+        elif isinstance(obj, EventBatch):
+            # пакет передается списком упакованных событий
+            obj = _EncodedBatch([self._codec.encode(event) for event in obj.events])
+        self._queue.put(obj, block, timeout)
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def get(self, block: bool = True, timeout=None):
+        return self._decode(self._queue.get(block, timeout))
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        self._queue.close()
+
+    def join_thread(self):
+        self._queue.join_thread()
+
+    def cancel_join_thread(self):
+        self._queue.cancel_join_thread()
+
+    def _decode(self, obj):
+        if isinstance(obj, _EncodedEvent):
+            return self._codec.decode(obj.data)
+        if isinstance(obj, _EncodedBatch):
+            return EventBatch(events=[self._codec.decode(item) for item in obj.events])
+        return obj
@@ -1,9 +1,9 @@
 """ типы данных для информационных и управляющих сообщений """
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """ формат событий для обработки """
     source: str       # отправитель
@@ -16,7 +16,13 @@ class Event:
                                       # для проверки целостности и аутентичности сообщения
 
 
-@dataclass
+@dataclass(slots=True)
+class EventBatch:
+    """ пакет событий, передаваемых одной операцией записи в очередь """
+    events: List[Event]
+
+
+@dataclass(slots=True)
 class ControlEvent:
     """ формат управляющих команд для сущностей (например, для остановки работы) """
     operation: str  # код операции
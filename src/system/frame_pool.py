@@ -0,0 +1,153 @@
+""" модуль пула кадров в разделяемой памяти
+
+Кадры камеры (массивы пикселей) не передаются через очереди: камера
+записывает кадр в свободную ячейку пула, а в событиях передается только
+описатель кадра FrameHandle (номер ячейки и ее поколение). Получатель
+читает кадр прямо из разделяемой памяти и освобождает ячейку, когда кадр
+больше не нужен (сохранен в хранилище или отброшен).
+
+Ячейки выдает один процесс (камера). Поколение ячейки увеличивается при
+каждой выдаче, поэтому устаревший описатель не дает доступа к новому кадру.
+Поколение пишет только камера; получатель при освобождении записывает
+поколение освобожденного кадра (released_generation), и ячейка свободна,
+когда оно совпадает с текущим. Поэтому освобождение по устаревшему
+описателю не освобождает ячейку, уже выданную новому кадру.
+Ячейка, которую никто не освободил (например, событие отклонено монитором
+безопасности), выдается повторно по истечении срока аренды.
+"""
+from multiprocessing.shared_memory import SharedMemory
+from time import time
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# состояние ячеек: поколение (пишет камера), поколение освобожденного
+# кадра (пишут получатели), время выдачи
+_SLOT_STATE = np.dtype([
+    ("generation", "<u4"),
+    ("released_generation", "<u4"),
+    ("acquired_at", "<f8"),
+])
+
+
+class FrameHandle(NamedTuple):
+    """ описатель кадра в пуле """
+    slot: int
+    generation: int
+
+
+class FramePool:
+    """ пул кадров одинакового размера в разделяемой памяти """
+
+    def __init__(
+            self,
+            slots: int,
+            frame_shape: Tuple[int, ...],
+            dtype=np.uint8,
+            lease_sec: float = 30.0):
+        """
+        Args:
+            slots (int): число ячеек
+            frame_shape (Tuple[int, ...]): размер кадра (например, (H, W, 3))
+            dtype: тип пикселей
+            lease_sec (float): через сколько секунд неосвобожденная ячейка
+                может быть выдана повторно
+        """
+        self._slots = slots
+        self._frame_shape = tuple(frame_shape)
+        self._dtype = np.dtype(dtype)
+        self._lease_sec = lease_sec
+        frame_size = int(np.prod(self._frame_shape)) * self._dtype.itemsize
+        self._state_size = slots * _SLOT_STATE.itemsize
+        self._shm = SharedMemory(create=True, size=self._state_size + slots * frame_size)
+        self._owner = True
+        self._attach()
+        self._state[:] = 0
+        self._next_slot = 0
+
+    def _attach(self):
+        self._state = np.ndarray((self._slots,), dtype=_SLOT_STATE, buffer=self._shm.buf)
+        self._frames = np.ndarray(
+            (self._slots, *self._frame_shape), dtype=self._dtype,
+            buffer=self._shm.buf, offset=self._state_size)
+
+    def __getstate__(self):
+        # при запуске процесса методом spawn память подключается по имени
+        state = self.__dict__.copy()
+        state["_shm"] = self._shm.name
+        state["_owner"] = False
+        del state["_state"], state["_frames"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = SharedMemory(name=state["_shm"])
+        self._attach()
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        return self._frame_shape
+
+    @property
+    def frame_nbytes(self) -> int:
+        return self._frames[0].nbytes
+
+    def acquire(self) -> Optional[FrameHandle]:
+        """acquire выдает свободную ячейку (вызывается только камерой)
+
+        Returns:
+            Optional[FrameHandle]: описатель кадра или None, если все ячейки заняты
+        """
+        now = time()
+        for step in range(self._slots):
+            slot = (self._next_slot + step) % self._slots
+            state = self._state[slot]
+            busy = state["released_generation"] != state["generation"]
+            if busy and now - state["acquired_at"] < self._lease_sec:
+                continue
+            generation = (int(state["generation"]) + 1) & 0xFFFFFFFF
+            if generation == state["released_generation"]:
+                # после переполнения: новое поколение не должно считаться освобожденным
+                generation = (generation + 1) & 0xFFFFFFFF
+            state["acquired_at"] = now
+            state["generation"] = generation
+            self._next_slot = (slot + 1) % self._slots
+            return FrameHandle(slot, generation)
+        return None
+
+    def frame(self, handle) -> Optional[np.ndarray]:
+        """frame кадр по описателю (представление разделяемой памяти, без копирования)
+
+        Returns:
+            Optional[np.ndarray]: кадр или None, если ячейка уже выдана другому кадру
+        """
+        if not self.is_valid(handle):
+            return None
+        return self._frames[handle[0]]
+
+    def is_valid(self, handle) -> bool:
+        """is_valid принадлежит ли ячейка еще кадру с этим описателем"""
+        slot, generation = handle
+        state = self._state[slot]
+        return int(state["generation"]) == generation and int(state["released_generation"]) != generation
+
+    def release(self, handle):
+        """release освобождает ячейку (повторное освобождение и освобождение
+        по устаревшему описателю ничего не делают)"""
+        slot, generation = handle
+        # запись поколения кадра, а не признака: если ячейка уже выдана
+        # новому кадру, поколения не совпадут и ячейка останется занятой
+        self._state[slot]["released_generation"] = generation
+
+    def close(self):
+        """ освобождение разделяемой памяти (удаляется создателем пула) """
+        self._state = None
+        self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # остались кадры, выданные frame(): память будет освобождена
+            # вместе с ними
+            pass
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,257 @@
+""" модуль журналирования компонентов системы
+
+Сообщения форматируются только если уровень критичности разрешен
+(текст можно передать шаблоном %-формата с аргументами или функцией),
+а вывод выполняет отдельный поток-писатель процесса: вызывающий код
+не блокируется на записи в терминал, строки выводятся пакетами.
+
+Перед fork поток-писатель выводит накопленные записи и останавливается,
+поэтому дочерние процессы запускаются из однопоточного процесса.
+
+Если задан приемник журнала (set_log_sink), записи пакетами отправляются
+в очередь сборщика журнала LogCollector вместо вывода из каждого процесса.
+"""
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import Queue
+from multiprocessing.util import Finalize
+from queue import SimpleQueue, Empty, Full
+from typing import Any, Callable, List, Optional, TextIO, Union
+
+from src.system.config import CRITICALITY_STR, DEFAULT_LOG_LEVEL, LOG_DEBUG, LOG_ERROR
+
+# максимальное число записей, выводимых (отправляемых) одной операцией
+_MAX_LINES_PER_WRITE = 256
+# сколько ждать места в очереди сборщика для записей важнее отладочных
+_SINK_PUT_TIMEOUT_SEC = 1.0
+_STOP = None
+
+
+@dataclass(slots=True)
+class LogRecord:
+    """ запись журнала """
+    level: int          # уровень критичности
+    prefix: str         # префикс компонента (log_prefix)
+    timestamp: float    # время создания записи
+    message: str        # текст сообщения
+
+
+def format_record(record: LogRecord, with_time: bool = False) -> str:
+    """format_record строка журнала для записи
+
+    Args:
+        record (LogRecord): запись
+        with_time (bool): добавить время создания записи
+
+    Returns:
+        str: строка журнала
+    """
+    line = f"[{CRITICALITY_STR[record.level]}]{record.prefix} {record.message}"
+    if with_time:
+        moment = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+        line = f"{moment}.{int(record.timestamp * 1000) % 1000:03d} {line}"
+    return line
+
+
+class LogWriter:
+    """ поток-писатель журнала одного процесса """
+
+    def __init__(
+            self,
+            stream: Optional[TextIO] = None,
+            sink: Optional[Queue] = None,
+            drop_debug: bool = True):
+        self._stream = stream
+        self._sink = sink
+        # отбрасывать отладочные записи, если очередь сборщика заполнена
+        self._drop_debug = drop_debug
+        self._dropped = 0
+        if sink is not None and hasattr(sink, "cancel_join_thread"):
+            # завершение процесса не должно зависеть от того,
+            # успел ли сборщик прочитать последние записи
+            sink.cancel_join_thread()
+        self._records = SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        # multiprocessing выполняет финализаторы и при завершении
+        # дочернего процесса, где обработчики atexit не вызываются
+        Finalize(self, self.close, exitpriority=0)
+
+    def write(self, record: LogRecord):
+        """ write ставит запись в очередь на вывод, не дожидаясь записи """
+        self._records.put(record)
+
+    def close(self):
+        """ close выводит оставшиеся записи и останавливает поток """
+        if self._thread.is_alive():
+            self._records.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self._records.get()]
+            while len(batch) < _MAX_LINES_PER_WRITE:
+                try:
+                    batch.append(self._records.get_nowait())
+                except Empty:
+                    break
+            records = [record for record in batch if record is not _STOP]
+            if records:
+                if self._sink is None:
+                    self._output(records)
+                else:
+                    self._send(records)
+            if len(records) < len(batch):
+                return
+
+    def _output(self, records: List[LogRecord]):
+        stream = self._stream or sys.stdout
+        stream.write("".join(format_record(record) + "\n" for record in records))
+        stream.flush()
+
+    def _send(self, records: List[LogRecord]):
+        """ отправка пакета записей сборщику журнала """
+        if self._dropped:
+            records.insert(0, LogRecord(
+                level=LOG_ERROR,
+                prefix="[LOG]",
+                timestamp=time.time(),
+                message=f"процесс {os.getpid()}: пропущено отладочных записей: {self._dropped}"))
+            self._dropped = 0
+        try:
+            self._sink.put_nowait(records)
+            return
+        except Full:
+            pass
+
+        if self._drop_debug:
+            important = [record for record in records if record.level < LOG_DEBUG]
+            self._dropped += len(records) - len(important)
+            records = important
+            if not records:
+                return
+        try:
+            self._sink.put(records, timeout=_SINK_PUT_TIMEOUT_SEC)
+        except Full:
+            # сборщик не справляется или уже остановлен
+            self._output(records)
+
+
+_writer: Optional[LogWriter] = None
+_writer_pid: Optional[int] = None
+_writer_lock = threading.Lock()
+_sink: Optional[Queue] = None
+_drop_debug = True
+
+
+def set_log_sink(sink: Optional[Queue], drop_debug: bool = True):
+    """set_log_sink направляет журнал процесса (и процессов, запущенных
+    после вызова) в очередь сборщика журнала
+
+    Args:
+        sink (Optional[Queue]): очередь сборщика, None - вывод из процесса
+        drop_debug (bool): отбрасывать отладочные записи при переполнении очереди
+    """
+    global _writer, _writer_pid, _sink, _drop_debug
+    with _writer_lock:
+        if _writer is not None and _writer_pid == os.getpid():
+            _writer.close()
+        _writer = None
+        _writer_pid = None
+        _sink = sink
+        _drop_debug = drop_debug
+
+
+def get_log_writer() -> LogWriter:
+    """get_log_writer писатель журнала текущего процесса
+    (создается при первом обращении, в том числе после fork)
+
+    Returns:
+        LogWriter: писатель журнала
+    """
+    global _writer, _writer_pid
+    pid = os.getpid()
+    if _writer_pid != pid:
+        with _writer_lock:
+            if _writer_pid != pid:
+                _writer = LogWriter(sink=_sink, drop_debug=_drop_debug)
+                _writer_pid = pid
+    return _writer
+
+
+def _stop_writer_before_fork():
+    """ остановка потока-писателя перед fork: в дочерний процесс не должна
+    попасть блокировка вывода (sys.stdout), захваченная этим потоком.
+    Записи, поставленные до fork, выводятся, а после fork писатель
+    создается заново при первом обращении (в родителе и в потомке) """
+    global _writer, _writer_pid
+    _writer_lock.acquire()
+    if _writer is not None and _writer_pid == os.getpid():
+        _writer.close()
+    _writer = None
+    _writer_pid = None
+
+
+def _release_after_fork_in_parent():
+    # блокировка берется по имени при вызове: в процессе, созданном fork,
+    # она заменена на новую
+    _writer_lock.release()
+
+
+def _reinit_after_fork_in_child():
+    global _writer_lock
+    _writer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_stop_writer_before_fork,
+        after_in_parent=_release_after_fork_in_parent,
+        after_in_child=_reinit_after_fork_in_child,
+    )
+
+
+class LogMixin:
+    """ журналирование для компонентов с атрибутами log_prefix и log_level """
+    log_prefix = ""
+    log_level = DEFAULT_LOG_LEVEL
+
+    def _log_enabled(self, criticality: int) -> bool:
+        """_log_enabled будет ли выведено сообщение заданного уровня
+
+        Args:
+            criticality (int): уровень критичности
+
+        Returns:
+            bool: True, если уровень разрешен
+        """
+        return criticality <= self.log_level
+
+    def _log_message(
+            self,
+            criticality: int,
+            message: Union[str, Callable[[], str]],
+            *args: Any):
+        """_log_message выводит сообщение заданного уровня критичности.
+        Текст формируется только если уровень разрешен.
+
+        Args:
+            criticality (int): уровень критичности
+            message (Union[str, Callable[[], str]]): текст, шаблон %-формата
+                или функция, возвращающая текст
+            *args (Any): аргументы шаблона
+        """
+        if criticality > self.log_level:
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+        get_log_writer().write(LogRecord(
+            level=criticality,
+            prefix=self.log_prefix,
+            timestamp=time.time(),
+            message=message))
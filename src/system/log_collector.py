@@ -0,0 +1,86 @@
+""" модуль сборщика журнала """
+import sys
+from queue import Empty
+from time import monotonic
+from typing import List, Optional
+
+from src.system.custom_process import BaseCustomProcess
+from src.system.queues_dir import QueuesDirectory
+from src.system.log import LogRecord, format_record, set_log_sink
+from src.system.config import DEFAULT_LOG_LEVEL, LOG_INFO, LOG_COLLECTOR_QUEUE_NAME
+
+
+class LogCollector(BaseCustomProcess):
+    """ сборщик журнала: получает пакеты записей журнала от всех процессов
+    и выводит их буферизованно в консоль и/или файл """
+    log_prefix = "[LOG]"
+    event_source_name = LOG_COLLECTOR_QUEUE_NAME
+    events_q_name = event_source_name
+
+    def __init__(
+            self,
+            queues_dir: QueuesDirectory,
+            log_level: int = DEFAULT_LOG_LEVEL,
+            log_file: Optional[str] = None,
+            console: bool = True,
+            max_pending_batches: int = 1024):
+        super().__init__(
+            log_prefix=LogCollector.log_prefix,
+            queues_dir=queues_dir,
+            events_q_name=LogCollector.events_q_name,
+            event_source_name=LogCollector.event_source_name,
+            log_level=log_level,
+            events_q_maxsize=max_pending_batches)
+        self._log_file = log_file
+        self._console = console
+        # после команды остановки дочитываем записи, пока они поступают
+        self._drain_timeout_sec = 0.5
+        self._outputs = []
+
+    @property
+    def sink(self):
+        """ очередь, которую нужно передать в set_log_sink """
+        return self._events_q
+
+    def _check_events_q(self):
+        """ вывод всех поступивших пакетов записей """
+        records: List[LogRecord] = []
+        while True:
+            try:
+                batch = self._get_event()
+            except Empty:
+                break
+            if isinstance(batch, list):
+                records.extend(batch)
+        if not records:
+            return
+        text = "".join(format_record(record, with_time=True) + "\n" for record in records)
+        for output in self._outputs:
+            output.write(text)
+            output.flush()
+
+    def run(self):
+        # собственные сообщения сборщик выводит сам, минуя свою очередь
+        set_log_sink(None)
+        if self._console:
+            self._outputs.append(sys.stdout)
+        if self._log_file is not None:
+            self._outputs.append(open(self._log_file, "a", encoding="utf-8", buffering=1 << 16))
+        self._log_message(LOG_INFO, "сборщик журнала запущен")
+
+        while not self._quit:
+            self._wait_for_events()
+            self._check_events_q()
+            self._check_control_q()
+
+        # остальные процессы останавливаются одновременно со сборщиком
+        # и еще досылают записи
+        deadline = monotonic() + self._drain_timeout_sec
+        while monotonic() < deadline:
+            if self._wait_for_events(deadline - monotonic()):
+                self._check_events_q()
+                deadline = monotonic() + self._drain_timeout_sec
+
+        for output in self._outputs:
+            if output is not sys.stdout:
+                output.close()
@@ -1,40 +1,54 @@
 """ модуль каталога очередей сообщений """
-from multiprocessing import Queue
-from typing import Union
+from multiprocessing import Queue, queues
+from typing import Dict, Optional, Union
 
-from src.system.config import CRITICALITY_STR, DEFAULT_LOG_LEVEL, LOG_ERROR, LOG_INFO
+from src.system.config import DEFAULT_LOG_LEVEL, LOG_ERROR, LOG_INFO
+from src.system.log import LogMixin
+from src.system.event_codec import CodecQueue, EventCodec
+from src.system.shm_ring_queue import ShmRingQueue
 
 
-class QueuesDirectory:
+class QueuesDirectory(LogMixin):
     """ каталог очередей сообщений """
     log_prefix = "[QUEUES]"
     log_level = DEFAULT_LOG_LEVEL
 
-    def __init__(self):
+    def __init__(
+            self,
+            codec: Optional[EventCodec] = None,
+            shm_queues: Optional[Dict[str, int]] = None):
         self._log_message(LOG_INFO, "создан каталог очередей")
 
         # словарь с очередями компонентов
         self.queues = {}
+        # кодек двоичного формата событий (None - события передаются через pickle)
+        self._codec = codec
+        # имена очередей, передаваемых через разделяемую память -> размер буфера
+        self._shm_queues = shm_queues or {}
 
-    def _log_message(self, criticality: int, message: str):
-        """_log_message печатает сообщение заданного уровня критичности
-
-        Args:
-            criticality (int): уровень критичности
-            message (str): текст сообщения
-        """
-        if criticality <= self.log_level:
-            print(f"[{CRITICALITY_STR[criticality]}]{self.log_prefix} {message}")
-
-    def register(self, queue: Queue, name: str):
+    def register(self, queue: Queue, name: str) -> Queue:
         """register регистрация очереди с заданным именем
 
+        Очередь multiprocessing.Queue заменяется на ShmRingQueue, если имя
+        указано в shm_queues, или оборачивается в CodecQueue, если каталогу
+        задан кодек событий; компонент должен использовать возвращенную очередь.
+
         Args:
             queue (Queue): очередь
             name (str): имя
+
+        Returns:
+            Queue: зарегистрированная очередь
         """
-        self._log_message(LOG_INFO, f"регистрируем очередь {name}")
+        self._log_message(LOG_INFO, "регистрируем очередь %s", name)
+        if isinstance(queue, queues.Queue):
+            if name in self._shm_queues:
+                queue.close()
+                queue = ShmRingQueue(capacity=self._shm_queues[name], codec=self._codec)
+            elif self._codec is not None:
+                queue = CodecQueue(queue, self._codec)
         self.queues[name] = queue
+        return queue
 
     def get_queue(self, name:str) -> Union[Queue, None]:
         """get_queue выдаёт из каталога очередь с указанным именем
@@ -48,5 +62,11 @@ class QueuesDirectory:
         try:
             return self.queues[name]
         except KeyError as e:
-            self._log_message(LOG_ERROR, f"очередь не найдена {e}")
+            self._log_message(LOG_ERROR, "очередь не найдена %s", e)
             return None
+
+    def close(self):
+        """ освобождение разделяемой памяти очередей ShmRingQueue """
+        for queue in self.queues.values():
+            if isinstance(queue, ShmRingQueue):
+                queue.close()
@@ -1,9 +1,7 @@
 """ модуль монитора безопасности """
 from abc import abstractmethod
 from multiprocessing import Queue, Process
-from queue import Empty
-
-from time import sleep
+from typing import List, Optional
 
 from src.system.custom_process import BaseCustomProcess
 from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME,\
@@ -11,6 +9,8 @@ from src.system.config import LOG_ERROR, SECURITY_MONITOR_QUEUE_NAME,\
     LOG_DEBUG, LOG_INFO
 from src.system.queues_dir import QueuesDirectory
 from src.system.event_types import Event, ControlEvent
+from src.system.sharded_queue import ShardedQueue
+from src.system.batching import get_batch, put_batch
 
 
 class BaseSecurityMonitor(BaseCustomProcess):
@@ -19,41 +19,88 @@ class BaseSecurityMonitor(BaseCustomProcess):
     event_source_name = SECURITY_MONITOR_QUEUE_NAME
     events_q_name = event_source_name
 
-    def __init__(self, queues_dir: QueuesDirectory, log_level: int):
+    def __init__(
+            self,
+            queues_dir: QueuesDirectory,
+            log_level: int,
+            worker_id: Optional[int] = None):
+        # при работе нескольких обработчиков каждый получает свою очередь,
+        # а общее имя очереди монитора регистрирует create_workers
+        if worker_id is None:
+            log_prefix = BaseSecurityMonitor.log_prefix
+            events_q_name = BaseSecurityMonitor.events_q_name
+        else:
+            log_prefix = f"[SECURITY_{worker_id}]"
+            events_q_name = f"{BaseSecurityMonitor.events_q_name}_{worker_id}"
+
         # вызываем конструктор базового класса
         super().__init__(
-            log_prefix=BaseSecurityMonitor.log_prefix,
+            log_prefix=log_prefix,
             queues_dir=queues_dir,
-            events_q_name=BaseSecurityMonitor.event_source_name,
+            events_q_name=events_q_name,
             event_source_name=BaseSecurityMonitor.event_source_name,
             log_level=log_level)
 
-        # инициализируем интервал обновления
+        # максимальное время ожидания новых событий, по истечении
+        # которого монитор в любом случае проверит управляющую очередь
         self._recalc_interval_sec = 0.1
+        # максимальное число событий, пересылаемых за один проход цикла,
+        # чтобы поток событий не блокировал обработку управляющих команд
+        self._max_batch_size = 64
         self._log_message(LOG_INFO, "создан монитор безопасности")
 
 
+    @classmethod
+    def create_workers(
+            cls,
+            queues_dir: QueuesDirectory,
+            workers: int,
+            **kwargs) -> List["BaseSecurityMonitor"]:
+        """create_workers создает группу обработчиков монитора безопасности
+
+        Под именем очереди монитора регистрируется ShardedQueue,
+        распределяющая события между обработчиками по получателю,
+        поэтому порядок событий для каждого получателя сохраняется.
+
+        Args:
+            queues_dir (QueuesDirectory): каталог очередей
+            workers (int): количество обработчиков
+            **kwargs: параметры конструктора монитора
+
+        Returns:
+            List[BaseSecurityMonitor]: обработчики для запуска
+        """
+        if workers <= 1:
+            return [cls(queues_dir=queues_dir, **kwargs)]
+
+        monitors = [
+            cls(queues_dir=queues_dir, worker_id=worker_id, **kwargs)
+            for worker_id in range(workers)
+        ]
+        queues_dir.register(
+            queue=ShardedQueue([monitor._events_q for monitor in monitors]),
+            name=cls.events_q_name)
+        return monitors
+
     def _check_events_q(self):
-        """_check_events_q в цикле проверим все входящие сообщения,
-        выход из цикла по условию отсутствия новых сообщений
+        """_check_events_q проверим входящие сообщения (не более
+        _max_batch_size за проход) и перешлем разрешенные события,
+        сгруппировав их по получателям с сохранением порядка
         """
+        allowed_events = {}
 
-        while True:
-            try:
-                event: Event = self._events_q.get_nowait()
-            except Empty:
-                # в очереди не команд на обработку,
-                # выходим из цикла проверки
-                break
+        for event in get_batch(self._events_q, self._max_batch_size):
             if not isinstance(event, Event):
                 # событие неправильного типа, пропускаем
                 continue
 
-            self._log_message(LOG_DEBUG, f"получен запрос {event}")
+            self._log_message(LOG_DEBUG, "получен запрос %s", event)
 
             if self._check_event(event):
-                self._proceed(event)
-                
+                allowed_events.setdefault(event.destination, []).append(event)
+
+        for destination, events in allowed_events.items():
+            self._proceed_batch(destination, events)
 
     @abstractmethod
     def _check_event(self, event: Event):
@@ -61,20 +108,24 @@ class BaseSecurityMonitor(BaseCustomProcess):
 
     def _proceed(self, event: Event):
         """ отправить проверенное событие конечному получателю """
-        destination_q = self._queues_dir.get_queue(event.destination)
+        self._proceed_batch(event.destination, [event])
+
+    def _proceed_batch(self, destination: str, events: List[Event]):
+        """ отправить проверенные события одному получателю одной записью """
+        destination_q = self._queues_dir.get_queue(destination)
         if destination_q is None:
             self._log_message(
-                LOG_ERROR, f"ошибка обработки запроса {event}, получатель не найден")
+                LOG_ERROR, "ошибка обработки запроса %s, получатель не найден", events)
         else:
-            destination_q.put(event)
+            put_batch(destination_q, events)
             self._log_message(
-                LOG_DEBUG, f"запрос отправлен получателю {event}")
+                LOG_DEBUG, "запрос отправлен получателю %s", events)
 
 
     def run(self):
         self._log_message(LOG_INFO, "старт монитора безопасности")
 
         while self._quit is False:
-            sleep(self._recalc_interval_sec)
+            self._wait_for_events(self._recalc_interval_sec)
             self._check_events_q()
             self._check_control_q()
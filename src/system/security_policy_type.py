@@ -1,11 +1,56 @@
 """ модуль описания типа политики безопасности """
 
 from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable
 
 
-@dataclass
+@dataclass(frozen=True)
 class SecurityPolicy:
     """ политика безопасности """
     source: str         # отправитель запроса
     destination: str    # получатель
     operation: str      # запрашиваемая операция
+
+
+# индекс политик: получатель -> отправитель -> разрешенные операции
+PolicyIndex = Dict[str, Dict[str, FrozenSet[str]]]
+
+
+def build_policy_index(policies: Iterable[SecurityPolicy]) -> PolicyIndex:
+    """build_policy_index строит индекс политик для проверки события
+    за O(1) без создания промежуточных объектов
+
+    Args:
+        policies (Iterable[SecurityPolicy]): список политик безопасности
+
+    Returns:
+        PolicyIndex: вложенный словарь получатель -> отправитель -> операции
+    """
+    index = {}
+    for policy in policies:
+        index.setdefault(policy.destination, {}) \
+            .setdefault(policy.source, set()).add(policy.operation)
+    return {
+        destination: {source: frozenset(operations)
+                      for source, operations in sources.items()}
+        for destination, sources in index.items()
+    }
+
+
+def is_allowed(index: PolicyIndex, source: str, destination: str, operation: str) -> bool:
+    """is_allowed проверяет, разрешена ли операция индексом политик
+
+    Args:
+        index (PolicyIndex): индекс, построенный build_policy_index
+        source (str): отправитель
+        destination (str): получатель
+        operation (str): операция
+
+    Returns:
+        bool: True, если взаимодействие разрешено
+    """
+    sources = index.get(destination)
+    if sources is None:
+        return False
+    operations = sources.get(source)
+    return operations is not None and operation in operations
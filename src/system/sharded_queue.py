@@ -0,0 +1,58 @@
+""" модуль очереди, распределяющей события между несколькими обработчиками """
+from multiprocessing import Queue
+from typing import List
+from zlib import crc32
+
+from src.system.event_types import Event, EventBatch
+
+
+class ShardedQueue:
+    """ логическая очередь из нескольких очередей-шардов.
+
+    Событие направляется в шард, выбранный по получателю (destination),
+    поэтому все события одному получателю проходят через одну очередь
+    и порядок их доставки сохраняется.
+    """
+
+    def __init__(self, shards: List[Queue]):
+        self._shards = shards
+        # кэш номера шарда по имени получателя
+        self._shard_by_destination = {}
+
+    def shard_for(self, destination: str) -> int:
+        """shard_for номер шарда для получателя
+
+        Args:
+            destination (str): имя очереди получателя
+
+        Returns:
+            int: номер шарда
+        """
+        shard = self._shard_by_destination.get(destination)
+        if shard is None:
+            # crc32 вместо hash(): результат не зависит от PYTHONHASHSEED
+            # и одинаков во всех процессах
+            shard = crc32(str(destination).encode()) % len(self._shards)
+            self._shard_by_destination[destination] = shard
+        return shard
+
+    def put(self, event: Event, block: bool = True, timeout=None):
+        """ put помещает событие в шард его получателя """
+        if isinstance(event, EventBatch):
+            self._put_batch(event, block, timeout)
+            return
+        destination = getattr(event, "destination", None)
+        self._shards[self.shard_for(destination)].put(event, block, timeout)
+
+    def put_nowait(self, event: Event):
+        self.put(event, block=False)
+
+    def _put_batch(self, batch: EventBatch, block: bool, timeout):
+        """ пакет делится по шардам, чтобы события каждого получателя
+        проходили через тот же шард, что и одиночные """
+        by_shard = {}
+        for event in batch.events:
+            by_shard.setdefault(self.shard_for(event.destination), []).append(event)
+        for shard, events in by_shard.items():
+            item = events[0] if len(events) == 1 else EventBatch(events=events)
+            self._shards[shard].put(item, block, timeout)
@@ -0,0 +1,206 @@
+""" модуль очереди событий на кольцевом буфере в разделяемой памяти
+
+Альтернатива multiprocessing.Queue для частых сообщений небольшого размера:
+запись и чтение идут напрямую в разделяемую память, без канала (pipe)
+и фонового потока отправки. Канал используется только как "звонок",
+чтобы разбудить спящего получателя, и только когда тот действительно ждет.
+"""
+import pickle
+import threading
+from multiprocessing import Lock, Pipe
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, Full
+from struct import Struct
+from time import monotonic, sleep
+from typing import Optional
+
+from src.system.event_codec import EventCodec
+from src.system.event_types import Event, EventBatch
+
+# заголовок буфера: счетчики записанных и прочитанных байт, флаг ожидания
+_HEAD, _TAIL, _WAITING = 0, 1, 2
+_HEADER_SIZE = 3 * 8
+_LENGTH = Struct("<I")
+# тип записи: событие или пакет событий в формате EventCodec, объект pickle
+_KIND_EVENT = b"e"
+_KIND_BATCH = b"b"
+_KIND_PICKLE = b"p"
+# пауза при ожидании места в заполненном буфере
+_FULL_BACKOFF_SEC = 0.0005
+
+
+class ShmRingQueue:
+    """ очередь на кольцевом буфере в разделяемой памяти.
+
+    Рассчитана на одного получателя. Запись защищена блокировкой,
+    если отправителей несколько (multi_producer=True).
+    """
+
+    def __init__(
+            self,
+            capacity: int = 1 << 20,
+            codec: Optional[EventCodec] = None,
+            multi_producer: bool = True):
+        self._capacity = capacity
+        self._codec = codec
+        self._shm = SharedMemory(create=True, size=_HEADER_SIZE + capacity)
+        self._owner = True
+        self._lock = Lock() if multi_producer else None
+        self._doorbell_reader, self._doorbell_writer = Pipe(duplex=False)
+        self._attach()
+
+    def _attach(self):
+        self._counters = self._shm.buf[:_HEADER_SIZE].cast("Q")
+        self._data = self._shm.buf[_HEADER_SIZE:]
+        # получатель вызывал prepare_wait, в канале могут быть "звонки"
+        self._armed = False
+        # захват блокировки служит барьером памяти между записью
+        # счетчика и чтением флага ожидания (и наоборот)
+        self._fence_lock = threading.Lock()
+
+    def _fence(self):
+        with self._fence_lock:
+            pass
+
+    def __getstate__(self):
+        # при запуске процесса методом spawn буфер подключается по имени
+        state = self.__dict__.copy()
+        state["_shm"] = self._shm.name
+        state["_owner"] = False
+        del state["_counters"], state["_data"], state["_fence_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = SharedMemory(name=state["_shm"])
+        self._attach()
+
+    @property
+    def _reader(self):
+        # для ожидания событий в BaseCustomProcess._wait_for_events
+        return self._doorbell_reader
+
+    def prepare_wait(self) -> bool:
+        """prepare_wait отмечает, что получатель собирается ждать
+
+        Returns:
+            bool: True, если в буфере уже есть данные и ждать не нужно
+        """
+        self._armed = True
+        self._counters[_WAITING] = 1
+        self._fence()
+        if self._counters[_HEAD] != self._counters[_TAIL]:
+            self._counters[_WAITING] = 0
+            return True
+        return False
+
+    def put(self, obj, block: bool = True, timeout: Optional[float] = None):
+        if isinstance(obj, Event) and self._codec is not None:
+            payload = _KIND_EVENT + self._codec.encode(obj)
+        elif isinstance(obj, EventBatch) and self._codec is not None:
+            payload = _KIND_BATCH + b"".join(
+                _LENGTH.pack(len(packed)) + packed
+                for packed in map(self._codec.encode, obj.events))
+        else:
+            payload = _KIND_PICKLE + pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        record = _LENGTH.pack(len(payload)) + payload
+        if len(record) > self._capacity:
+            raise ValueError(f"сообщение размером {len(record)} байт не помещается в буфер")
+
+        if self._lock is not None:
+            self._lock.acquire()
+        try:
+            deadline = None if timeout is None else monotonic() + timeout
+            head = self._counters[_HEAD]
+            while self._capacity - (head - self._counters[_TAIL]) < len(record):
+                if not block or (deadline is not None and monotonic() >= deadline):
+                    raise Full
+                sleep(_FULL_BACKOFF_SEC)
+            self._write(head, record)
+            self._counters[_HEAD] = head + len(record)
+        finally:
+            if self._lock is not None:
+                self._lock.release()
+
+        self._fence()
+        if self._counters[_WAITING]:
+            self._counters[_WAITING] = 0
+            self._doorbell_writer.send_bytes(b"\0")
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def get_nowait(self):
+        if self._armed:
+            # сбрасываем накопившиеся "звонки" от отправителей
+            self._armed = False
+            while self._doorbell_reader.poll():
+                self._doorbell_reader.recv_bytes()
+
+        tail = self._counters[_TAIL]
+        if self._counters[_HEAD] == tail:
+            raise Empty
+        size = _LENGTH.unpack(self._read(tail, _LENGTH.size))[0]
+        payload = self._read(tail + _LENGTH.size, size)
+        self._counters[_TAIL] = tail + _LENGTH.size + size
+
+        kind = payload[:1]
+        if kind == _KIND_EVENT:
+            return self._codec.decode(payload[1:])
+        if kind == _KIND_BATCH:
+            return EventBatch(events=self._decode_batch(payload))
+        return pickle.loads(payload[1:])
+
+    def _decode_batch(self, payload: bytes) -> list:
+        events = []
+        position = 1
+        while position < len(payload):
+            size = _LENGTH.unpack_from(payload, position)[0]
+            position += _LENGTH.size
+            events.append(self._codec.decode(payload[position:position + size]))
+            position += size
+        return events
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        if not block:
+            return self.get_nowait()
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except Empty:
+                pass
+            if self.prepare_wait():
+                continue
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                raise Empty
+            self._doorbell_reader.poll(remaining)
+
+    def empty(self) -> bool:
+        return self._counters[_HEAD] == self._counters[_TAIL]
+
+    def close(self):
+        """ освобождение разделяемой памяти (вызывается создателем очереди) """
+        self._counters.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _write(self, position: int, record: bytes):
+        """ запись с переходом через конец кольцевого буфера """
+        start = position % self._capacity
+        first = min(len(record), self._capacity - start)
+        self._data[start:start + first] = record[:first]
+        if first < len(record):
+            self._data[:len(record) - first] = record[first:]
+
+    def _read(self, position: int, size: int) -> bytes:
+        """ чтение с переходом через конец кольцевого буфера """
+        start = position % self._capacity
+        first = min(size, self._capacity - start)
+        data = bytes(self._data[start:start + first])
+        if first < size:
+            data += bytes(self._data[:size - first])
+        return data
@@ -3,10 +3,11 @@
 
 from multiprocessing import Process
 from typing import List
-from src.system.config import LOG_ERROR, LOG_INFO, CRITICALITY_STR
+from src.system.config import LOG_ERROR, LOG_INFO
+from src.system.log import LogMixin
 
 
-class SystemComponentsContainer:
+class SystemComponentsContainer(LogMixin):
     """ контейнер компонентов """    
 
     def __init__(self, components: List[Process], log_level = LOG_ERROR):
@@ -14,16 +15,6 @@ class SystemComponentsContainer:
         self.log_prefix = "[СИСТЕМА]"
         self.log_level = log_level
 
-    def _log_message(self, criticality: int, message: str):
-        """_log_message печатает сообщение заданного уровня критичности
-
-        Args:
-            criticality (int): уровень критичности
-            message (str): текст сообщения
-        """
-        if criticality <= self.log_level:
-            print(f"[{CRITICALITY_STR[criticality]}]{self.log_prefix} {message}")
-
     def start(self):
         """ запуск всех компонентов """
 